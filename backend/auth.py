@@ -1,42 +1,56 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 import hashlib
 import secrets
-from jose import JWTError, jwt
-import bcrypt as bcrypt_module
-from passlib.context import CryptContext
+import time
+from jose import JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from database import get_db
 from models import User
 from config import get_settings
+from services.jwt_keys import jwt_key_ring
+from services.password_hashing import PASSWORD_HASH_RETRY_AFTER_SECONDS, PasswordHashingBusy, password_hasher
+from services.session_revocation import session_revocations
+from services.user_cache import user_cache
 
-# JWT Configuration
-ALGORITHM = "HS256"
+# JWT Configuration (signing keys live in services/jwt_keys.py)
 settings = get_settings()
-SECRET_KEY = settings.SECRET_KEY
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+ACCESS_TOKEN_CLAIMS_TTL_SECONDS = settings.ACCESS_TOKEN_CLAIMS_TTL_SECONDS
+ADMIN_EMAILS = frozenset(settings.admin_email_list)
 
-# passlib 1.7.x expects bcrypt.__about__.__version__ which newer bcrypt releases removed.
-if not hasattr(bcrypt_module, "__about__"):
-    class _BcryptAbout:
-        __version__ = getattr(bcrypt_module, "__version__", "unknown")
-    bcrypt_module.__about__ = _BcryptAbout()  # type: ignore[attr-defined]
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Too many sign-in requests in progress. Try again in {PASSWORD_HASH_RETRY_AFTER_SECONDS} seconds.",
+        headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+def verify_password(plain_password: str, hashed_password: Optional[str]) -> bool:
+    """Verify a password against its hash; accounts without a password (Google) never match"""
+    try:
+        return password_hasher.verify(plain_password, hashed_password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    try:
+        return password_hasher.hash(password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+
+
+def password_needs_rehash(hashed_password: Optional[str]) -> bool:
+    return password_hasher.needs_rehash(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -47,8 +61,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return jwt_key_ring.encode(to_encode)
 
 
 def hash_refresh_token(refresh_token: str) -> str:
@@ -62,8 +75,7 @@ def generate_refresh_token() -> str:
 def decode_token(token: str) -> dict:
     """Decode and verify a JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return jwt_key_ring.decode(token)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,50 +84,150 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user"""
-    token = credentials.credentials
-    payload = decode_token(token)
-    user_id_raw = payload.get("sub")
-    if user_id_raw is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
+class TokenClaims(NamedTuple):
+    """Caller identity taken from the access token; `id` matches `User.id` so handlers can swap it in."""
+    id: int
+    role: str
+    token_version: int
+    session_id: Optional[str] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+
+def build_access_token_claims(user: User, session_id: Optional[str] = None) -> dict:
+    """Claims for `create_access_token`: role/active are trusted for ACCESS_TOKEN_CLAIMS_TTL_SECONDS (`cexp`)."""
+    issued_at = time.time()
+    return {
+        "sub": str(user.id),
+        "sid": session_id,
+        "role": "admin" if is_admin_user(user) else "user",
+        "active": bool(user.is_active),
+        "ver": user.token_version or 0,
+        "iat": issued_at,
+        "cexp": int(issued_at) + ACCESS_TOKEN_CLAIMS_TTL_SECONDS,
+    }
+
+
+def _token_user_id(payload: dict) -> int:
     try:
-        user_id = int(user_id_raw)
-    except (TypeError, ValueError):
+        return int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
-    
-    user = db.query(User).filter(User.id == user_id).first()
+
+
+def load_user(db: Session, user_id: int) -> User:
+    """The user row (minus `bio`) from the per-process cache, or one query; 401 if it is gone."""
+    if user_cache.enabled:
+        user_cache.poll_signals(db)
+        snapshot = user_cache.get(user_id)
+        if snapshot is not None:
+            # Attach a private copy without a SELECT; routes may modify and commit it as usual.
+            return db.merge(snapshot, load=False)
+    generation = user_cache.generation(user_id)
+    user = db.query(User).options(defer(User.bio)).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-    
+    if user_cache.enabled:
+        user_cache.store(user, generation)
+    return user
+
+
+def _ensure_token_current(user: User, payload: dict):
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account is disabled",
+        )
+    # Tokens issued before the `ver` claim existed count as version 0.
+    if payload.get("ver", 0) < (user.token_version or 0):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+
+
+def _ensure_session_active(db: Session, payload: dict):
+    session_id = payload.get("sid")
+    if not session_id:
+        return
+    session_revocations.poll(db)
+    if session_revocations.is_revoked(db, session_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked",
+        )
+
+
+def _claims_trusted(payload: dict, user_id: int) -> bool:
+    """Fresh signed claims for a user this process has seen no change to since the token was issued."""
+    if payload.get("active") is not True or payload.get("role") not in ("admin", "user"):
+        return False
+    if not isinstance(payload.get("ver"), int) or time.time() >= payload.get("cexp", 0):
+        return False
+    return not user_cache.changed_since(user_id, payload.get("iat", 0))
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the current authenticated user"""
+    payload = decode_token(credentials.credentials)
+    user = load_user(db, _token_user_id(payload))
+    _ensure_token_current(user, payload)
+    _ensure_session_active(db, payload)
     return user
 
 
+async def get_token_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> TokenClaims:
+    """Authorize from the token alone, for handlers that only need the caller's id and role.
+
+    Falls back to the (cached) user row when the claims are stale, predate the token version
+    column, or the user changed after the token was issued; that row is also what decides
+    revocation and deactivation.
+    """
+    payload = decode_token(credentials.credentials)
+    user_id = _token_user_id(payload)
+    _ensure_session_active(db, payload)
+    session_id = payload.get("sid")
+    if user_cache.enabled:
+        user_cache.poll_signals(db)
+        if _claims_trusted(payload, user_id):
+            return TokenClaims(id=user_id, role=payload["role"], token_version=payload["ver"], session_id=session_id)
+    user = load_user(db, user_id)
+    _ensure_token_current(user, payload)
+    return TokenClaims(
+        id=user.id,
+        role="admin" if is_admin_user(user) else "user",
+        token_version=user.token_version or 0,
+        session_id=session_id,
+    )
+
+
 def is_admin_user(user: User) -> bool:
     if (user.role or "").strip().lower() == "admin":
         return True
-    return (user.email or "").strip().lower() in set(settings.admin_email_list)
+    return (user.email or "").strip().lower() in ADMIN_EMAILS
 
 
-async def require_admin_user(current_user: User = Depends(get_current_user)) -> User:
-    if not is_admin_user(current_user):
+async def require_admin_user(claims: TokenClaims = Depends(get_token_claims)) -> TokenClaims:
+    if not claims.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
         )
-    return current_user
+    return claims
 
 
 # Optional: Make authentication optional for some routes
@@ -14,6 +14,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    ACCESS_TOKEN_CLAIMS_TTL_SECONDS: int = 300
+    JWT_KEYS_DIR: Optional[str] = None
+    JWT_ACTIVE_KID: Optional[str] = None
+    JWT_ACCEPT_LEGACY_HS256: bool = True
 
     MOCK_MODE: bool = True
     OPENAI_API_KEY: Optional[str] = None
@@ -21,6 +25,7 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-1.5-flash"
     GOOGLE_CLIENT_ID: Optional[str] = None
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
     APP_ENV: str = "development"
     EXPOSE_DEV_AUTH_TOKENS: Optional[bool] = None
 
@@ -34,6 +39,15 @@ class Settings(BaseSettings):
     CORS_ORIGIN_REGEX: Optional[str] = None
     ADMIN_EMAILS: str = ""
 
+    ESSAY_DRAFT_FLUSH_SECONDS: int = 15
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    CATALOG_MATCH_INTERVAL_SECONDS: int = 900
+    USER_CACHE_TTL_SECONDS: int = 30
+    TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
     @property
     def cors_origins_list(self) -> list[str]:
         origins = [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
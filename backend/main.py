@@ -2,17 +2,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import get_settings
-from database import Base, engine
+from database import Base, SessionLocal, engine
 from observability import install_observability
 from routers.application_routes import router as application_router
 from routers.admin_routes import router as admin_router
 from routers.auth_routes import router as auth_router
+from routers.calendar_routes import router as calendar_router
 from routers.essay_routes import router as essay_router
+from routers.export_routes import router as export_router
 from routers.feedback_routes import router as feedback_router
+from routers.fx_routes import router as fx_router
 from routers.reminder_routes import router as reminder_router
+from routers.sync_routes import router as sync_router
 from routers.system_routes import router as system_router
 from routers.telemetry_routes import router as telemetry_router
+from routers.workspace_routes import router as workspace_router
+from services.essay_drafts import flush_all_drafts
+from services.fx_rates import seed_fx_rates
 from services.migrations import run_schema_migrations
+from services.password_hashing import password_hasher
+from services.program_catalog import seed_program_catalog
+from services.program_matching import CatalogMatchWorker
+from services.sync import purge_expired_tombstones
+from services.token_purge import token_purge_worker
+from services.user_cache import purge_user_cache_signals
 
 settings = get_settings()
 
@@ -53,6 +66,9 @@ ensure_startup_safety()
 try:
     Base.metadata.create_all(bind=engine)
     run_schema_migrations(engine)
+    with SessionLocal() as seed_db:
+        seed_fx_rates(seed_db)
+        seed_program_catalog(seed_db)
 except Exception as exc:
     if settings.is_production_like_env:
         raise RuntimeError(f"Database initialization failed: {exc}") from exc
@@ -70,11 +86,76 @@ app.add_middleware(
 )
 install_observability(app)
 
+
+@app.on_event("startup")
+def purge_sync_tombstones():
+    db = SessionLocal()
+    try:
+        purge_expired_tombstones(db, settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    except Exception as exc:
+        print(f"WARNING: sync tombstone purge skipped due to error: {exc}")
+    finally:
+        db.close()
+
+
+catalog_match_worker = CatalogMatchWorker(SessionLocal, settings.CATALOG_MATCH_INTERVAL_SECONDS)
+
+
+@app.on_event("startup")
+def start_catalog_matching():
+    catalog_match_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_catalog_matching():
+    catalog_match_worker.stop()
+
+
+@app.on_event("startup")
+def start_token_purge():
+    token_purge_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_token_purge():
+    token_purge_worker.stop()
+
+
+@app.on_event("startup")
+def purge_stale_user_cache_signals():
+    db = SessionLocal()
+    try:
+        purge_user_cache_signals(db)
+    except Exception as exc:
+        print(f"WARNING: user cache signal purge skipped due to error: {exc}")
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+def flush_pending_essay_drafts():
+    db = SessionLocal()
+    try:
+        flush_all_drafts(db)
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+def stop_password_hashing_pool():
+    password_hasher.shutdown()
+
+
 app.include_router(system_router)
 app.include_router(auth_router)
 app.include_router(application_router)
 app.include_router(reminder_router)
+app.include_router(calendar_router)
 app.include_router(essay_router)
+app.include_router(export_router)
+app.include_router(workspace_router)
+app.include_router(sync_router)
+app.include_router(fx_router)
 app.include_router(feedback_router)
 app.include_router(telemetry_router)
 app.include_router(admin_router)
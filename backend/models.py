@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean, Date
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -24,6 +24,9 @@ class User(Base):
     email_verified = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
     role = Column(String, default="user", nullable=False, index=True)
+    calendar_feed_token_hash = Column(String, unique=True, nullable=True, index=True)
+    row_version = Column(Integer, default=1, nullable=False)
+    token_version = Column(Integer, default=0, nullable=False)  # bumped to revoke every issued access token
     created_at = Column(DateTime, default=datetime.utcnow)
     
     essays = relationship("Essay", back_populates="user")
@@ -32,6 +35,16 @@ class User(Base):
     auth_tokens = relationship("AuthToken", back_populates="user")
 
 
+class UserCacheInvalidation(Base):
+    """Cross-worker signal: each API process drops cached users listed here (NULL user_id = all)."""
+
+    __tablename__ = "user_cache_invalidations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
 class Essay(Base):
     __tablename__ = "essays"
     
@@ -49,10 +62,13 @@ class Essay(Base):
     parent_essay_id = Column(Integer, ForeignKey("essays.id"), nullable=True)
     application_id = Column(Integer, ForeignKey("applications.id"), nullable=True)
     is_latest = Column(Boolean, default=True)
+    row_version = Column(Integer, default=1, nullable=False)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (Index("ix_essays_user_id_updated_at", "user_id", "updated_at"),)
+
     user = relationship("User", back_populates="essays")
     application = relationship("ApplicationTracker", back_populates="essays")
     # Self-referential relationship for versions
@@ -79,14 +95,34 @@ class ApplicationTracker(Base):
     decision_status = Column(String, default="Pending")
     requirements_notes = Column(Text, nullable=True)
     status = Column(String, default="Planning")
+    row_version = Column(Integer, default=1, nullable=False)
+    # Set by services.program_matching; never edited by the client.
+    catalog_program_id = Column(String, nullable=True, index=True)
+    catalog_match_checked_at = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (Index("ix_applications_user_id_updated_at", "user_id", "updated_at"),)
+
     user = relationship("User", back_populates="applications")
     essays = relationship("Essay", back_populates="application")
 
 
+class SyncTombstone(Base):
+    """Deletion log read by GET /sync so clients can drop rows they still hold."""
+
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity_type = Column(String, nullable=False)  # application | essay
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (Index("ix_sync_tombstones_user_id_id", "user_id", "id"),)
+
+
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
@@ -95,11 +131,28 @@ class RefreshToken(Base):
     token_hash = Column(String, unique=True, nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False, index=True)
     revoked = Column(Boolean, default=False, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)  # retention for replay detection counts from here
+    # Shared by every token rotated from the same login (the session id); a replay revokes the whole family.
+    family_id = Column(String, nullable=True, index=True)
+    user_agent = Column(String, nullable=True)
+    session_started_at = Column(DateTime, nullable=True)  # login time, carried over on rotation
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     user = relationship("User", back_populates="refresh_tokens")
 
 
+class RevokedSession(Base):
+    """Sessions ended before their access tokens expire; loaded into each process's revocation filter."""
+
+    __tablename__ = "revoked_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # when the last access token of the session expires
+
+
 class AuthToken(Base):
     __tablename__ = "auth_tokens"
 
@@ -145,3 +198,31 @@ class AiRuntimeConfig(Base):
     gemini_model = Column(String, nullable=False, default="gemini-1.5-flash")
     updated_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rates"
+
+    currency = Column(String, primary_key=True)  # ISO 4217 code
+    units_per_usd = Column(Float, nullable=False)
+    source = Column(String, default="seed", nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class ProgramCatalogEntry(Base):
+    __tablename__ = "program_catalog"
+
+    id = Column(String, primary_key=True)  # slug, see services.program_catalog.build_program_id
+    school_name = Column(String, nullable=False, index=True)
+    program_name = Column(String, nullable=False)
+    degree = Column(String, nullable=False, index=True)
+    country = Column(String, nullable=False, index=True)
+    city = Column(String, nullable=True)
+    application_fee = Column(Float, nullable=True)
+    fee_currency = Column(String, nullable=False, default="USD")
+    deadline_round_1 = Column(String, nullable=True, index=True)  # ISO date, sorts lexically
+    deadline_round_2 = Column(String, nullable=True, index=True)
+    source_url = Column(String, nullable=True)
+    last_updated = Column(String, nullable=True)
+    confidence = Column(String, nullable=False, default="medium")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
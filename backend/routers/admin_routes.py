@@ -2,10 +2,11 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
-from auth import require_admin_user
+from auth import TokenClaims, require_admin_user
 from database import get_db
 from models import AdminEvent, ApplicationTracker, Essay, PilotFeedback, User
 from schemas import (
@@ -15,11 +16,16 @@ from schemas import (
     AdminEventBreakdownRow,
     AdminEventRow,
     AdminFeedbackRow,
+    AdminFxRatesUpdateRequest,
     AdminOverviewResponse,
+    AdminProgramCatalogStatsResponse,
     AdminProgramCatalogUpsertRequest,
     AdminRoleUpdateRequest,
     AdminRoleUpdateResponse,
+    AdminTokenPurgeResult,
+    AdminTokenPurgeStatusResponse,
     AdminUserRow,
+    FxRatesResponse,
     ProgramCatalogItem,
 )
 from services.ai_runtime import (
@@ -28,7 +34,17 @@ from services.ai_runtime import (
     provider_readiness,
     update_ai_runtime_config,
 )
-from services.program_catalog import build_program_id, load_program_catalog, save_program_catalog
+from services.fx_rates import FX_BASE_CURRENCY, fx_rate_cache, parse_fx_rates, replace_fx_rates
+from services.program_catalog import (
+    build_program_id,
+    delete_program_catalog_entry,
+    export_program_catalog,
+    insert_program_catalog_entry,
+    program_catalog_store,
+    update_program_catalog_entry,
+)
+from services.program_search import program_search_index
+from services.token_purge import token_purge_worker
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -44,7 +60,7 @@ REQUIRED_EVENT_COVERAGE = [
 
 @router.get("/overview", response_model=AdminOverviewResponse)
 async def get_admin_overview(
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     one_day_ago = datetime.utcnow() - timedelta(days=1)
@@ -151,7 +167,7 @@ async def get_admin_overview(
 @router.get("/users", response_model=list[AdminUserRow])
 async def get_admin_users(
     limit: int = Query(default=30, ge=1, le=200),
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     rows = (
@@ -192,7 +208,7 @@ async def get_admin_users(
 async def get_admin_events(
     limit: int = Query(default=60, ge=1, le=300),
     name: Optional[str] = Query(default=None, min_length=2, max_length=120),
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     query = db.query(AdminEvent)
@@ -206,7 +222,7 @@ async def get_admin_events(
 @router.get("/feedback", response_model=list[AdminFeedbackRow])
 async def get_admin_feedback(
     limit: int = Query(default=30, ge=1, le=200),
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     rows = (
@@ -233,7 +249,7 @@ async def get_admin_feedback(
 @router.get("/events/breakdown", response_model=list[AdminEventBreakdownRow])
 async def get_admin_events_breakdown(
     limit: int = Query(default=10, ge=1, le=50),
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     rows = (
@@ -248,7 +264,7 @@ async def get_admin_events_breakdown(
 
 @router.get("/events/coverage", response_model=AdminEventCoverageResponse)
 async def get_admin_events_coverage(
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
@@ -281,7 +297,7 @@ async def get_admin_events_coverage(
 async def update_user_role(
     user_id: int,
     payload: AdminRoleUpdateRequest,
-    current_admin: User = Depends(require_admin_user),
+    current_admin: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     normalized_role = (payload.role or "").strip().lower()
@@ -316,17 +332,38 @@ async def update_user_role(
     return {"id": user.id, "email": user.email, "role": user.role}
 
 
+@router.get("/programs/stats", response_model=AdminProgramCatalogStatsResponse)
+def get_program_catalog_stats(_: TokenClaims = Depends(require_admin_user)):
+    return program_catalog_store.stats()
+
+
+@router.get("/maintenance/token-purge", response_model=AdminTokenPurgeStatusResponse)
+def get_token_purge_status(_: TokenClaims = Depends(require_admin_user)):
+    return token_purge_worker.status()
+
+
+@router.post("/maintenance/token-purge", response_model=AdminTokenPurgeResult)
+def run_token_purge(_: TokenClaims = Depends(require_admin_user)):
+    return token_purge_worker.run_once()
+
+
+@router.get("/programs/export")
+def export_program_catalog_json(_: TokenClaims = Depends(require_admin_user), db: Session = Depends(get_db)):
+    """The catalog table in seed-file format, for committing back to data/program_catalog_seed.json."""
+    return JSONResponse(
+        content=export_program_catalog(db),
+        headers={"Content-Disposition": 'attachment; filename="program_catalog.json"'},
+    )
+
+
 @router.post("/programs", response_model=ProgramCatalogItem, status_code=status.HTTP_201_CREATED)
-async def create_program_catalog_item(
+def create_program_catalog_item(
     payload: AdminProgramCatalogUpsertRequest,
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
+    db: Session = Depends(get_db)
 ):
-    catalog = load_program_catalog()
     requested_id = (payload.id or "").strip().lower()
     program_id = requested_id or build_program_id(payload.school_name, payload.program_name, payload.degree)
-    if any(item.get("id") == program_id for item in catalog):
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Program catalog item id already exists")
-
     item = ProgramCatalogItem(
         id=program_id,
         school_name=payload.school_name,
@@ -342,22 +379,19 @@ async def create_program_catalog_item(
         last_updated=payload.last_updated,
         confidence=payload.confidence,
     )
-    catalog.append(item.model_dump())
-    save_program_catalog(catalog)
+    if not insert_program_catalog_entry(db, item):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Program catalog item id already exists")
+    program_search_index.upsert(db, item)
     return item
 
 
 @router.put("/programs/{program_id}", response_model=ProgramCatalogItem)
-async def update_program_catalog_item(
+def update_program_catalog_item(
     program_id: str,
     payload: AdminProgramCatalogUpsertRequest,
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
+    db: Session = Depends(get_db)
 ):
-    catalog = load_program_catalog()
-    index = next((idx for idx, item in enumerate(catalog) if item.get("id") == program_id), None)
-    if index is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program catalog item not found")
-
     item = ProgramCatalogItem(
         id=program_id,
         school_name=payload.school_name,
@@ -373,27 +407,43 @@ async def update_program_catalog_item(
         last_updated=payload.last_updated,
         confidence=payload.confidence,
     )
-    catalog[index] = item.model_dump()
-    save_program_catalog(catalog)
+    if not update_program_catalog_entry(db, item):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program catalog item not found")
+    program_search_index.upsert(db, item)
     return item
 
 
 @router.delete("/programs/{program_id}", status_code=status.HTTP_200_OK)
-async def delete_program_catalog_item(
+def delete_program_catalog_item(
     program_id: str,
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
+    db: Session = Depends(get_db)
 ):
-    catalog = load_program_catalog()
-    next_catalog = [item for item in catalog if item.get("id") != program_id]
-    if len(next_catalog) == len(catalog):
+    if not delete_program_catalog_entry(db, program_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Program catalog item not found")
-    save_program_catalog(next_catalog)
+    program_search_index.remove(db, program_id)
     return {"deleted": True, "id": program_id}
 
 
+@router.put("/fx-rates", response_model=FxRatesResponse)
+def upload_fx_rates(
+    payload: AdminFxRatesUpdateRequest,
+    _: TokenClaims = Depends(require_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Upsert `{currency: units per USD}` rates; currencies not listed keep their current rate."""
+    try:
+        rates = parse_fx_rates(payload.rates)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    replace_fx_rates(db, rates, source="admin")
+    stored, as_of = fx_rate_cache.rates(db)
+    return FxRatesResponse(base=FX_BASE_CURRENCY, as_of=as_of, rates=stored)
+
+
 @router.get("/ai/runtime", response_model=AdminAiRuntimeConfigResponse)
 async def get_ai_runtime_config(
-    _: User = Depends(require_admin_user),
+    _: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     config = get_or_create_ai_runtime_config(db)
@@ -416,7 +466,7 @@ async def get_ai_runtime_config(
 @router.put("/ai/runtime", response_model=AdminAiRuntimeConfigResponse)
 async def put_ai_runtime_config(
     payload: AdminAiRuntimeConfigUpdateRequest,
-    current_admin: User = Depends(require_admin_user),
+    current_admin: TokenClaims = Depends(require_admin_user),
     db: Session = Depends(get_db)
 ):
     provider = (payload.provider or "mock").strip().lower()
@@ -1,21 +1,67 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import and_
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import ValidationError
+from sqlalchemy import and_, insert, update
 from sqlalchemy.orm import Session
 
-from auth import get_current_user
+from auth import TokenClaims, get_token_claims
 from database import get_db
-from models import ApplicationTracker, User
-from schemas import ApplicationCreate, ApplicationResponse, ApplicationUpdate
+from models import ApplicationTracker
+from schemas import (
+    ApplicationBatchCreateRequest,
+    ApplicationBatchResponse,
+    ApplicationBatchUpdateRequest,
+    ApplicationCreate,
+    ApplicationResponse,
+    ApplicationUpdate,
+)
+from services.cascades import delete_application_cascade
+from services.concurrency import version_conflict, versioned_update
+from services.workspace_cache import workspace_cache
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
 
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+def _check_update_rules(application: ApplicationTracker, payload: dict) -> Optional[str]:
+    """Validate LOR/interview rules against the stored row; normalizes payload in place."""
+    target_lors_required = payload.get("lors_required", application.lors_required or 0)
+    target_lors_submitted = payload.get("lors_submitted", application.lors_submitted or 0)
+    if target_lors_submitted > target_lors_required:
+        return "lors_submitted cannot exceed lors_required"
+    if payload.get("interview_required") is False and payload.get("interview_completed", application.interview_completed):
+        return "interview_completed cannot be true when interview_required is false"
+    if payload.get("interview_required") is False:
+        payload["interview_completed"] = False
+    return None
+
+
+def _batch_response(results: list[dict], applied: bool) -> dict:
+    failed = sum(1 for item in results if item["status"] == "error")
+    if not applied:
+        for item in results:
+            if item["status"] != "error":
+                item.update({"status": "skipped", "id": None, "application": None})
+    return {
+        "applied": applied,
+        "succeeded": len(results) - failed if applied else 0,
+        "failed": failed,
+        "items": sorted(results, key=lambda item: item["index"]),
+    }
+
+
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 async def create_application(
     application: ApplicationCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     db_application = ApplicationTracker(
@@ -38,13 +84,140 @@ async def create_application(
     )
     db.add(db_application)
     db.commit()
+    workspace_cache.invalidate(current_user.id)
     db.refresh(db_application)
     return db_application
 
 
+@router.post("/batch", response_model=ApplicationBatchResponse)
+async def create_applications_batch(
+    batch: ApplicationBatchCreateRequest,
+    current_user: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    results: list[dict] = []
+    pending: list[tuple[int, dict]] = []
+    for index, raw_item in enumerate(batch.items):
+        try:
+            item = ApplicationCreate.model_validate(raw_item)
+        except ValidationError as exc:
+            results.append({"index": index, "status": "error", "error": _format_validation_error(exc)})
+            continue
+        pending.append((index, {**item.model_dump(), "user_id": current_user.id}))
+
+    applied = bool(pending) and not (batch.atomic and results)
+    if applied:
+        created = db.scalars(
+            insert(ApplicationTracker).returning(ApplicationTracker, sort_by_parameter_order=True),
+            [values for _, values in pending],
+        ).all()
+        for (index, _), application in zip(pending, created):
+            results.append({
+                "index": index,
+                "status": "created",
+                "id": application.id,
+                "application": ApplicationResponse.model_validate(application),
+            })
+        db.commit()
+        workspace_cache.invalidate(current_user.id)
+    else:
+        results.extend({"index": index, "status": "skipped"} for index, _ in pending)
+    return _batch_response(results, applied)
+
+
+@router.patch("/batch", response_model=ApplicationBatchResponse)
+async def update_applications_batch(
+    batch: ApplicationBatchUpdateRequest,
+    current_user: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    results: list[dict] = []
+    parsed: list[tuple[int, int, dict]] = []
+    seen_ids: set[int] = set()
+    for index, raw_item in enumerate(batch.items):
+        application_id = raw_item.get("id")
+        if not isinstance(application_id, int) or isinstance(application_id, bool):
+            results.append({"index": index, "status": "error", "error": "id is required"})
+            continue
+        if application_id in seen_ids:
+            results.append({"index": index, "status": "error", "id": application_id, "error": "Duplicate id in batch"})
+            continue
+        seen_ids.add(application_id)
+        try:
+            item = ApplicationUpdate.model_validate({key: value for key, value in raw_item.items() if key != "id"})
+        except ValidationError as exc:
+            results.append({
+                "index": index,
+                "status": "error",
+                "id": application_id,
+                "error": _format_validation_error(exc),
+            })
+            continue
+        parsed.append((index, application_id, item.model_dump(exclude_unset=True)))
+
+    existing = {}
+    if parsed:
+        existing = {
+            application.id: application
+            # Row locks (where supported) keep the version check and the bulk UPDATE atomic.
+            for application in db.query(ApplicationTracker).filter(
+                and_(
+                    ApplicationTracker.user_id == current_user.id,
+                    ApplicationTracker.id.in_([application_id for _, application_id, _ in parsed])
+                )
+            ).with_for_update()
+        }
+
+    pending: list[tuple[int, int, dict]] = []
+    for index, application_id, payload in parsed:
+        application = existing.get(application_id)
+        expected_version = payload.pop("row_version", None)
+        if application is not None and expected_version not in (None, application.row_version):
+            results.append({
+                "index": index,
+                "status": "error",
+                "id": application_id,
+                "error": "Application was modified by another request",
+                "application": ApplicationResponse.model_validate(application),
+            })
+            continue
+        error = "Application not found" if application is None else _check_update_rules(application, payload)
+        if error:
+            results.append({"index": index, "status": "error", "id": application_id, "error": error})
+            continue
+        payload["row_version"] = application.row_version + 1
+        pending.append((index, application_id, payload))
+
+    applied = bool(pending) and not (batch.atomic and results)
+    if applied:
+        now = datetime.utcnow()
+        db.execute(
+            update(ApplicationTracker),
+            [{"id": application_id, **payload, "updated_at": now} for _, application_id, payload in pending],
+        )
+        refreshed = {
+            application.id: application
+            for application in db.query(ApplicationTracker).filter(
+                ApplicationTracker.id.in_([application_id for _, application_id, _ in pending])
+            ).populate_existing()
+        }
+        for index, application_id, _ in pending:
+            results.append({
+                "index": index,
+                "status": "updated",
+                "id": application_id,
+                "application": ApplicationResponse.model_validate(refreshed[application_id]),
+            })
+        db.commit()
+        workspace_cache.invalidate(current_user.id)
+    else:
+        results.extend({"index": index, "status": "skipped"} for index, _, _ in pending)
+    return _batch_response(results, applied)
+
+
 @router.get("/", response_model=List[ApplicationResponse])
 async def get_applications(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     applications = (
@@ -59,7 +232,7 @@ async def get_applications(
 @router.get("/{application_id}", response_model=ApplicationResponse)
 async def get_application(
     application_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     application = db.query(ApplicationTracker).filter(
@@ -78,7 +251,7 @@ async def get_application(
 async def update_application(
     application_id: int,
     application_update: ApplicationUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     application = db.query(ApplicationTracker).filter(
@@ -92,45 +265,41 @@ async def update_application(
         raise HTTPException(status_code=404, detail="Application not found")
 
     payload = application_update.model_dump(exclude_unset=True)
-    target_lors_required = payload.get("lors_required", application.lors_required or 0)
-    target_lors_submitted = payload.get("lors_submitted", application.lors_submitted or 0)
-    if target_lors_submitted > target_lors_required:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="lors_submitted cannot exceed lors_required"
-        )
-    if payload.get("interview_required") is False and payload.get("interview_completed", application.interview_completed):
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="interview_completed cannot be true when interview_required is false"
-        )
-    if payload.get("interview_required") is False:
-        payload["interview_completed"] = False
+    expected_version = payload.pop("row_version", None)
+    if expected_version is not None and expected_version != application.row_version:
+        raise version_conflict("Application was modified by another request", ApplicationResponse.model_validate(application))
 
-    for field, value in payload.items():
-        setattr(application, field, value)
+    rule_error = _check_update_rules(application, payload)
+    if rule_error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=rule_error)
 
+    # Rules were checked against this version, so the write is conditional on it even for clients
+    # that did not send one.
+    updated = versioned_update(db, ApplicationTracker, application_id, application.row_version, payload)
+    if updated is None:
+        db.rollback()
+        current = db.query(ApplicationTracker).filter(ApplicationTracker.id == application_id).populate_existing().first()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Application not found")
+        raise version_conflict("Application was modified by another request", ApplicationResponse.model_validate(current))
+    response = ApplicationResponse.model_validate(updated)
     db.commit()
-    db.refresh(application)
-    return application
+    workspace_cache.invalidate(current_user.id)
+    return response
 
 
 @router.delete("/{application_id}")
 async def delete_application(
     application_id: int,
-    current_user: User = Depends(get_current_user),
+    delete_essays: bool = Query(default=True),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
-    application = db.query(ApplicationTracker).filter(
-        and_(
-            ApplicationTracker.id == application_id,
-            ApplicationTracker.user_id == current_user.id
-        )
-    ).first()
-
-    if not application:
+    result = delete_application_cascade(db, current_user.id, application_id, delete_essays=delete_essays)
+    if not result["deleted"]:
         raise HTTPException(status_code=404, detail="Application not found")
-
-    db.delete(application)
-    db.commit()
-    return {"message": "Application deleted successfully"}
+    return {
+        "message": "Application deleted successfully",
+        "deleted_essays": result["deleted_essays"],
+        "detached_essays": result["detached_essays"],
+    }
@@ -1,18 +1,26 @@
+import uuid
 from datetime import datetime, timedelta
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 
 from auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    ADMIN_EMAILS,
     REFRESH_TOKEN_EXPIRE_DAYS,
+    TokenClaims,
+    build_access_token_claims,
     create_access_token,
     generate_refresh_token,
     get_current_user,
     get_password_hash,
+    get_token_claims,
     hash_refresh_token,
     is_admin_user,
+    load_user,
+    password_needs_rehash,
     verify_password,
 )
 from config import get_settings
@@ -21,6 +29,7 @@ from models import RefreshToken, User
 from schemas import (
     EmailActionRequest,
     EmailVerificationConfirmRequest,
+    AuthSessionRow,
     GenericActionResponse,
     GoogleAuthConfigResponse,
     GoogleLoginRequest,
@@ -41,17 +50,10 @@ from services.auth_flows import (
     send_password_reset_email,
     send_verification_email,
 )
+from services.concurrency import version_conflict, versioned_update
+from services.google_identity import GOOGLE_AUTH_IMPORT_ERROR, GoogleCertsUnavailable, google_id_verifier
 from services.rate_limit import enforce_rate_limit
-
-try:
-    from google.oauth2 import id_token as google_id_token
-    from google.auth.transport import requests as google_requests
-except Exception:  # pragma: no cover - optional dependency fallback
-    google_id_token = None
-    google_requests = None
-    GOOGLE_AUTH_IMPORT_ERROR = "google-auth runtime import failed (install google-auth and requests)"
-else:
-    GOOGLE_AUTH_IMPORT_ERROR = None
+from services.session_revocation import revoke_sessions
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
@@ -61,15 +63,13 @@ def verify_google_identity_token(token_value: str) -> tuple[str, str]:
     """Returns (email, display_name)."""
     if not settings.GOOGLE_CLIENT_ID:
         raise HTTPException(status_code=503, detail="GOOGLE_CLIENT_ID is not configured")
-    if not google_id_token or not google_requests:
-        raise HTTPException(status_code=503, detail=GOOGLE_AUTH_IMPORT_ERROR or "google-auth dependency is not installed")
+    if GOOGLE_AUTH_IMPORT_ERROR:
+        raise HTTPException(status_code=503, detail=GOOGLE_AUTH_IMPORT_ERROR)
 
     try:
-        id_info = google_id_token.verify_oauth2_token(
-            token_value,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID
-        )
+        id_info = google_id_verifier.verify(token_value, settings.GOOGLE_CLIENT_ID)
+    except GoogleCertsUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=401, detail=f"Google token verification failed: {exc}") from exc
 
@@ -80,30 +80,46 @@ def verify_google_identity_token(token_value: str) -> tuple[str, str]:
     return email, display_name
 
 
-def issue_auth_tokens(user: User, db: Session) -> dict:
+def issue_auth_tokens(
+    user: User,
+    db: Session,
+    request: Request,
+    family_id: Optional[str] = None,
+    session_started_at: Optional[datetime] = None,
+) -> dict:
+    """Access token plus a refresh token for session `family_id` (a new one for fresh logins), in one commit."""
     if is_admin_user(user) and user.role != "admin":
         user.role = "admin"
-        db.commit()
-        db.refresh(user)
 
+    now = datetime.utcnow()
+    session_id = family_id or uuid.uuid4().hex
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(data={"sub": str(user.id)}, expires_delta=access_token_expires)
+    access_token = create_access_token(
+        data=build_access_token_claims(user, session_id=session_id),
+        expires_delta=access_token_expires,
+    )
 
     raw_refresh_token = generate_refresh_token()
-    refresh_token_expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    refresh_token_expires_at = now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     refresh_token_row = RefreshToken(
         user_id=user.id,
         token_hash=hash_refresh_token(raw_refresh_token),
-        expires_at=refresh_token_expires_at
+        expires_at=refresh_token_expires_at,
+        family_id=session_id,
+        user_agent=(request.headers.get("user-agent") or "")[:255] or None,
+        session_started_at=session_started_at or now,
+        created_at=now,
     )
     db.add(refresh_token_row)
+    # Serialized before the commit expires `user`, which would cost another SELECT.
+    user_payload = UserResponse.model_validate(user)
     db.commit()
 
     return {
         "access_token": access_token,
         "refresh_token": raw_refresh_token,
         "token_type": "bearer",
-        "user": user
+        "user": user_payload
     }
 
 
@@ -134,14 +150,14 @@ def signup(user_data: UserCreate, request: Request, db: Session = Depends(get_db
         name=user_data.name,
         hashed_password=hashed_password,
         email_verified=False,
-        role="admin" if user_data.email.strip().lower() in set(settings.admin_email_list) else "user"
+        role="admin" if user_data.email.strip().lower() in ADMIN_EMAILS else "user"
     )
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
     verification_token = issue_one_time_token(db, new_user, EMAIL_VERIFY_PURPOSE, ttl_minutes=60 * 24)
     send_verification_email(settings, new_user.email, verification_token)
-    return issue_auth_tokens(new_user, db)
+    return issue_auth_tokens(new_user, db, request)
 
 
 @router.post("/login", response_model=Token)
@@ -156,7 +172,15 @@ def login(user_data: UserLogin, request: Request, db: Session = Depends(get_db))
     user = db.query(User).filter(User.email == user_data.email).first()
     if not user or not verify_password(user_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
-    return issue_auth_tokens(user, db)
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Account is disabled")
+    if password_needs_rehash(user.hashed_password):
+        # PASSWORD_HASH_ROUNDS changed since this hash was made; committed with the new refresh token.
+        try:
+            user.hashed_password = get_password_hash(user_data.password)
+        except HTTPException:
+            pass  # hashing pool is saturated; upgrade on a later login
+    return issue_auth_tokens(user, db, request)
 
 
 @router.post("/google", response_model=Token)
@@ -174,17 +198,38 @@ def login_with_google(payload: GoogleLoginRequest, request: Request, db: Session
         user = User(
             email=email,
             name=display_name,
-            hashed_password=get_password_hash(f"google::{email}::{datetime.utcnow().timestamp()}"),
+            hashed_password=None,  # Google-only account: password login is refused until a reset sets one
             notification_email=email,
             email_provider="gmail",
             email_verified=True,
-            role="admin" if email.strip().lower() in set(settings.admin_email_list) else "user"
+            role="admin" if email.strip().lower() in ADMIN_EMAILS else "user"
         )
         db.add(user)
         db.commit()
         db.refresh(user)
+    elif not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Account is disabled")
 
-    return issue_auth_tokens(user, db)
+    return issue_auth_tokens(user, db, request)
+
+
+def reject_refresh_token(db: Session, token_hash: str):
+    """Explain why a refresh token could not be claimed; a revoked one means it is being replayed."""
+    row = db.query(RefreshToken.user_id, RefreshToken.family_id, RefreshToken.revoked).filter(
+        RefreshToken.token_hash == token_hash
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    if row.revoked:
+        # Either the thief or the real client already rotated it; end the session it belongs to.
+        revoke_sessions(db, row.user_id, [row.family_id])
+        db.commit()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reuse detected")
+    db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).update(
+        {"revoked": True, "revoked_at": datetime.utcnow()}, synchronize_session=False
+    )
+    db.commit()
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
 
 
 @router.post("/refresh", response_model=Token)
@@ -196,28 +241,33 @@ def refresh_access_token(payload: RefreshTokenRequest, request: Request, db: Ses
         window_seconds=10 * 60,
     )
     token_hash = hash_refresh_token(payload.refresh_token)
-    refresh_token_row = db.query(RefreshToken).filter(
-        and_(
+    now = datetime.utcnow()
+    # Claiming the token is one conditional UPDATE, so of two concurrent refreshes only one wins.
+    claimed = db.execute(
+        update(RefreshToken)
+        .where(
             RefreshToken.token_hash == token_hash,
-            RefreshToken.revoked == False  # noqa: E712
+            RefreshToken.revoked == False,  # noqa: E712
+            RefreshToken.expires_at > now,
         )
+        .values(revoked=True, revoked_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id, RefreshToken.session_started_at)
+        .execution_options(synchronize_session=False)
     ).first()
-    if not refresh_token_row:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
-    if refresh_token_row.expires_at <= datetime.utcnow():
-        refresh_token_row.revoked = True
-        db.commit()
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
+    if claimed is None:
+        reject_refresh_token(db, token_hash)
 
-    user = db.query(User).filter(User.id == refresh_token_row.user_id).first()
-    if not user:
-        refresh_token_row.revoked = True
+    user = load_user(db, claimed.user_id)
+    if not user.is_active:
         db.commit()
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-
-    refresh_token_row.revoked = True
-    db.commit()
-    return issue_auth_tokens(user, db)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Account is disabled")
+    return issue_auth_tokens(
+        user,
+        db,
+        request,
+        family_id=claimed.family_id,
+        session_started_at=claimed.session_started_at,
+    )
 
 
 @router.post("/logout")
@@ -240,7 +290,12 @@ def logout_session(
                 RefreshToken.user_id == current_user.id,
                 RefreshToken.revoked == False  # noqa: E712
             )
-        ).update({"revoked": True})
+        ).update({"revoked": True, "revoked_at": datetime.utcnow()})
+        # Access tokens already handed out stop working too. Incremented in SQL: current_user may
+        # be a cached snapshot, and writing back its value could undo another worker's bump.
+        db.query(User).filter(User.id == current_user.id).update(
+            {"token_version": User.token_version + 1}, synchronize_session=False
+        )
         db.commit()
         return {"success": True, "revoked": "all"}
 
@@ -254,11 +309,62 @@ def logout_session(
             )
         ).first()
         if token_row:
-            token_row.revoked = True
+            revoke_sessions(db, current_user.id, [token_row.family_id])
             db.commit()
     return {"success": True, "revoked": "current"}
 
 
+@router.get("/sessions", response_model=List[AuthSessionRow])
+def list_sessions(claims: TokenClaims = Depends(get_token_claims), db: Session = Depends(get_db)):
+    """Signed-in devices: one per refresh-token family, described by its newest live token."""
+    rows = db.query(RefreshToken).filter(
+        RefreshToken.user_id == claims.id,
+        RefreshToken.revoked == False,  # noqa: E712
+        RefreshToken.expires_at > datetime.utcnow(),
+    ).order_by(RefreshToken.created_at.desc()).all()
+    sessions = {}
+    for row in rows:
+        if row.family_id in sessions:
+            continue
+        sessions[row.family_id] = AuthSessionRow(
+            id=row.family_id,
+            device=row.user_agent,
+            created_at=row.session_started_at or row.created_at,
+            # Each refresh rotates the token, so the newest row was issued at the last use.
+            last_used_at=row.created_at,
+            expires_at=row.expires_at,
+            current=row.family_id == claims.session_id,
+        )
+    return list(sessions.values())
+
+
+@router.delete("/sessions/{session_id}", response_model=GenericActionResponse)
+def revoke_session(
+    session_id: str,
+    request: Request,
+    claims: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    enforce_rate_limit(
+        request,
+        action="auth_revoke_session",
+        limit=60,
+        window_seconds=10 * 60,
+        user_id=claims.id,
+    )
+    active = db.query(RefreshToken.id).filter(
+        RefreshToken.user_id == claims.id,
+        RefreshToken.family_id == session_id,
+        RefreshToken.revoked == False,  # noqa: E712
+        RefreshToken.expires_at > datetime.utcnow(),
+    ).first()
+    if active is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    revoke_sessions(db, claims.id, [session_id])
+    db.commit()
+    return {"success": True, "message": "Session signed out"}
+
+
 @router.post("/request-email-verification", response_model=GenericActionResponse)
 def request_email_verification(payload: EmailActionRequest, request: Request, db: Session = Depends(get_db)):
     enforce_rate_limit(
@@ -339,12 +445,15 @@ def reset_password(payload: PasswordResetConfirmRequest, request: Request, db: S
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired reset token")
 
     user.hashed_password = get_password_hash(payload.new_password)
+    db.query(User).filter(User.id == user.id).update(
+        {"token_version": User.token_version + 1}, synchronize_session=False
+    )
     db.query(RefreshToken).filter(
         and_(
             RefreshToken.user_id == user.id,
             RefreshToken.revoked == False  # noqa: E712
         )
-    ).update({"revoked": True})
+    ).update({"revoked": True, "revoked_at": datetime.utcnow()})
     db.commit()
     return {"success": True, "message": "Password updated successfully. Please log in again."}
 
@@ -366,9 +475,16 @@ async def update_profile(
     if "notification_email" in payload and not payload["notification_email"]:
         payload["notification_email"] = current_user.email
 
-    for field, value in payload.items():
-        setattr(current_user, field, value)
-
+    expected_version = payload.pop("row_version", None)
+    if expected_version is None:
+        # current_user may be a cached snapshot; take the version from the stored row.
+        expected_version = db.query(User.row_version).filter(User.id == current_user.id).scalar()
+
+    updated = versioned_update(db, User, current_user.id, expected_version, payload)
+    if updated is None:
+        db.rollback()
+        db.refresh(current_user)
+        raise version_conflict("Profile was modified by another request", UserResponse.model_validate(current_user))
+    response = UserResponse.model_validate(updated)
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    return response
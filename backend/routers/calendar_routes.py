@@ -0,0 +1,78 @@
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from auth import get_current_user
+from database import get_db
+from models import User
+from schemas import CalendarFeedResponse
+from services.calendar_feed import disable_calendar_feed, get_calendar_feed, rotate_calendar_feed_token
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+CALENDAR_CACHE_CONTROL = "private, max-age=300"
+
+
+def _not_modified(request: Request, etag: str, last_modified) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+        return etag in candidates or "*" in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc) <= since
+
+
+@router.get("/feed", response_model=CalendarFeedResponse)
+def get_feed_status(current_user: User = Depends(get_current_user)):
+    return CalendarFeedResponse(enabled=bool(current_user.calendar_feed_token_hash))
+
+
+@router.post("/feed", response_model=CalendarFeedResponse)
+def rotate_feed(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Issue a new subscription URL; any previous URL stops working. The token is only shown here."""
+    feed_token = rotate_calendar_feed_token(db, current_user)
+    feed_url = str(request.url_for("get_calendar_ics", feed_token=feed_token))
+    return CalendarFeedResponse(enabled=True, feed_url=feed_url)
+
+
+@router.delete("/feed", response_model=CalendarFeedResponse)
+def delete_feed(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    disable_calendar_feed(db, current_user)
+    return CalendarFeedResponse(enabled=False)
+
+
+@router.get("/{feed_token}.ics", name="get_calendar_ics")
+def get_calendar_ics(feed_token: str, request: Request, db: Session = Depends(get_db)):
+    feed = get_calendar_feed(db, feed_token)
+    if feed is None:
+        raise HTTPException(status_code=404, detail="Calendar feed not found")
+
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": format_datetime(feed.last_modified.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": CALENDAR_CACHE_CONTROL,
+    }
+    if _not_modified(request, feed.etag, feed.last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=feed.body,
+        media_type="text/calendar; charset=utf-8",
+        headers={**headers, "Content-Disposition": 'inline; filename="application-deadlines.ics"'},
+    )
@@ -1,18 +1,23 @@
+from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
-from auth import get_current_user
+from auth import TokenClaims, get_token_claims
+from config import get_settings
 from database import get_db
-from models import ApplicationTracker, Essay, User
+from models import ApplicationTracker, Essay
 from schemas import (
     EssayAssistRequest,
     EssayAssistResponse,
     EssayCreate,
+    EssayDraftResponse,
+    EssayDraftUpdate,
     EssayResponse,
     EssayReviewRequest,
+    EssaySimilarityResponse,
     EssayVersionInfo,
     ReviewResponse,
 )
@@ -21,16 +26,34 @@ from services.ai_runtime import (
     call_openai_text,
     get_or_create_ai_runtime_config,
 )
+from services.cascades import delete_essay_chain
+from services.concurrency import version_conflict
+from services.essay_drafts import (
+    DRAFT_FIELDS,
+    commit_essay_draft,
+    draft_buffer,
+    flush_due_drafts,
+    flush_chain_drafts,
+    flush_essay_draft,
+    flush_user_drafts,
+)
+from services.essay_similarity import (
+    ensure_user_similarity_index,
+    essay_root_id,
+    similarity_index,
+)
 from services.migrations import backfill_essay_application_links
 from services.reviews import extract_score, generate_mock_outline, generate_mock_review
+from services.workspace_cache import workspace_cache
 
 router = APIRouter(prefix="/essays", tags=["essays"])
+settings = get_settings()
 
 
 @router.post("/", response_model=EssayResponse)
 async def create_essay(
     essay: EssayCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     application_id = essay.application_id
@@ -53,6 +76,10 @@ async def create_essay(
         if application_id is None:
             application_id = parent.application_id
 
+        # Autosaves typed into the outgoing latest version land there before it becomes history.
+        sibling_ids = [row.id for row in db.query(Essay.id).filter(Essay.parent_essay_id == essay.parent_essay_id)]
+        flush_chain_drafts(db, [essay.parent_essay_id, *sibling_ids])
+
         db.query(Essay).filter(Essay.parent_essay_id == essay.parent_essay_id).update({"is_latest": False})
         db.query(Essay).filter(Essay.id == essay.parent_essay_id).update({"is_latest": False})
 
@@ -77,13 +104,20 @@ async def create_essay(
 
     db.add(db_essay)
     db.commit()
+    workspace_cache.invalidate(current_user.id)
     db.refresh(db_essay)
+    similarity_index.record_essay(
+        db_essay.id,
+        current_user.id,
+        essay_root_id(db_essay.id, db_essay.parent_essay_id),
+        db_essay.essay_content,
+    )
     return db_essay
 
 
 @router.get("/", response_model=List[EssayResponse])
 async def get_essays(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     latest_only: bool = True,
     application_id: Optional[int] = None,
     skip: int = Query(default=0, ge=0),
@@ -91,6 +125,7 @@ async def get_essays(
     db: Session = Depends(get_db)
 ):
     backfill_essay_application_links(current_user.id, db)
+    flush_user_drafts(db, current_user.id)
 
     query = db.query(Essay).filter(Essay.user_id == current_user.id)
     if latest_only:
@@ -104,21 +139,139 @@ async def get_essays(
 @router.get("/{essay_id}", response_model=EssayResponse)
 async def get_essay(
     essay_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
+    flush_essay_draft(db, essay_id)
     essay = db.query(Essay).filter(and_(Essay.id == essay_id, Essay.user_id == current_user.id)).first()
     if not essay:
         raise HTTPException(status_code=404, detail="Essay not found")
     return essay
 
 
+@router.get("/{essay_id}/similar", response_model=EssaySimilarityResponse)
+async def get_similar_essays(
+    essay_id: int,
+    min_similarity: float = Query(default=0.6, ge=0.1, le=1.0),
+    limit: int = Query(default=5, ge=1, le=20),
+    current_user: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    flush_essay_draft(db, essay_id)
+    essay = db.query(Essay.id, Essay.parent_essay_id, Essay.essay_content).filter(
+        and_(Essay.id == essay_id, Essay.user_id == current_user.id)
+    ).first()
+    if not essay:
+        raise HTTPException(status_code=404, detail="Essay not found")
+
+    ensure_user_similarity_index(db, current_user.id)
+    candidates_checked, matches = similarity_index.find_similar(
+        current_user.id,
+        essay.id,
+        essay_root_id(essay.id, essay.parent_essay_id),
+        essay.essay_content,
+        min_similarity=min_similarity,
+        limit=limit,
+    )
+    scores = dict(matches)
+    rows = []
+    if scores:
+        rows = db.query(
+            Essay.id, Essay.school_name, Essay.program_type, Essay.application_id, Essay.version
+        ).filter(and_(Essay.id.in_(scores), Essay.user_id == current_user.id)).all()
+    items = sorted(
+        [
+            {
+                "essay_id": row.id,
+                "school_name": row.school_name,
+                "program_type": row.program_type,
+                "application_id": row.application_id,
+                "version": row.version,
+                "similarity": round(scores[row.id], 3),
+            }
+            for row in rows
+        ],
+        key=lambda item: (-item["similarity"], item["essay_id"]),
+    )
+    return {"essay_id": essay_id, "candidates_checked": candidates_checked, "items": items}
+
+
+def _draft_conflict(essay: Essay, pending, unsaved: dict) -> HTTPException:
+    """409 with the essay as the server will store it (row plus any buffered draft) and the caller's unsaved fields."""
+    current = EssayResponse.model_validate(essay)
+    if pending is not None:
+        current = current.model_copy(update={**pending.fields, "row_version": pending.version})
+    return version_conflict("Essay was modified by another request", current, draft=unsaved)
+
+
+@router.patch("/{essay_id}/draft", response_model=EssayDraftResponse)
+async def save_essay_draft(
+    essay_id: int,
+    draft: EssayDraftUpdate,
+    current_user: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    # One primary-key lookup per save: a buffered draft says nothing about whether the row
+    # has since been superseded or edited elsewhere.
+    essay = db.query(Essay).filter(and_(Essay.id == essay_id, Essay.user_id == current_user.id)).first()
+    if not essay:
+        raise HTTPException(status_code=404, detail="Essay not found")
+    if not essay.is_latest:
+        raise HTTPException(status_code=409, detail="Only the latest essay version accepts draft autosave")
+
+    fields = draft.model_dump(include=set(DRAFT_FIELDS), exclude_none=True)
+    held = draft_buffer.take_conflict(essay_id)
+    pending = draft_buffer.peek(essay_id)
+    if pending is not None and pending.base_version != essay.row_version:
+        # The row moved under the buffer (another worker or a full update); nothing to merge onto.
+        held = draft_buffer.pop(essay_id) or held
+        pending = None
+    current_version = pending.version if pending is not None else essay.row_version
+    if held is not None or (draft.row_version is not None and draft.row_version != current_version):
+        raise _draft_conflict(essay, pending, held.fields if held is not None else fields)
+
+    flushed = False
+    if draft.commit:
+        row_version = commit_essay_draft(db, essay_id, current_user.id, essay.row_version, fields)
+        if row_version is None:
+            db.refresh(essay)
+            unsaved = draft_buffer.take_conflict(essay_id)
+            raise _draft_conflict(essay, None, unsaved.fields if unsaved is not None else fields)
+        flushed = True
+        pending = None
+    else:
+        if fields:
+            pending = draft_buffer.stage(essay_id, current_user.id, fields, essay.row_version)
+        row_version = pending.version if pending is not None else essay.row_version
+        if pending is not None and draft_buffer.is_flush_due(essay_id, settings.ESSAY_DRAFT_FLUSH_SECONDS):
+            flushed = flush_essay_draft(db, essay_id)
+            unsaved = draft_buffer.take_conflict(essay_id)
+            if unsaved is not None:
+                db.refresh(essay)
+                raise _draft_conflict(essay, None, unsaved.fields)
+            row_version = pending.version if flushed else row_version
+            pending = None
+    flush_due_drafts(db, settings.ESSAY_DRAFT_FLUSH_SECONDS)
+
+    last_flushed_at = draft_buffer.last_flushed_at(essay_id)
+    return {
+        "essay_id": essay_id,
+        "flushed": flushed,
+        "pending": pending is not None,
+        "buffered_fields": sorted(pending.fields) if pending else [],
+        "last_flushed_at": datetime.utcfromtimestamp(last_flushed_at) if last_flushed_at else None,
+        "flush_interval_seconds": settings.ESSAY_DRAFT_FLUSH_SECONDS,
+        "row_version": row_version,
+    }
+
+
 @router.get("/{essay_id}/versions", response_model=EssayVersionInfo)
 async def get_essay_versions(
     essay_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
+    flush_essay_draft(db, essay_id)
     essay = db.query(Essay).filter(and_(Essay.id == essay_id, Essay.user_id == current_user.id)).first()
     if not essay:
         raise HTTPException(status_code=404, detail="Essay not found")
@@ -191,9 +344,10 @@ def _run_provider_text(provider: str, prompt: str, *, max_tokens: int, openai_mo
 async def review_essay(
     essay_id: int,
     review_request: EssayReviewRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
+    flush_essay_draft(db, essay_id)
     essay = db.query(Essay).filter(and_(Essay.id == essay_id, Essay.user_id == current_user.id)).first()
     if not essay:
         raise HTTPException(status_code=404, detail="Essay not found")
@@ -233,7 +387,7 @@ async def review_essay(
 @router.post("/assist/outline", response_model=EssayAssistResponse)
 async def assist_essay_outline(
     payload: EssayAssistRequest,
-    _: User = Depends(get_current_user),
+    _: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db),
 ):
     caution = (
@@ -289,13 +443,10 @@ async def assist_essay_outline(
 @router.delete("/{essay_id}")
 async def delete_essay(
     essay_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
-    essay = db.query(Essay).filter(and_(Essay.id == essay_id, Essay.user_id == current_user.id)).first()
-    if not essay:
+    deleted_ids = delete_essay_chain(db, current_user.id, essay_id)
+    if not deleted_ids:
         raise HTTPException(status_code=404, detail="Essay not found")
-
-    db.delete(essay)
-    db.commit()
-    return {"message": "Essay deleted successfully"}
+    return {"message": "Essay deleted successfully", "deleted_versions": len(deleted_ids)}
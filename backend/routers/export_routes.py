@@ -0,0 +1,37 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from auth import TokenClaims, get_token_claims
+from database import get_db
+from services.essay_drafts import flush_user_drafts
+from services.rate_limit import enforce_rate_limit
+from services.workspace_export import build_workspace_export_response
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/workspace")
+def export_workspace(
+    request: Request,
+    format: Literal["ndjson", "zip"] = Query(default="ndjson"),
+    cursor: Optional[str] = Query(default=None, max_length=64),
+    limit: Optional[int] = Query(default=None, ge=1, le=100000),
+    current_user: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    enforce_rate_limit(
+        request,
+        action="workspace_export",
+        limit=20,
+        window_seconds=10 * 60,
+        user_id=current_user.id,
+    )
+    flush_user_drafts(db, current_user.id)
+    return build_workspace_export_response(
+        current_user.id,
+        export_format=format,
+        cursor=cursor,
+        limit=limit,
+    )
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
-from auth import get_current_user
+from auth import TokenClaims, get_token_claims
 from database import get_db
-from models import PilotFeedback, User
+from models import PilotFeedback
 from schemas import FeedbackCreate, FeedbackResponse
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/feedback", tags=["feedback"])
 @router.post("/", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
 async def submit_feedback(
     payload: FeedbackCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     item = PilotFeedback(
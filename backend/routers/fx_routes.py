@@ -0,0 +1,30 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from auth import get_current_user
+from database import get_db
+from models import User
+from schemas import FxRatesResponse
+from services.fx_rates import fx_rate_cache
+
+router = APIRouter(prefix="/fx", tags=["fx"])
+
+
+@router.get("/rates", response_model=FxRatesResponse)
+def get_fx_rates(
+    base: Optional[str] = Query(default=None, min_length=3, max_length=3),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Multipliers converting one unit of each currency into `base` (default: preferred currency)."""
+    base_currency = (base or current_user.preferred_currency or "USD").upper()
+    rates, as_of = fx_rate_cache.rates(db)
+    if base_currency not in rates:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No FX rate for {base_currency}")
+    return FxRatesResponse(
+        base=base_currency,
+        as_of=as_of,
+        rates={currency: fx_rate_cache.factor(db, currency, base_currency) for currency in sorted(rates)},
+    )
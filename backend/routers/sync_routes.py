@@ -0,0 +1,30 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from auth import TokenClaims, get_token_claims
+from config import get_settings
+from database import get_db
+from schemas import SyncResponse
+from services.essay_drafts import flush_user_drafts
+from services.sync import build_sync_delta
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+settings = get_settings()
+
+
+@router.get("", response_model=SyncResponse)
+def sync_workspace(
+    since: Optional[str] = Query(default=None, max_length=128),
+    current_user: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    """Rows changed since `since`; omit it (or send an expired token) for a full reset."""
+    flush_user_drafts(db, current_user.id)
+    return build_sync_delta(
+        db,
+        current_user.id,
+        since,
+        retention_days=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+    )
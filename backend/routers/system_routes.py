@@ -1,13 +1,22 @@
+from datetime import date
 from fastapi import APIRouter
 from typing import Optional
 
-from fastapi import HTTPException, Query
+from fastapi import Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 
 from config import get_settings
-from database import engine
-from schemas import ProgramCatalogItem, ProgramCatalogSearchResponse
-from services.program_catalog import load_program_catalog
+from database import engine, get_db
+from schemas import (
+    ProgramAutocompleteResponse,
+    ProgramCatalogItem,
+    ProgramCatalogSearchResponse,
+)
+from services.jwt_keys import jwt_key_ring
+from services.program_catalog import find_program_catalog_item, query_program_catalog
+from services.program_search import program_search_index
 
 router = APIRouter(tags=["system"])
 settings = get_settings()
@@ -51,29 +60,74 @@ def db_health_check():
     }
 
 
+@router.get("/.well-known/jwks.json")
+def jwks():
+    """Public keys for verifying access tokens (empty while tokens are still HS256-signed)."""
+    return JSONResponse(content=jwt_key_ring.jwks(), headers={"Cache-Control": "public, max-age=300"})
+
+
+def _split_csv(value: Optional[str]) -> set[str]:
+    return {part.strip() for part in (value or "").split(",") if part.strip()}
+
+
 @router.get("/programs", response_model=ProgramCatalogSearchResponse)
 def list_program_catalog(
     query: Optional[str] = Query(default=None, min_length=2, max_length=120),
+    country: Optional[str] = Query(default=None, max_length=500, description="Comma-separated countries"),
+    degree: Optional[str] = Query(default=None, max_length=500, description="Comma-separated degrees"),
+    fee_min: Optional[float] = Query(default=None, ge=0),
+    fee_max: Optional[float] = Query(default=None, ge=0),
+    deadline_after: Optional[date] = Query(default=None, description="Either round on or after this date"),
+    deadline_before: Optional[date] = Query(default=None, description="Either round on or before this date"),
     limit: int = Query(default=25, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
 ):
-    catalog = load_program_catalog()
-    if query:
-        needle = query.strip().lower()
-        catalog = [
-            item for item in catalog
-            if needle in (item.get("school_name", "").lower())
-            or needle in (item.get("program_name", "").lower())
-            or needle in (item.get("degree", "").lower())
-            or needle in (item.get("country", "").lower())
-        ]
-    items = [ProgramCatalogItem(**item) for item in catalog[:limit]]
-    return {"total": len(catalog), "items": items}
+    facet_values = {"country": _split_csv(country), "degree": _split_csv(degree)}
+    filtered = any(facet_values.values()) or any(
+        value is not None for value in (fee_min, fee_max, deadline_after, deadline_before)
+    )
+    if not query and not filtered:
+        total, items = query_program_catalog(db, offset=offset, limit=limit)
+        return {"total": total, "offset": offset, "items": items, "facets": program_search_index.facet_counts(db)}
+    matches, facets = program_search_index.find(
+        db,
+        query=query,
+        facet_values=facet_values,
+        fee_min=fee_min,
+        fee_max=fee_max,
+        deadline_after=deadline_after.isoformat() if deadline_after else None,
+        deadline_before=deadline_before.isoformat() if deadline_before else None,
+    )
+    return {"total": len(matches), "offset": offset, "items": matches[offset:offset + limit], "facets": facets}
+
+
+@router.get("/programs/autocomplete", response_model=ProgramAutocompleteResponse)
+def autocomplete_program_catalog(
+    prefix: str = Query(min_length=1, max_length=120),
+    limit: int = Query(default=8, ge=1, le=25),
+    db: Session = Depends(get_db),
+):
+    matches = program_search_index.autocomplete(db, prefix, limit)
+    return {
+        "prefix": prefix,
+        "items": [
+            {
+                "id": item.id,
+                "school_name": item.school_name,
+                "program_name": item.program_name,
+                "degree": item.degree,
+                "country": item.country,
+                "score": round(score, 4),
+            }
+            for score, item in matches
+        ],
+    }
 
 
 @router.get("/programs/{program_id}", response_model=ProgramCatalogItem)
-def get_program_catalog_item(program_id: str):
-    catalog = load_program_catalog()
-    for item in catalog:
-        if item.get("id") == program_id:
-            return ProgramCatalogItem(**item)
-    raise HTTPException(status_code=404, detail="Program catalog item not found")
+def get_program_catalog_item(program_id: str, db: Session = Depends(get_db)):
+    item = find_program_catalog_item(db, program_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Program catalog item not found")
+    return item
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.orm import Session
 
-from auth import get_current_user
+from auth import TokenClaims, get_token_claims
 from database import get_db
-from models import AdminEvent, User
+from models import AdminEvent
 from schemas import TelemetryEventIngest, TelemetryEventIngestResponse
 from services.rate_limit import enforce_rate_limit
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/telemetry", tags=["telemetry"])
 async def ingest_event(
     payload: TelemetryEventIngest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     enforce_rate_limit(
@@ -0,0 +1,50 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from auth import get_current_user
+from database import get_db
+from models import User
+from schemas import WorkspaceSummaryResponse
+from services.workspace_bootstrap import (
+    build_workspace_bootstrap,
+    parse_bootstrap_fields,
+    parse_bootstrap_include,
+)
+from services.workspace_summary import get_workspace_summary
+
+router = APIRouter(prefix="/workspace", tags=["workspace"])
+
+
+@router.get("/summary", response_model=WorkspaceSummaryResponse)
+def get_summary(
+    today: Optional[date] = Query(default=None, description="Client-local date used for deadline buckets"),
+    currency: Optional[str] = Query(default=None, min_length=3, max_length=3, description="Defaults to preferred_currency"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return get_workspace_summary(
+        db,
+        current_user.id,
+        today or date.today(),
+        currency or current_user.preferred_currency,
+    )
+
+
+@router.get("/bootstrap")
+def get_bootstrap(
+    include: Optional[str] = Query(default=None, max_length=200, description="Comma-separated sections"),
+    fields: Optional[str] = Query(default=None, max_length=1000, description="Comma-separated section.field pairs"),
+    today: Optional[date] = Query(default=None, description="Client-local date used for deadline buckets"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return build_workspace_bootstrap(
+        db,
+        current_user,
+        sections=parse_bootstrap_include(include),
+        projection=parse_bootstrap_fields(fields),
+        today=today or date.today(),
+    )
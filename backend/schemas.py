@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
-from typing import Optional, List, Literal
+from typing import Any, Optional, List, Literal
 from datetime import datetime, date
 
 
@@ -40,6 +40,7 @@ class UserResponse(BaseModel):
     email_verified: bool = False
     is_active: bool = True
     role: str = "user"
+    row_version: int = 1
     created_at: datetime
     
     class Config:
@@ -81,6 +82,15 @@ class GenericActionResponse(BaseModel):
     dev_token: Optional[str] = None
 
 
+class AuthSessionRow(BaseModel):
+    id: str
+    device: Optional[str] = None
+    created_at: datetime
+    last_used_at: datetime
+    expires_at: datetime
+    current: bool = False
+
+
 class GoogleLoginRequest(BaseModel):
     id_token: str = Field(min_length=20, max_length=4096)
 
@@ -102,6 +112,7 @@ class UserProfileUpdate(BaseModel):
     email_reminders_enabled: Optional[bool] = None
     reminder_days: Optional[str] = Field(default=None, max_length=64)
     bio: Optional[str] = Field(default=None, max_length=1200)
+    row_version: Optional[int] = Field(default=None, ge=1)
 
     @field_validator("name", "timezone", "target_intake", "target_countries", "email_provider", "bio")
     @classmethod
@@ -205,10 +216,63 @@ class ProgramCatalogItem(BaseModel):
     last_updated: Optional[str] = None
     confidence: Literal["low", "medium", "high"] = "medium"
 
+    class Config:
+        from_attributes = True
+
+
+class ProgramFacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class ProgramCatalogFacets(BaseModel):
+    country: List[ProgramFacetCount]
+    degree: List[ProgramFacetCount]
+    fee_range: List[ProgramFacetCount]
+    deadline_month: List[ProgramFacetCount]
+
 
 class ProgramCatalogSearchResponse(BaseModel):
     total: int
+    offset: int = 0
     items: List[ProgramCatalogItem]
+    facets: Optional[ProgramCatalogFacets] = None
+
+
+class ProgramAutocompleteItem(BaseModel):
+    id: str
+    school_name: str
+    program_name: str
+    degree: str
+    country: str
+    score: float
+
+
+class ProgramAutocompleteResponse(BaseModel):
+    prefix: str
+    items: List[ProgramAutocompleteItem]
+
+
+class AdminProgramCatalogStatsResponse(BaseModel):
+    version: int
+    items: int
+    hits: int
+    reloads: int
+
+
+class AdminTokenPurgeResult(BaseModel):
+    refresh_tokens: int
+    auth_tokens: int
+    revoked_sessions: int = 0
+    batches: int
+    duration_ms: float
+
+
+class AdminTokenPurgeStatusResponse(BaseModel):
+    interval_seconds: int
+    runs: int
+    last_run_at: Optional[datetime] = None
+    last_result: Optional[AdminTokenPurgeResult] = None
 
 
 class AdminProgramCatalogUpsertRequest(BaseModel):
@@ -383,6 +447,7 @@ class EssayResponse(BaseModel):
     parent_essay_id: Optional[int]
     application_id: Optional[int]
     is_latest: bool
+    row_version: int = 1
     created_at: datetime
     updated_at: datetime
     
@@ -390,6 +455,59 @@ class EssayResponse(BaseModel):
         from_attributes = True
 
 
+class EssayDraftUpdate(BaseModel):
+    essay_prompt: Optional[str] = Field(default=None, max_length=2000)
+    essay_content: Optional[str] = Field(default=None, max_length=50000)
+    commit: bool = False
+    row_version: Optional[int] = Field(default=None, ge=1)
+
+    @field_validator("essay_prompt", "essay_content")
+    @classmethod
+    def trim_draft_fields(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return value.strip()
+
+    @field_validator("essay_prompt")
+    @classmethod
+    def validate_draft_prompt(cls, value: Optional[str]) -> Optional[str]:
+        # Checked after trimming, like EssayCreate, so "   " cannot blank a saved prompt.
+        if value is not None and len(value) < 5:
+            raise ValueError("essay_prompt must be at least 5 characters")
+        return value
+
+    @model_validator(mode="after")
+    def validate_draft_payload(self):
+        if self.essay_prompt is None and self.essay_content is None and not self.commit:
+            raise ValueError("Provide essay_prompt, essay_content, or commit")
+        return self
+
+
+class EssayDraftResponse(BaseModel):
+    essay_id: int
+    flushed: bool
+    pending: bool
+    buffered_fields: List[str]
+    last_flushed_at: Optional[datetime]
+    flush_interval_seconds: int
+    row_version: Optional[int] = None
+
+
+class EssaySimilarityMatch(BaseModel):
+    essay_id: int
+    school_name: str
+    program_type: str
+    application_id: Optional[int]
+    version: int
+    similarity: float
+
+
+class EssaySimilarityResponse(BaseModel):
+    essay_id: int
+    candidates_checked: int
+    items: List[EssaySimilarityMatch]
+
+
 class EssayReviewRequest(BaseModel):
     focus_areas: Optional[List[str]] = None
 
@@ -502,6 +620,7 @@ class ApplicationUpdate(BaseModel):
     decision_status: Optional[Literal["Pending", "Interview Invite", "Waitlisted", "Admitted", "Rejected", "Accepted", "Interview"]] = None
     requirements_notes: Optional[str] = Field(default=None, max_length=4000)
     status: Optional[Literal["Planning", "In Progress", "Submitted", "Awaiting Decision", "Complete"]] = None
+    row_version: Optional[int] = Field(default=None, ge=1)
 
     @field_validator("school_name", "program_name", "application_round", "requirements_notes")
     @classmethod
@@ -550,8 +669,108 @@ class ApplicationResponse(BaseModel):
     decision_status: str
     requirements_notes: Optional[str]
     status: str
+    row_version: int = 1
+    catalog_program_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class ApplicationBatchCreateRequest(BaseModel):
+    items: List[dict[str, Any]] = Field(min_length=1, max_length=100)
+    atomic: bool = False
+
+
+class ApplicationBatchUpdateRequest(BaseModel):
+    items: List[dict[str, Any]] = Field(min_length=1, max_length=100)
+    atomic: bool = False
+
+
+class ApplicationBatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "updated", "error", "skipped"]
+    id: Optional[int] = None
+    application: Optional[ApplicationResponse] = None
+    error: Optional[str] = None
+
+
+class ApplicationBatchResponse(BaseModel):
+    applied: bool
+    succeeded: int
+    failed: int
+    items: List[ApplicationBatchItemResult]
+
+
+class WorkspaceRequirementsSummary(BaseModel):
+    total_essays_required: int
+    total_lors_required: int
+    total_lors_submitted: int
+    interviews_required: int
+    interviews_completed: int
+    total_applications: int
+
+
+class WorkspaceDeadlineBuckets(BaseModel):
+    overdue: int
+    critical: int
+    upcoming: int
+
+
+class WorkspaceReadinessRow(BaseModel):
+    application_id: int
+    school_name: Optional[str]
+    program_name: Optional[str]
+    deadline: Optional[date]
+    days_until_deadline: Optional[int]
+    essays_required: int
+    essays_drafted: int
+    lors_required: int
+    lors_submitted: int
+    interview_required: bool
+    interview_completed: bool
+
+
+class WorkspaceSummaryResponse(BaseModel):
+    generated_for: date
+    total_applications: int
+    upcoming: int
+    due_soon: int
+    application_fees_by_currency: dict[str, float]
+    program_fees_by_currency: dict[str, float]
+    preferred_currency: str
+    application_fees_total: float
+    program_fees_total: float
+    unconverted_currencies: List[str]
+    requirements: WorkspaceRequirementsSummary
+    deadline_buckets: WorkspaceDeadlineBuckets
+    readiness: List[WorkspaceReadinessRow]
+
+
+class CalendarFeedResponse(BaseModel):
+    enabled: bool
+    feed_url: Optional[str] = None
+
+
+class SyncTombstoneItem(BaseModel):
+    entity_type: Literal["application", "essay"]
+    id: int
+
+
+class SyncResponse(BaseModel):
+    sync_token: str
+    reset: bool
+    applications: List[ApplicationResponse]
+    essays: List[EssayResponse]
+    deleted: List[SyncTombstoneItem]
+
+
+class FxRatesResponse(BaseModel):
+    base: str
+    as_of: Optional[datetime]
+    rates: dict[str, float]
+
+
+class AdminFxRatesUpdateRequest(BaseModel):
+    rates: dict[str, float] = Field(min_length=1, max_length=200)
@@ -0,0 +1,203 @@
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from auth import generate_refresh_token, hash_refresh_token
+from models import ApplicationTracker, SyncTombstone, User
+from services.workspace_cache import workspace_cache
+
+CALENDAR_PRODID = "-//Masters Application Platform//EN"
+CALENDAR_REVALIDATE_SECONDS = 60
+CALENDAR_CACHE_MAX_FEEDS = 4096
+
+
+class CalendarFeed:
+    __slots__ = ("user_id", "fingerprint", "generation", "body", "etag", "last_modified", "checked_at")
+
+    def __init__(self, user_id: int, fingerprint: tuple, generation: tuple[int, int], body: bytes, last_modified: datetime):
+        self.user_id = user_id
+        self.fingerprint = fingerprint
+        self.generation = generation
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.last_modified = last_modified
+        self.checked_at = time.time()
+
+
+class CalendarFeedCache:
+    """Rendered feeds keyed by token hash.
+
+    A cached feed is served without touching the database while it is younger than
+    `revalidate_seconds` and the owner's workspace generation is unchanged (writes in
+    this process bump it). After that the token is re-checked and one aggregate query
+    decides whether the body can be reused, which also covers writes from other workers.
+    """
+
+    def __init__(self, max_feeds: int = CALENDAR_CACHE_MAX_FEEDS, revalidate_seconds: int = CALENDAR_REVALIDATE_SECONDS):
+        self.max_feeds = max_feeds
+        self.revalidate_seconds = revalidate_seconds
+        self._feeds: OrderedDict[str, CalendarFeed] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.builds = 0
+
+    def get_fresh(self, token_hash: str) -> Optional[CalendarFeed]:
+        now = time.time()
+        with self._lock:
+            feed = self._feeds.get(token_hash)
+            if feed is None:
+                return None
+            self._feeds.move_to_end(token_hash)
+        if now - feed.checked_at < self.revalidate_seconds and workspace_cache.generation(feed.user_id) == feed.generation:
+            self.count("hits")
+            return feed
+        return None
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def peek(self, token_hash: str) -> Optional[CalendarFeed]:
+        with self._lock:
+            return self._feeds.get(token_hash)
+
+    def store(self, token_hash: str, feed: CalendarFeed):
+        with self._lock:
+            self._feeds[token_hash] = feed
+            self._feeds.move_to_end(token_hash)
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+
+    def discard_user(self, user_id: int):
+        with self._lock:
+            for token_hash in [key for key, feed in self._feeds.items() if feed.user_id == user_id]:
+                self._feeds.pop(token_hash, None)
+
+    def clear(self):
+        with self._lock:
+            self._feeds.clear()
+
+
+calendar_feed_cache = CalendarFeedCache()
+
+
+def rotate_calendar_feed_token(db: Session, user: User) -> str:
+    raw_token = generate_refresh_token()
+    user.calendar_feed_token_hash = hash_refresh_token(raw_token)
+    db.commit()
+    calendar_feed_cache.discard_user(user.id)
+    return raw_token
+
+
+def disable_calendar_feed(db: Session, user: User):
+    user.calendar_feed_token_hash = None
+    db.commit()
+    calendar_feed_cache.discard_user(user.id)
+
+
+def _ics_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r", "").replace("\n", "\\n")
+    )
+
+
+def _ics_timestamp(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def build_deadlines_ics(applications: list[ApplicationTracker], dtstamp: datetime) -> bytes:
+    """Server-side counterpart of `buildDeadlinesIcsContent` in frontend/src/app/exporters.js."""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{CALENDAR_PRODID}",
+        "CALSCALE:GREGORIAN",
+        "X-WR-CALNAME:Application deadlines",
+        "REFRESH-INTERVAL;VALUE=DURATION:PT1H",
+    ]
+    stamp = _ics_timestamp(dtstamp)
+    for application in applications:
+        if not application.deadline:
+            continue
+        start = application.deadline.strftime("%Y%m%d")
+        end = (application.deadline + timedelta(days=1)).strftime("%Y%m%d")
+        summary = f"{application.school_name or 'Application'} {application.program_name or 'Program'} Deadline"
+        description = (
+            f"Round: {application.application_round or 'N/A'}\n"
+            f"Status: {application.status or 'Planning'}\n"
+            f"Decision: {application.decision_status or 'Pending'}"
+        )
+        lines.extend([
+            "BEGIN:VEVENT",
+            f"UID:{application.id}-{start}@masters-platform",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{start}",
+            f"DTEND;VALUE=DATE:{end}",
+            f"SUMMARY:{_ics_text(summary)}",
+            f"DESCRIPTION:{_ics_text(description)}",
+            "END:VEVENT",
+        ])
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def _feed_fingerprint(db: Session, user_id: int) -> tuple:
+    row = db.query(
+        func.count(ApplicationTracker.id),
+        func.max(ApplicationTracker.id),
+        func.max(ApplicationTracker.updated_at),
+    ).filter(ApplicationTracker.user_id == user_id).one()
+    # Deleting the newest application lowers max(updated_at); its tombstone keeps the feed's time moving forward.
+    deleted_at = db.query(func.max(SyncTombstone.deleted_at)).filter(
+        SyncTombstone.user_id == user_id,
+        SyncTombstone.entity_type == "application",
+    ).scalar()
+    return (*row, deleted_at)
+
+
+def get_calendar_feed(db: Session, feed_token: str) -> Optional[CalendarFeed]:
+    token_hash = hash_refresh_token(feed_token)
+    feed = calendar_feed_cache.get_fresh(token_hash)
+    if feed is not None:
+        return feed
+
+    user_id = db.query(User.id).filter(
+        User.calendar_feed_token_hash == token_hash,
+        User.is_active == True,  # noqa: E712
+    ).scalar()
+    cached = calendar_feed_cache.peek(token_hash)
+    if user_id is None:
+        if cached is not None:
+            calendar_feed_cache.discard_user(cached.user_id)
+        return None
+
+    generation = workspace_cache.generation(user_id)
+    fingerprint = _feed_fingerprint(db, user_id)
+    if cached is not None and cached.user_id == user_id and cached.fingerprint == fingerprint:
+        cached.generation = generation
+        cached.checked_at = time.time()
+        calendar_feed_cache.count("revalidations")
+        return cached
+
+    applications = (
+        db.query(ApplicationTracker)
+        .filter(ApplicationTracker.user_id == user_id)
+        .order_by(ApplicationTracker.deadline.asc(), ApplicationTracker.id.asc())
+        .all()
+    )
+    # DTSTAMP follows the data rather than the clock so every worker renders the same ETag, and it
+    # only moves forward (edits raise max(updated_at), deletions add tombstones), so it is also
+    # Last-Modified, even on a worker that never saw the previous version.
+    dtstamp = max(value for value in (fingerprint[2], fingerprint[3], datetime(2000, 1, 1)) if value is not None)
+    dtstamp = dtstamp.replace(microsecond=0)
+    feed = CalendarFeed(user_id, fingerprint, generation, build_deadlines_ics(applications, dtstamp), dtstamp)
+    calendar_feed_cache.store(token_hash, feed)
+    calendar_feed_cache.count("builds")
+    return feed
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from models import ApplicationTracker, Essay
+from services.essay_drafts import draft_buffer
+from services.essay_similarity import similarity_index
+from services.sync import record_tombstones
+from services.workspace_cache import workspace_cache
+
+
+def _essay_chain_cte(user_id: int, roots):
+    """Recursive CTE of every essay id descending from `roots` (a select of root ids)."""
+    chain = (
+        select(Essay.id)
+        .where(and_(Essay.user_id == user_id, Essay.id.in_(roots)))
+        .cte("essay_chain", recursive=True)
+    )
+    return chain.union_all(
+        select(Essay.id).where(and_(Essay.user_id == user_id, Essay.parent_essay_id == chain.c.id))
+    )
+
+
+def _delete_chains(db: Session, user_id: int, roots) -> list[int]:
+    chain = _essay_chain_cte(user_id, roots)
+    chain_ids = list(db.execute(select(chain.c.id)).scalars())
+    if chain_ids:
+        db.query(Essay).filter(
+            and_(Essay.user_id == user_id, Essay.id.in_(select(chain.c.id)))
+        ).delete(synchronize_session=False)
+        record_tombstones(db, user_id, "essay", chain_ids)
+    return chain_ids
+
+
+def _forget_essays(essay_ids: list[int]):
+    draft_buffer.discard(essay_ids)
+    similarity_index.remove(essay_ids)
+
+
+def delete_essay_chain(db: Session, user_id: int, essay_id: int) -> list[int]:
+    """Delete the whole version chain containing `essay_id`; returns the deleted ids."""
+    roots = select(func.coalesce(Essay.parent_essay_id, Essay.id)).where(
+        and_(Essay.id == essay_id, Essay.user_id == user_id)
+    ).scalar_subquery()
+    try:
+        deleted_ids = _delete_chains(db, user_id, [roots])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _forget_essays(deleted_ids)
+    workspace_cache.invalidate(user_id)
+    return deleted_ids
+
+
+def delete_application_cascade(db: Session, user_id: int, application_id: int, *, delete_essays: bool) -> dict:
+    """Delete an application and either delete or detach its essays, in one transaction."""
+    try:
+        deleted_ids: list[int] = []
+        detached = 0
+        if delete_essays:
+            roots = select(func.coalesce(Essay.parent_essay_id, Essay.id)).where(
+                and_(Essay.user_id == user_id, Essay.application_id == application_id)
+            )
+            deleted_ids = _delete_chains(db, user_id, roots)
+        else:
+            detached = db.query(Essay).filter(
+                and_(Essay.user_id == user_id, Essay.application_id == application_id)
+            ).update({"application_id": None, "updated_at": datetime.utcnow()}, synchronize_session=False)
+
+        deleted = db.query(ApplicationTracker).filter(
+            and_(ApplicationTracker.id == application_id, ApplicationTracker.user_id == user_id)
+        ).delete(synchronize_session=False)
+        if not deleted:
+            db.rollback()
+            return {"deleted": False, "deleted_essays": 0, "detached_essays": 0}
+        record_tombstones(db, user_id, "application", [application_id])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _forget_essays(deleted_ids)
+    workspace_cache.invalidate(user_id)
+    return {"deleted": True, "deleted_essays": len(deleted_ids), "detached_essays": detached}
@@ -0,0 +1,31 @@
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+
+def versioned_update(db: Session, model, row_id: int, expected_version: int, values: dict, *criteria) -> Optional[Any]:
+    """Apply `values` only if the row still has `expected_version`, bumping it in the same statement.
+
+    Returns the refreshed ORM object, or None when another writer got there first.
+    """
+    statement = (
+        update(model)
+        .where(model.id == row_id, model.row_version == expected_version, *criteria)
+        .values(**values, row_version=model.row_version + 1)
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+    return db.scalars(statement).first()
+
+
+def version_conflict(message: str, current: Any, draft: Optional[dict] = None) -> HTTPException:
+    """409 carrying the row as it is now, so the client can rebase without another GET.
+
+    `draft` hands back unsaved changes the server was holding for the caller, if any.
+    """
+    detail = {"message": message, "current": current.model_dump(mode="json")}
+    if draft is not None:
+        detail["draft"] = draft
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
@@ -0,0 +1,239 @@
+import time
+from datetime import datetime
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import and_, update
+from sqlalchemy.orm import Session
+
+from models import Essay
+from services.essay_similarity import similarity_index
+
+DRAFT_FIELDS = ("essay_prompt", "essay_content")
+
+
+class PendingDraft:
+    """Unsaved fields for one essay, written over the row at `base_version`.
+
+    Every accepted autosave advances `version`, the row_version the writer must send next;
+    the flush stores it, so a second tab still holding an older version gets a 409.
+    """
+
+    def __init__(self, user_id: int, fields: dict, buffered_at: float, base_version: int):
+        self.user_id = user_id
+        self.fields = fields
+        self.first_buffered_at = buffered_at
+        self.last_buffered_at = buffered_at
+        self.base_version = base_version
+        self.version = base_version
+
+
+class EssayDraftBuffer:
+    """Per-essay write-behind buffer; later writes replace earlier ones field by field.
+
+    Drafts whose flush lost to a concurrent write are held (one per essay) until the next
+    save hands them back to the client instead of dropping the text.
+    """
+
+    def __init__(self):
+        self._pending: dict[int, PendingDraft] = {}
+        self._conflicts: dict[int, PendingDraft] = {}
+        self._last_flushed: dict[int, float] = {}
+        self._lock = Lock()
+
+    def stage(self, essay_id: int, user_id: int, fields: dict, base_version: int) -> PendingDraft:
+        now = time.time()
+        with self._lock:
+            draft = self._pending.get(essay_id)
+            if draft is None or draft.user_id != user_id or draft.base_version != base_version:
+                draft = PendingDraft(user_id, {}, now, base_version)
+                self._pending[essay_id] = draft
+            draft.fields.update(fields)
+            draft.last_buffered_at = now
+            draft.version += 1
+            return draft
+
+    def peek(self, essay_id: int) -> Optional[PendingDraft]:
+        with self._lock:
+            return self._pending.get(essay_id)
+
+    def hold_conflict(self, essay_id: int, draft: PendingDraft):
+        with self._lock:
+            self._conflicts[essay_id] = draft
+
+    def take_conflict(self, essay_id: int) -> Optional[PendingDraft]:
+        with self._lock:
+            return self._conflicts.pop(essay_id, None)
+
+    def last_flushed_at(self, essay_id: int) -> Optional[float]:
+        with self._lock:
+            return self._last_flushed.get(essay_id)
+
+    def is_flush_due(self, essay_id: int, interval_seconds: int) -> bool:
+        with self._lock:
+            last_flushed = self._last_flushed.get(essay_id)
+        return last_flushed is None or time.time() - last_flushed >= interval_seconds
+
+    def pop(self, essay_id: int) -> Optional[PendingDraft]:
+        with self._lock:
+            return self._pending.pop(essay_id, None)
+
+    def pop_many(self, essay_ids: list[int]) -> list[tuple[int, PendingDraft]]:
+        with self._lock:
+            return [(essay_id, self._pending.pop(essay_id)) for essay_id in essay_ids if essay_id in self._pending]
+
+    def pop_for_user(self, user_id: int) -> list[tuple[int, PendingDraft]]:
+        with self._lock:
+            essay_ids = [essay_id for essay_id, draft in self._pending.items() if draft.user_id == user_id]
+            return [(essay_id, self._pending.pop(essay_id)) for essay_id in essay_ids]
+
+    def pop_due(self, interval_seconds: int) -> list[tuple[int, PendingDraft]]:
+        cutoff = time.time() - interval_seconds
+        with self._lock:
+            essay_ids = [
+                essay_id for essay_id, draft in self._pending.items()
+                if draft.first_buffered_at <= cutoff
+            ]
+            # Flush timestamps only matter inside the coalescing window.
+            for essay_id in [key for key, flushed_at in self._last_flushed.items() if flushed_at <= cutoff]:
+                del self._last_flushed[essay_id]
+            return [(essay_id, self._pending.pop(essay_id)) for essay_id in essay_ids]
+
+    def pop_all(self) -> list[tuple[int, PendingDraft]]:
+        with self._lock:
+            drafts = list(self._pending.items())
+            self._pending.clear()
+            return drafts
+
+    def restore(self, essay_id: int, draft: PendingDraft):
+        """Put back a draft whose flush failed unless a newer write has arrived since."""
+        with self._lock:
+            newer = self._pending.get(essay_id)
+            if newer is None:
+                self._pending[essay_id] = draft
+            elif newer.user_id == draft.user_id:
+                newer.fields = {**draft.fields, **newer.fields}
+                newer.first_buffered_at = min(newer.first_buffered_at, draft.first_buffered_at)
+                newer.base_version = draft.base_version
+                newer.version = max(newer.version, draft.version)
+
+    def mark_flushed(self, essay_id: int):
+        with self._lock:
+            self._last_flushed[essay_id] = time.time()
+
+    def discard(self, essay_ids: list[int]):
+        with self._lock:
+            for essay_id in essay_ids:
+                self._pending.pop(essay_id, None)
+                self._conflicts.pop(essay_id, None)
+                self._last_flushed.pop(essay_id, None)
+
+
+draft_buffer = EssayDraftBuffer()
+
+
+def flush_drafts(db: Session, drafts: list[tuple[int, PendingDraft]]) -> int:
+    """Write buffered drafts with one UPDATE per essay in a single transaction.
+
+    Each UPDATE only lands on the latest version, still at the row_version the draft was
+    based on, and moves row_version to the draft's. A draft that misses (the row was edited
+    elsewhere or superseded) is held as a conflict for its writer rather than overwriting.
+    """
+    if not drafts:
+        return 0
+    written, lost = [], []
+    try:
+        for essay_id, draft in drafts:
+            applied = db.query(Essay).filter(
+                and_(
+                    Essay.id == essay_id,
+                    Essay.user_id == draft.user_id,
+                    Essay.is_latest == True,  # noqa: E712
+                    Essay.row_version == draft.base_version,
+                )
+            ).update(
+                {**draft.fields, "updated_at": datetime.utcnow(), "row_version": draft.version},
+                synchronize_session=False,
+            )
+            (written if applied else lost).append((essay_id, draft))
+        db.commit()
+    except Exception:
+        db.rollback()
+        for essay_id, draft in drafts:
+            draft_buffer.restore(essay_id, draft)
+        raise
+    for essay_id, draft in lost:
+        draft_buffer.hold_conflict(essay_id, draft)
+    for essay_id, draft in written:
+        draft_buffer.mark_flushed(essay_id)
+        if "essay_content" in draft.fields:
+            similarity_index.update_content(essay_id, draft.fields["essay_content"])
+    return len(written)
+
+
+def flush_essay_draft(db: Session, essay_id: int) -> bool:
+    """True when a pending draft was written (False also when it lost to a concurrent write)."""
+    draft = draft_buffer.pop(essay_id)
+    if draft is None:
+        return False
+    return flush_drafts(db, [(essay_id, draft)]) == 1
+
+
+def commit_essay_draft(db: Session, essay_id: int, user_id: int, base_version: int, fields: dict) -> Optional[int]:
+    """Explicit save of `fields` over any pending draft, on top of the row at `base_version`.
+
+    Returns the new row_version, or None on conflict; the unsaved fields are then held for
+    `draft_buffer.take_conflict` instead of being dropped.
+    """
+    draft = draft_buffer.pop(essay_id)
+    if draft is not None and draft.base_version == base_version:
+        fields = {**draft.fields, **fields}
+        next_version = draft.version + 1
+    else:
+        if draft is not None:
+            draft_buffer.hold_conflict(essay_id, draft)
+        next_version = base_version + 1
+    try:
+        new_version = db.execute(
+            update(Essay)
+            .where(
+                Essay.id == essay_id,
+                Essay.user_id == user_id,
+                Essay.is_latest == True,  # noqa: E712
+                Essay.row_version == base_version,
+            )
+            .values(**fields, updated_at=datetime.utcnow(), row_version=next_version)
+            .returning(Essay.row_version)
+        ).scalar()
+        db.commit()
+    except Exception:
+        db.rollback()
+        if draft is not None:
+            draft_buffer.restore(essay_id, draft)
+        raise
+    if new_version is None:
+        unsaved = PendingDraft(user_id, fields, time.time(), base_version)
+        unsaved.version = next_version - 1
+        draft_buffer.hold_conflict(essay_id, unsaved)
+        return None
+    draft_buffer.mark_flushed(essay_id)
+    if "essay_content" in fields:
+        similarity_index.update_content(essay_id, fields["essay_content"])
+    return new_version
+
+
+def flush_chain_drafts(db: Session, essay_ids: list[int]) -> int:
+    """Write pending drafts of these essays, e.g. before they stop being the latest version."""
+    return flush_drafts(db, draft_buffer.pop_many(essay_ids))
+
+
+def flush_user_drafts(db: Session, user_id: int) -> int:
+    return flush_drafts(db, draft_buffer.pop_for_user(user_id))
+
+
+def flush_due_drafts(db: Session, interval_seconds: int) -> int:
+    return flush_drafts(db, draft_buffer.pop_due(interval_seconds))
+
+
+def flush_all_drafts(db: Session) -> int:
+    return flush_drafts(db, draft_buffer.pop_all())
@@ -0,0 +1,211 @@
+import re
+import time
+import zlib
+from collections import defaultdict
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from models import Essay
+
+SIGNATURE_SLOTS = 64
+LSH_BANDS = 16
+LSH_ROWS = SIGNATURE_SLOTS // LSH_BANDS
+SHINGLE_SIZE = 3
+EMPTY_SLOT = 1 << 32
+DENSIFY_OFFSET = 1 << 26
+USER_INDEX_TTL_SECONDS = 10 * 60
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def shingle_hashes(text: Optional[str]) -> set[int]:
+    tokens = TOKEN_PATTERN.findall((text or "").lower())
+    if not tokens:
+        return set()
+    if len(tokens) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(tokens[index:index + SHINGLE_SIZE]).encode("utf-8"))
+        for index in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(text: Optional[str]) -> tuple[int, ...]:
+    """One-permutation MinHash: every shingle is hashed once and competes for the minimum of its slot."""
+    raw = [EMPTY_SLOT] * SIGNATURE_SLOTS
+    for value in shingle_hashes(text):
+        slot = value % SIGNATURE_SLOTS
+        rank = value // SIGNATURE_SLOTS
+        if rank < raw[slot]:
+            raw[slot] = rank
+
+    filled = sum(1 for value in raw if value != EMPTY_SLOT)
+    if filled == 0 or filled == SIGNATURE_SLOTS:
+        return tuple(raw)
+
+    # Rotation densification keeps short essays comparable slot by slot.
+    signature = list(raw)
+    for slot in range(SIGNATURE_SLOTS):
+        if raw[slot] != EMPTY_SLOT:
+            continue
+        step = 1
+        while raw[(slot + step) % SIGNATURE_SLOTS] == EMPTY_SLOT:
+            step += 1
+        signature[slot] = raw[(slot + step) % SIGNATURE_SLOTS] + step * DENSIFY_OFFSET
+    return tuple(signature)
+
+
+def estimate_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    matches = sum(1 for a, b in zip(left, right) if a == b and a != EMPTY_SLOT)
+    return matches / SIGNATURE_SLOTS
+
+
+class EssaySimilarityIndex:
+    """LSH index over latest essay versions, bucketed per user so lookups never cross workspaces."""
+
+    def __init__(self):
+        self._signatures: dict[int, tuple[int, ...]] = {}
+        self._meta: dict[int, tuple[int, int]] = {}  # essay_id -> (user_id, root_id)
+        self._buckets: dict[int, list[int]] = defaultdict(list)
+        self._user_essays: dict[int, set[int]] = defaultdict(set)
+        self._loaded_users: dict[int, float] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _band_keys(user_id: int, signature: tuple[int, ...]) -> list[int]:
+        return [
+            hash((user_id, band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]))
+            for band in range(LSH_BANDS)
+        ]
+
+    def _remove_locked(self, essay_id: int):
+        signature = self._signatures.pop(essay_id, None)
+        meta = self._meta.pop(essay_id, None)
+        if signature is None or meta is None:
+            return
+        self._user_essays[meta[0]].discard(essay_id)
+        for key in self._band_keys(meta[0], signature):
+            bucket = self._buckets.get(key)
+            if not bucket:
+                continue
+            if essay_id in bucket:
+                bucket.remove(essay_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def _add_locked(self, essay_id: int, user_id: int, root_id: int, signature: tuple[int, ...]):
+        self._signatures[essay_id] = signature
+        self._meta[essay_id] = (user_id, root_id)
+        self._user_essays[user_id].add(essay_id)
+        for key in self._band_keys(user_id, signature):
+            self._buckets[key].append(essay_id)
+
+    def is_loaded(self, user_id: int) -> bool:
+        with self._lock:
+            loaded_at = self._loaded_users.get(user_id)
+        return loaded_at is not None and time.time() - loaded_at < USER_INDEX_TTL_SECONDS
+
+    def load_user(self, user_id: int, rows: list[tuple[int, int, Optional[str]]]):
+        """Replace a user's entries with (essay_id, root_id, content) rows."""
+        signed = [(essay_id, root_id, minhash_signature(content)) for essay_id, root_id, content in rows]
+        with self._lock:
+            for essay_id in list(self._user_essays[user_id]):
+                self._remove_locked(essay_id)
+            for essay_id, root_id, signature in signed:
+                self._add_locked(essay_id, user_id, root_id, signature)
+            self._loaded_users[user_id] = time.time()
+
+    def record_essay(self, essay_id: int, user_id: int, root_id: int, content: Optional[str]):
+        """Index a new latest version, retiring older versions of the same chain."""
+        if not self.is_loaded(user_id):
+            return
+        signature = minhash_signature(content)
+        with self._lock:
+            superseded = [
+                indexed_id for indexed_id in self._user_essays[user_id]
+                if self._meta[indexed_id][1] == root_id and indexed_id != essay_id
+            ]
+            for indexed_id in superseded + [essay_id]:
+                self._remove_locked(indexed_id)
+            self._add_locked(essay_id, user_id, root_id, signature)
+
+    def update_content(self, essay_id: int, content: Optional[str]):
+        with self._lock:
+            meta = self._meta.get(essay_id)
+        if meta is None:
+            return
+        signature = minhash_signature(content)
+        with self._lock:
+            if self._meta.get(essay_id) != meta:
+                return
+            self._remove_locked(essay_id)
+            self._add_locked(essay_id, meta[0], meta[1], signature)
+
+    def remove(self, essay_ids: list[int]):
+        with self._lock:
+            for essay_id in essay_ids:
+                self._remove_locked(essay_id)
+
+    def find_similar(
+        self,
+        user_id: int,
+        essay_id: int,
+        root_id: int,
+        content: Optional[str],
+        *,
+        min_similarity: float,
+        limit: int,
+    ) -> tuple[int, list[tuple[int, float]]]:
+        """Returns (candidates_checked, [(essay_id, similarity)]) best first."""
+        with self._lock:
+            signature = self._signatures.get(essay_id)
+        if signature is None:
+            signature = minhash_signature(content)
+
+        with self._lock:
+            candidate_ids = set()
+            for key in self._band_keys(user_id, signature):
+                candidate_ids.update(self._buckets.get(key, ()))
+            candidates = [
+                (candidate_id, self._signatures[candidate_id])
+                for candidate_id in candidate_ids
+                if candidate_id != essay_id
+                and self._meta.get(candidate_id, (None, None))[0] == user_id
+                and self._meta[candidate_id][1] != root_id
+            ]
+
+        scored = [(candidate_id, estimate_similarity(signature, other)) for candidate_id, other in candidates]
+        matches = sorted(
+            [(candidate_id, score) for candidate_id, score in scored if score >= min_similarity],
+            key=lambda item: (-item[1], item[0]),
+        )
+        return len(candidates), matches[:limit]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "essays": len(self._signatures),
+                "buckets": len(self._buckets),
+                "users": len(self._loaded_users),
+            }
+
+
+similarity_index = EssaySimilarityIndex()
+
+
+def essay_root_id(essay_id: int, parent_essay_id: Optional[int]) -> int:
+    return parent_essay_id if parent_essay_id else essay_id
+
+
+def ensure_user_similarity_index(db: Session, user_id: int):
+    if similarity_index.is_loaded(user_id):
+        return
+    rows = db.query(Essay.id, Essay.parent_essay_id, Essay.essay_content).filter(
+        and_(Essay.user_id == user_id, Essay.is_latest == True)  # noqa: E712
+    ).all()
+    similarity_index.load_user(
+        user_id,
+        [(row.id, essay_root_id(row.id, row.parent_essay_id), row.essay_content) for row in rows],
+    )
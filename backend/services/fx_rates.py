@@ -0,0 +1,138 @@
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from models import FxRate
+from services.workspace_cache import workspace_cache
+
+FX_BASE_CURRENCY = "USD"
+FX_RATES_SEED_PATH = Path(__file__).resolve().parents[1] / "data" / "fx_rates_seed.json"
+
+
+def parse_fx_rates(raw_rates: dict) -> dict[str, float]:
+    """Normalize a `{currency: units_per_usd}` mapping; raises ValueError on bad entries."""
+    rates: dict[str, float] = {}
+    for currency, value in (raw_rates or {}).items():
+        code = str(currency).strip().upper()
+        if len(code) != 3 or not code.isalpha():
+            raise ValueError(f"Invalid currency code: {currency}")
+        try:
+            rate = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid rate for {code}")
+        if not rate > 0:
+            raise ValueError(f"Rate for {code} must be positive")
+        rates[code] = rate
+    rates[FX_BASE_CURRENCY] = 1.0
+    return rates
+
+
+def load_fx_rate_file(path: Path = FX_RATES_SEED_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {FX_BASE_CURRENCY: 1.0}
+    with path.open("r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    if data.get("base", FX_BASE_CURRENCY).upper() != FX_BASE_CURRENCY:
+        raise ValueError(f"FX rate file must be based on {FX_BASE_CURRENCY}")
+    return parse_fx_rates(data.get("rates", {}))
+
+
+class FxRateCache:
+    """Process-local copy of the rate table plus memoized pairwise conversion factors.
+
+    Reloaded from the DB after `ttl_seconds` so uploads made on another worker show up.
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._rates: dict[str, float] = {}
+        self._factors: dict[tuple[str, str], Optional[float]] = {}
+        self._as_of: Optional[datetime] = None
+        self._loaded_at = 0.0
+        self._lock = Lock()
+
+    def _ensure_loaded(self, db: Session):
+        with self._lock:
+            if self._rates and time.time() - self._loaded_at < self.ttl_seconds:
+                return
+        rows = db.query(FxRate.currency, FxRate.units_per_usd, FxRate.updated_at).all()
+        with self._lock:
+            self._rates = {row.currency: row.units_per_usd for row in rows}
+            self._as_of = max((row.updated_at for row in rows), default=None)
+            self._factors.clear()
+            self._loaded_at = time.time()
+
+    def rates(self, db: Session) -> tuple[dict[str, float], Optional[datetime]]:
+        self._ensure_loaded(db)
+        with self._lock:
+            return dict(self._rates), self._as_of
+
+    def factor(self, db: Session, from_currency: str, to_currency: str) -> Optional[float]:
+        """Multiplier converting `from_currency` amounts into `to_currency`; None if either rate is unknown."""
+        self._ensure_loaded(db)
+        key = (from_currency.upper(), to_currency.upper())
+        with self._lock:
+            if key not in self._factors:
+                source = self._rates.get(key[0])
+                target = self._rates.get(key[1])
+                self._factors[key] = target / source if source and target else None
+            return self._factors[key]
+
+    def convert(self, db: Session, amount: float, from_currency: str, to_currency: str) -> Optional[float]:
+        factor = self.factor(db, from_currency, to_currency)
+        return None if factor is None else amount * factor
+
+    def invalidate(self):
+        with self._lock:
+            self._rates = {}
+            self._factors.clear()
+            self._loaded_at = 0.0
+
+
+fx_rate_cache = FxRateCache()
+
+
+def replace_fx_rates(db: Session, rates: dict[str, float], *, source: str) -> int:
+    """Upsert the given rates; currencies not listed keep their previous rate."""
+    existing = {row.currency: row for row in db.query(FxRate).filter(FxRate.currency.in_(list(rates)))}
+    now = datetime.utcnow()
+    for currency, rate in rates.items():
+        row = existing.get(currency)
+        if row is None:
+            db.add(FxRate(currency=currency, units_per_usd=rate, source=source, updated_at=now))
+        else:
+            row.units_per_usd = rate
+            row.source = source
+            row.updated_at = now
+    db.commit()
+    fx_rate_cache.invalidate()
+    # Cached summaries carry converted totals.
+    workspace_cache.invalidate_all()
+    return len(rates)
+
+
+def seed_fx_rates(db: Session) -> int:
+    if db.query(FxRate.currency).first() is not None:
+        return 0
+    return replace_fx_rates(db, load_fx_rate_file(), source="seed")
+
+
+def fx_rate_join(currency_expr, target_currency: str):
+    """Pieces for converting amounts in SQL: (source_rate_alias, onclause, target_rate_subquery).
+
+    Outer-join the alias with `onclause`; `amount / alias.units_per_usd * target_rate` is then the
+    amount in `target_currency`, or NULL when either rate is missing.
+    """
+    source_rate = aliased(FxRate, name="source_fx")
+    target_rate = (
+        select(FxRate.units_per_usd)
+        .where(FxRate.currency == target_currency.upper())
+        .scalar_subquery()
+    )
+    return source_rate, source_rate.currency == currency_expr, target_rate
@@ -0,0 +1,116 @@
+import re
+import time
+from threading import Lock
+from typing import Optional
+
+from config import get_settings
+
+try:
+    import requests
+    from google.auth import jwt as google_jwt
+except Exception:  # pragma: no cover - optional dependency fallback
+    requests = None
+    google_jwt = None
+    GOOGLE_AUTH_IMPORT_ERROR = "google-auth runtime import failed (install google-auth and requests)"
+else:
+    GOOGLE_AUTH_IMPORT_ERROR = None
+
+settings = get_settings()
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+GOOGLE_CERTS_DEFAULT_MAX_AGE = 300
+# An unknown `kid` forces a refetch (Google rotated keys), but never more often than this.
+GOOGLE_CERTS_MIN_REFETCH_SECONDS = 60
+GOOGLE_CERTS_FETCH_TIMEOUT_SECONDS = 5
+GOOGLE_CLOCK_SKEW_SECONDS = 10
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleCertsUnavailable(Exception):
+    """Google's signing certs could not be fetched and none are cached."""
+
+
+class GoogleIdTokenVerifier:
+    """Verifies Google ID tokens offline against a cached copy of Google's signing certs.
+
+    Certs are kept until their Cache-Control expiry and fetched over one pooled HTTP session,
+    so steady-state logins make no outbound call.
+    """
+
+    def __init__(self, certs_url: str):
+        self.certs_url = certs_url
+        self._session = None
+        self._certs: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = Lock()
+        self.hits = 0
+        self.fetches = 0
+
+    def _http(self):
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    def _fetch(self):
+        try:
+            response = self._http().get(self.certs_url, timeout=GOOGLE_CERTS_FETCH_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            certs = response.json()
+        except (requests.RequestException, ValueError) as exc:
+            if not self._certs:
+                raise GoogleCertsUnavailable(f"Could not fetch Google signing certs: {exc}") from exc
+            # Keep verifying with the certs we have; try again after the refetch interval.
+            self._fetched_at = time.time()
+            self._expires_at = self._fetched_at + GOOGLE_CERTS_MIN_REFETCH_SECONDS
+            return
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else GOOGLE_CERTS_DEFAULT_MAX_AGE
+        try:
+            max_age -= int(response.headers.get("Age", 0))
+        except ValueError:
+            pass
+        now = time.time()
+        self._certs = certs
+        self._fetched_at = now
+        self._expires_at = now + max(0, max_age)
+        self.fetches += 1
+
+    def certs(self, *, force: bool = False) -> dict[str, str]:
+        with self._lock:
+            now = time.time()
+            stale = now >= self._expires_at
+            if stale or (force and now - self._fetched_at >= GOOGLE_CERTS_MIN_REFETCH_SECONDS):
+                self._fetch()
+            else:
+                self.hits += 1
+            return self._certs
+
+    def verify(self, token: str, audience: str) -> dict:
+        """Claims of a valid token for `audience`; raises ValueError (or google-auth errors) otherwise."""
+        if google_jwt is None:
+            raise RuntimeError(GOOGLE_AUTH_IMPORT_ERROR)
+        certs = self.certs()
+        key_id = google_jwt.decode_header(token).get("kid")
+        if key_id not in certs:
+            certs = self.certs(force=True)
+        claims = google_jwt.decode(
+            token,
+            certs=certs,
+            audience=audience,
+            clock_skew_in_seconds=GOOGLE_CLOCK_SKEW_SECONDS,
+        )
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+        return claims
+
+    def reset(self, certs_url: Optional[str] = None):
+        with self._lock:
+            if certs_url is not None:
+                self.certs_url = certs_url
+            self._certs = {}
+            self._expires_at = 0.0
+            self._fetched_at = 0.0
+
+
+google_id_verifier = GoogleIdTokenVerifier(settings.GOOGLE_CERTS_URL)
@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import Optional
+
+from jose import jwk, jwt
+from jose.exceptions import JWTError
+
+from config import get_settings
+
+settings = get_settings()
+
+SIGNING_ALGORITHM = "RS256"
+LEGACY_ALGORITHM = "HS256"
+# Keys staged here verify and are published, but never become the default signer.
+STAGED_KEYS_SUBDIR = "next"
+
+
+class JwtKeyRing:
+    """RS256 signing keys loaded once from `<kid>.pem` files, with their public halves preloaded.
+
+    Every key verifies tokens and is published in the JWKS; only the active one signs. Keys in
+    the `next/` subdirectory are staged: they verify but are not picked as the default signer, so
+    a rolling restart never issues tokens that instances without the new file reject. Rotation is:
+    stage a key, restart everywhere, promote it to the top directory, restart again, and delete the
+    old file once the tokens it signed have expired. The first key goes through the same steps:
+    until a key is promoted (or there is no key directory) the ring signs HS256 with SECRET_KEY,
+    as before; once one is, HS256 tokens are still accepted while `accept_legacy`.
+    """
+
+    def __init__(self, keys_dir: Optional[Path], active_kid: Optional[str], secret_key: str, accept_legacy: bool):
+        self.secret_key = secret_key
+        self.accept_legacy = accept_legacy
+        self._signing_keys: dict[str, jwk.Key] = {}
+        self._verifying_keys: dict[str, jwk.Key] = {}
+        self.staged_kids: set[str] = set()
+        if keys_dir is not None:
+            for path in sorted(Path(keys_dir).glob(f"{STAGED_KEYS_SUBDIR}/*.pem")):
+                self._load(path)
+                self.staged_kids.add(path.stem)
+            for path in sorted(Path(keys_dir).glob("*.pem")):
+                self._load(path)
+                self.staged_kids.discard(path.stem)
+        if active_kid and active_kid not in self._signing_keys:
+            raise ValueError(f"JWT_ACTIVE_KID {active_kid!r} has no key file in {keys_dir}")
+        # Default to the newest promoted key when kids sort by date (scripts/rotate_jwt_key.py names them so).
+        promoted = [kid for kid in self._signing_keys if kid not in self.staged_kids]
+        self.active_kid = active_kid or (max(promoted) if promoted else None)
+
+    def _load(self, path: Path):
+        private_key = jwk.construct(path.read_text(encoding="utf-8"), SIGNING_ALGORITHM)
+        self._signing_keys[path.stem] = private_key
+        self._verifying_keys[path.stem] = private_key.public_key()
+
+    @property
+    def asymmetric(self) -> bool:
+        return self.active_kid is not None
+
+    def encode(self, claims: dict) -> str:
+        if not self.asymmetric:
+            return jwt.encode(claims, self.secret_key, algorithm=LEGACY_ALGORITHM)
+        return jwt.encode(
+            claims,
+            self._signing_keys[self.active_kid],
+            algorithm=SIGNING_ALGORITHM,
+            headers={"kid": self.active_kid},
+        )
+
+    def decode(self, token: str) -> dict:
+        """Verified claims; raises `JWTError` for bad signatures, unknown kids or disallowed algorithms."""
+        header = jwt.get_unverified_header(token)
+        # The key is picked by alg + kid so an RS256 public key can never be used as an HS256 secret.
+        if header.get("alg") == LEGACY_ALGORITHM:
+            if self.asymmetric and not self.accept_legacy:
+                raise JWTError("HS256 tokens are no longer accepted")
+            return jwt.decode(token, self.secret_key, algorithms=[LEGACY_ALGORITHM])
+        key = self._verifying_keys.get(header.get("kid"))
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, key, algorithms=[SIGNING_ALGORITHM])
+
+    def jwks(self) -> dict:
+        keys = []
+        for kid, key in self._verifying_keys.items():
+            entry = key.to_dict()
+            entry.update({"kid": kid, "use": "sig", "alg": SIGNING_ALGORITHM})
+            keys.append(entry)
+        return {"keys": keys}
+
+
+def load_jwt_key_ring() -> JwtKeyRing:
+    keys_dir = Path(settings.JWT_KEYS_DIR) if settings.JWT_KEYS_DIR else None
+    return JwtKeyRing(
+        keys_dir,
+        settings.JWT_ACTIVE_KID,
+        settings.SECRET_KEY,
+        settings.JWT_ACCEPT_LEGACY_HS256,
+    )
+
+
+jwt_key_ring = load_jwt_key_ring()
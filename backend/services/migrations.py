@@ -12,12 +12,45 @@ POSTGRES_RLS_TABLES = (
     "pilot_feedback",
     "admin_events",
     "ai_runtime_config",
+    "sync_tombstones",
+    "fx_rates",
+    "program_catalog",
+    "user_cache_invalidations",
+    "revoked_sessions",
+)
+
+# Columns added after the initial schema; create_all does not alter existing tables.
+POSTGRES_ADDED_COLUMNS = (
+    ("users", "calendar_feed_token_hash", "VARCHAR"),
+    ("users", "row_version", "INTEGER NOT NULL DEFAULT 1"),
+    ("users", "token_version", "INTEGER NOT NULL DEFAULT 0"),
+    ("essays", "row_version", "INTEGER NOT NULL DEFAULT 1"),
+    ("applications", "row_version", "INTEGER NOT NULL DEFAULT 1"),
+    ("applications", "catalog_program_id", "VARCHAR"),
+    ("applications", "catalog_match_checked_at", "TIMESTAMP"),
+    ("refresh_tokens", "family_id", "VARCHAR"),
+    ("refresh_tokens", "user_agent", "VARCHAR"),
+    ("refresh_tokens", "session_started_at", "TIMESTAMP"),
+    ("refresh_tokens", "revoked_at", "TIMESTAMP"),
+)
+# Tokens issued before families existed become one session each.
+LEGACY_REFRESH_FAMILY_BACKFILL = "UPDATE refresh_tokens SET family_id = 'legacy-' || id WHERE family_id IS NULL"
+SYNC_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_applications_user_id_updated_at ON applications(user_id, updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_essays_user_id_updated_at ON essays(user_id, updated_at)",
+)
+POSTGRES_ADDED_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_calendar_feed_token_hash ON users(calendar_feed_token_hash)",
+    "CREATE INDEX IF NOT EXISTS ix_applications_catalog_program_id ON applications(catalog_program_id)",
+    "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_family_id ON refresh_tokens(family_id)",
+    *SYNC_INDEXES,
 )
 
 
 def run_schema_migrations(engine):
     """Lightweight schema + security migrations for supported dialects."""
     if engine.dialect.name == "postgresql":
+        run_postgres_column_migrations(engine)
         run_postgres_security_migrations(engine)
         return
 
@@ -54,11 +87,22 @@ def run_schema_migrations(engine):
         if "role" not in user_column_names:
             conn.execute(text("ALTER TABLE users ADD COLUMN role VARCHAR DEFAULT 'user'"))
             conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_role ON users(role)"))
+        if "calendar_feed_token_hash" not in user_column_names:
+            conn.execute(text("ALTER TABLE users ADD COLUMN calendar_feed_token_hash VARCHAR"))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_calendar_feed_token_hash ON users(calendar_feed_token_hash)"
+            ))
+        if "row_version" not in user_column_names:
+            conn.execute(text("ALTER TABLE users ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1"))
+        if "token_version" not in user_column_names:
+            conn.execute(text("ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"))
 
         columns = conn.execute(text("PRAGMA table_info(essays)")).fetchall()
         column_names = {row[1] for row in columns}
         if "application_id" not in column_names:
             conn.execute(text("ALTER TABLE essays ADD COLUMN application_id INTEGER"))
+        if columns and "row_version" not in column_names:
+            conn.execute(text("ALTER TABLE essays ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1"))
 
         app_columns = conn.execute(text("PRAGMA table_info(applications)")).fetchall()
         app_column_names = {row[1] for row in app_columns}
@@ -72,6 +116,17 @@ def run_schema_migrations(engine):
             conn.execute(text("ALTER TABLE applications ADD COLUMN interview_completed BOOLEAN DEFAULT 0"))
         if app_columns and "decision_status" not in app_column_names:
             conn.execute(text("ALTER TABLE applications ADD COLUMN decision_status VARCHAR DEFAULT 'Pending'"))
+        if app_columns and "row_version" not in app_column_names:
+            conn.execute(text("ALTER TABLE applications ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1"))
+        if app_columns and "catalog_program_id" not in app_column_names:
+            conn.execute(text("ALTER TABLE applications ADD COLUMN catalog_program_id VARCHAR"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_applications_catalog_program_id ON applications(catalog_program_id)"
+            ))
+        if app_columns and "catalog_match_checked_at" not in app_column_names:
+            conn.execute(text("ALTER TABLE applications ADD COLUMN catalog_match_checked_at DATETIME"))
+        for statement in SYNC_INDEXES:
+            conn.execute(text(statement))
 
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS refresh_tokens (
@@ -87,6 +142,17 @@ def run_schema_migrations(engine):
         conn.execute(text("CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id ON refresh_tokens(user_id)"))
         conn.execute(text("CREATE INDEX IF NOT EXISTS ix_refresh_tokens_token_hash ON refresh_tokens(token_hash)"))
         conn.execute(text("CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires_at ON refresh_tokens(expires_at)"))
+        refresh_column_names = {row[1] for row in conn.execute(text("PRAGMA table_info(refresh_tokens)")).fetchall()}
+        if "family_id" not in refresh_column_names:
+            conn.execute(text("ALTER TABLE refresh_tokens ADD COLUMN family_id VARCHAR"))
+        if "user_agent" not in refresh_column_names:
+            conn.execute(text("ALTER TABLE refresh_tokens ADD COLUMN user_agent VARCHAR"))
+        if "session_started_at" not in refresh_column_names:
+            conn.execute(text("ALTER TABLE refresh_tokens ADD COLUMN session_started_at DATETIME"))
+        if "revoked_at" not in refresh_column_names:
+            conn.execute(text("ALTER TABLE refresh_tokens ADD COLUMN revoked_at DATETIME"))
+        conn.execute(text(LEGACY_REFRESH_FAMILY_BACKFILL))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_refresh_tokens_family_id ON refresh_tokens(family_id)"))
 
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS auth_tokens (
@@ -154,6 +220,15 @@ def run_schema_migrations(engine):
             conn.execute(text("ALTER TABLE ai_runtime_config ADD COLUMN gemini_model VARCHAR NOT NULL DEFAULT 'gemini-1.5-flash'"))
 
 
+def run_postgres_column_migrations(engine):
+    with engine.begin() as conn:
+        for table_name, column_name, column_type in POSTGRES_ADDED_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {column_name} {column_type}"))
+        for statement in POSTGRES_ADDED_INDEXES:
+            conn.execute(text(statement))
+        conn.execute(text(LEGACY_REFRESH_FAMILY_BACKFILL))
+
+
 def run_postgres_security_migrations(engine):
     """
     Idempotent Postgres/Supabase security hardening:
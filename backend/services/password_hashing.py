@@ -0,0 +1,106 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from threading import BoundedSemaphore, Lock
+from typing import Optional
+
+import bcrypt as bcrypt_module
+from passlib.context import CryptContext
+
+from config import get_settings
+
+# passlib 1.7.x expects bcrypt.__about__.__version__ which newer bcrypt releases removed.
+if not hasattr(bcrypt_module, "__about__"):
+    class _BcryptAbout:
+        __version__ = getattr(bcrypt_module, "__version__", "unknown")
+    bcrypt_module.__about__ = _BcryptAbout()  # type: ignore[attr-defined]
+
+settings = get_settings()
+
+# Seconds a client is told to wait when every hashing slot is taken; a bcrypt call is well under that.
+PASSWORD_HASH_RETRY_AFTER_SECONDS = 1
+
+
+class PasswordHashingBusy(Exception):
+    """Raised instead of queueing when `max_pending` hashing jobs are already waiting or running."""
+
+
+@lru_cache(maxsize=4)
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(password)
+
+
+def _verify(password: str, hashed_password: str, rounds: int) -> bool:
+    return _crypt_context(rounds).verify(password, hashed_password)
+
+
+class PasswordHasher:
+    """bcrypt on a dedicated process pool, so hashing bursts cannot starve the request threadpool.
+
+    At most `max_pending` jobs are admitted at once; callers past that get `PasswordHashingBusy`
+    straight away rather than parking another request thread on the queue. `workers=0` hashes
+    inline in the calling thread (scripts, tests).
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = BoundedSemaphore(max(1, max_pending))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self.rejected = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the API process has live DB connections and threads.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if self.max_pending <= 0 or not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy()
+        try:
+            future: Future = self._executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        if not hashed_password:
+            return False
+        return self._run(_verify, password, hashed_password, self.rounds)
+
+    def needs_rehash(self, hashed_password: Optional[str]) -> bool:
+        """True when the hash was made with a different cost factor (or scheme) than configured."""
+        return bool(hashed_password) and _crypt_context(self.rounds).needs_update(hashed_password)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_HASH_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
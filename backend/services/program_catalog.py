@@ -1,25 +1,216 @@
 import json
+import logging
+import os
 import re
+import time
+from datetime import datetime
 from pathlib import Path
+from threading import Lock
+from typing import Optional
 
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import ProgramCatalogEntry
+from schemas import ProgramCatalogItem
+
+logger = logging.getLogger(__name__)
 
 PROGRAM_CATALOG_PATH = Path(__file__).resolve().parents[1] / "data" / "program_catalog_seed.json"
+PROGRAM_CATALOG_REVALIDATE_SECONDS = 30
+PROGRAM_CATALOG_ORDER = (
+    ProgramCatalogEntry.school_name.asc(),
+    ProgramCatalogEntry.program_name.asc(),
+    ProgramCatalogEntry.id.asc(),
+)
 
 
-def load_program_catalog() -> list[dict]:
-    if not PROGRAM_CATALOG_PATH.exists():
+def parse_program_catalog_file(path: Path = PROGRAM_CATALOG_PATH) -> list[ProgramCatalogItem]:
+    if not path.exists():
         return []
-    with PROGRAM_CATALOG_PATH.open("r", encoding="utf-8") as fh:
+    with path.open("r", encoding="utf-8") as fh:
         data = json.load(fh)
     if not isinstance(data, list):
         return []
-    return [item for item in data if isinstance(item, dict)]
+    items: list[ProgramCatalogItem] = []
+    for raw in data:
+        if not isinstance(raw, dict):
+            continue
+        try:
+            items.append(ProgramCatalogItem(**raw))
+        except ValidationError:
+            logger.warning("Skipping invalid program catalog entry: %s", raw.get("id"))
+    return items
 
 
-def save_program_catalog(items: list[dict]) -> None:
-    with PROGRAM_CATALOG_PATH.open("w", encoding="utf-8") as fh:
+def write_program_catalog_file(items: list[dict], path: Path = PROGRAM_CATALOG_PATH) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as fh:
         json.dump(items, fh, indent=2, ensure_ascii=False)
         fh.write("\n")
+    os.replace(tmp_path, path)
+
+
+def seed_program_catalog(db: Session, path: Path = PROGRAM_CATALOG_PATH) -> int:
+    if db.query(ProgramCatalogEntry.id).first() is not None:
+        return 0
+    seen: set[str] = set()
+    for item in parse_program_catalog_file(path):
+        if item.id in seen:
+            continue
+        seen.add(item.id)
+        db.add(ProgramCatalogEntry(**item.model_dump()))
+    db.commit()
+    return len(seen)
+
+
+def export_program_catalog(db: Session) -> list[dict]:
+    """Rows in the seed-file format, ordered by id so exports diff cleanly under version control."""
+    items = []
+    for row in db.query(ProgramCatalogEntry).order_by(ProgramCatalogEntry.id.asc()):
+        item = ProgramCatalogItem.model_validate(row).model_dump()
+        fee = item["application_fee"]
+        if fee is not None and float(fee).is_integer():
+            item["application_fee"] = int(fee)
+        items.append(item)
+    return items
+
+
+def query_program_catalog(db: Session, *, offset: int, limit: int) -> tuple[int, list[ProgramCatalogItem]]:
+    total = db.query(func.count(ProgramCatalogEntry.id)).scalar() or 0
+    rows = db.query(ProgramCatalogEntry).order_by(*PROGRAM_CATALOG_ORDER).offset(offset).limit(limit).all()
+    return total, [ProgramCatalogItem.model_validate(row) for row in rows]
+
+
+def find_program_catalog_item(db: Session, program_id: str) -> Optional[ProgramCatalogItem]:
+    row = db.get(ProgramCatalogEntry, program_id)
+    return ProgramCatalogItem.model_validate(row) if row is not None else None
+
+
+class ProgramCatalogStore:
+    """Process-local copy of the catalog table for in-memory search.
+
+    Served without a query for `revalidate_seconds`; after that one aggregate query decides
+    whether the rows changed (covering writes made by other workers). Writes made in this
+    process are applied directly through `record_write`, which bumps `version`.
+    """
+
+    def __init__(self, revalidate_seconds: int = PROGRAM_CATALOG_REVALIDATE_SECONDS):
+        self.revalidate_seconds = revalidate_seconds
+        self._items: dict[str, ProgramCatalogItem] = {}
+        self._fingerprint: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._lock = Lock()
+        self.version = 0
+        self.hits = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _query_fingerprint(db: Session) -> tuple:
+        row = db.query(func.count(ProgramCatalogEntry.id), func.max(ProgramCatalogEntry.updated_at)).one()
+        return tuple(row)
+
+    def _current(self, db: Session) -> dict[str, ProgramCatalogItem]:
+        with self._lock:
+            if self._loaded and time.time() - self._checked_at < self.revalidate_seconds:
+                self.hits += 1
+                return self._items
+        fingerprint = self._query_fingerprint(db)
+        with self._lock:
+            if self._loaded and fingerprint == self._fingerprint:
+                self._checked_at = time.time()
+                self.hits += 1
+                return self._items
+        rows = db.query(ProgramCatalogEntry).order_by(*PROGRAM_CATALOG_ORDER).all()
+        items = {row.id: ProgramCatalogItem.model_validate(row) for row in rows}
+        with self._lock:
+            self._items = items
+            self._fingerprint = fingerprint
+            self._checked_at = time.time()
+            self._loaded = True
+            self.version += 1
+            self.reloads += 1
+            return self._items
+
+    def items(self, db: Session) -> tuple[ProgramCatalogItem, ...]:
+        return tuple(self._current(db).values())
+
+    def snapshot(self, db: Session) -> tuple[int, tuple[ProgramCatalogItem, ...]]:
+        """Version and records read together, for callers that cache derived structures."""
+        items = self._current(db)
+        with self._lock:
+            return self.version, tuple(items.values())
+
+    def record_write(self, *, upserted: Optional[ProgramCatalogItem] = None, removed_id: Optional[str] = None):
+        # The fingerprint is left stale on purpose: the next revalidation reloads once, picking
+        # up anything other workers wrote in between.
+        with self._lock:
+            if not self._loaded:
+                return
+            items = dict(self._items)
+            if removed_id is not None:
+                items.pop(removed_id, None)
+            if upserted is not None:
+                items[upserted.id] = upserted
+            self._items = items
+            self._checked_at = time.time()
+            self.version += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self.version,
+                "items": len(self._items),
+                "hits": self.hits,
+                "reloads": self.reloads,
+            }
+
+
+program_catalog_store = ProgramCatalogStore()
+
+
+def insert_program_catalog_entry(db: Session, item: ProgramCatalogItem) -> bool:
+    """False when the id is already taken (including by a concurrent insert on another worker)."""
+    if db.get(ProgramCatalogEntry, item.id) is not None:
+        return False
+    db.add(ProgramCatalogEntry(**item.model_dump()))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    program_catalog_store.record_write(upserted=item)
+    return True
+
+
+def update_program_catalog_entry(db: Session, item: ProgramCatalogItem) -> bool:
+    row = db.get(ProgramCatalogEntry, item.id)
+    if row is None:
+        return False
+    for field, value in item.model_dump(exclude={"id"}).items():
+        setattr(row, field, value)
+    row.updated_at = datetime.utcnow()
+    db.commit()
+    program_catalog_store.record_write(upserted=item)
+    return True
+
+
+def delete_program_catalog_entry(db: Session, program_id: str) -> bool:
+    deleted = db.query(ProgramCatalogEntry).filter(ProgramCatalogEntry.id == program_id).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    if not deleted:
+        return False
+    program_catalog_store.record_write(removed_id=program_id)
+    return True
 
 
 def build_program_id(school_name: str, program_name: str, degree: str) -> str:
@@ -0,0 +1,138 @@
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from models import ProgramCatalogEntry
+from schemas import AdminProgramCatalogUpsertRequest, ProgramCatalogItem
+from services.program_catalog import build_program_id, program_catalog_store
+
+IMPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+IMPORT_CHUNK_SIZE = 500
+_UPSERT_FIELDS = frozenset(AdminProgramCatalogUpsertRequest.model_fields)
+
+# (source line number, validated catalog record or None, error message or None)
+ValidatedRow = tuple[int, Optional[dict], Optional[str]]
+
+
+def detect_import_format(path: Path) -> str:
+    try:
+        return IMPORT_FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Cannot infer import format from {path.name}; pass --format csv|ndjson")
+
+
+def iter_import_rows(path: Path, import_format: str) -> Iterator[tuple[int, object]]:
+    """Yield `(line_number, raw_row)` one at a time so large dumps are never held in memory."""
+    with path.open("r", encoding="utf-8-sig", newline="") as fh:
+        if import_format == "csv":
+            reader = csv.DictReader(fh)
+            for row in reader:
+                yield reader.line_num, {
+                    (key or "").strip(): (value.strip() or None) if isinstance(value, str) else value
+                    for key, value in row.items()
+                }
+            return
+        for line_number, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, f"invalid JSON: {exc.msg}"
+
+
+def validate_import_row(numbered_row: tuple[int, object]) -> ValidatedRow:
+    line_number, raw = numbered_row
+    if isinstance(raw, str):
+        return line_number, None, raw
+    if not isinstance(raw, dict):
+        return line_number, None, "row is not an object"
+    try:
+        payload = AdminProgramCatalogUpsertRequest(**{key: value for key, value in raw.items() if key in _UPSERT_FIELDS})
+    except ValidationError as exc:
+        message = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+        )
+        return line_number, None, message
+    program_id = (payload.id or "").lower() or build_program_id(payload.school_name, payload.program_name, payload.degree)
+    item = ProgramCatalogItem(id=program_id, **payload.model_dump(exclude={"id"}))
+    return line_number, item.model_dump(), None
+
+
+def _validate_chunk(chunk: list[tuple[int, object]]) -> list[ValidatedRow]:
+    return [validate_import_row(row) for row in chunk]
+
+
+def _chunked(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def validate_import_rows(
+    rows: Iterable[tuple[int, object]],
+    *,
+    workers: int = 1,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Iterator[ValidatedRow]:
+    """Validate rows with the admin upsert schema, fanning chunks out to worker processes.
+
+    At most `2 * workers` chunks are in flight, so reading stays streaming; results come
+    back in input order.
+    """
+    chunks = _chunked(rows, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _validate_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_validate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def load_catalog_records(db: Session) -> dict[str, dict]:
+    return {row.id: ProgramCatalogItem.model_validate(row).model_dump() for row in db.query(ProgramCatalogEntry)}
+
+
+def diff_program_catalog(existing: dict[str, dict], incoming: dict[str, dict], *, prune: bool) -> dict:
+    added = [item for program_id, item in incoming.items() if program_id not in existing]
+    changed = [
+        item for program_id, item in incoming.items()
+        if program_id in existing and existing[program_id] != item
+    ]
+    missing = sorted(set(existing) - set(incoming))
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": missing if prune else [],
+        "missing": missing,
+        "unchanged": len(incoming) - len(added) - len(changed),
+    }
+
+
+def apply_program_catalog_diff(db: Session, diff: dict) -> None:
+    """Apply the whole diff in one transaction with bulk statements."""
+    now = datetime.utcnow()
+    if diff["added"]:
+        db.execute(insert(ProgramCatalogEntry), [{**item, "updated_at": now} for item in diff["added"]])
+    if diff["changed"]:
+        # ORM bulk UPDATE by primary key: one executemany instead of a round trip per row.
+        db.execute(update(ProgramCatalogEntry), [{**item, "updated_at": now} for item in diff["changed"]])
+    if diff["removed"]:
+        db.execute(delete(ProgramCatalogEntry).where(ProgramCatalogEntry.id.in_(diff["removed"])))
+    db.commit()
+    program_catalog_store.invalidate()
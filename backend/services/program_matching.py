@@ -0,0 +1,299 @@
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import and_, bindparam, func, or_, select, text, update
+from sqlalchemy.orm import Session
+
+from models import ApplicationTracker, ProgramCatalogEntry
+from schemas import ProgramCatalogItem
+from services.program_catalog import ProgramCatalogStore, program_catalog_store
+
+MATCH_STOPWORDS = frozenset({"the", "of", "and", "at", "in", "for", "de"})
+# Words shared by most school names; they say nothing about *which* school was meant.
+GENERIC_SCHOOL_WORDS = frozenset({
+    "school", "business", "university", "college", "graduate", "institute", "management",
+    "faculty", "academy", "gsb",
+})
+SCHOOL_CANDIDATES = 5
+MIN_SCHOOL_SIMILARITY = 0.75
+SCHOOL_WEIGHT = 0.7
+MIN_MATCH_SCORE = 0.8
+MATCH_BATCH_SIZE = 500
+# Postgres advisory lock key so only one process (of all workers and instances) runs a pass at a time.
+CATALOG_MATCH_LOCK_KEY = 420042
+
+
+def normalize_name(value: Optional[str]) -> list[str]:
+    text = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode("ascii").lower()
+    return [token for token in re.findall(r"[a-z0-9]+", text.replace("&", " and ")) if token not in MATCH_STOPWORDS]
+
+
+def school_key(tokens: list[str]) -> str:
+    return " ".join(token for token in tokens if token not in GENERIC_SCHOOL_WORDS)
+
+
+def edit_similarity(left: str, right: str) -> float:
+    """1 - Levenshtein distance / longer length."""
+    if left == right:
+        return 1.0
+    if not left or not right:
+        return 0.0
+    if len(left) < len(right):
+        left, right = right, left
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, start=1):
+        current = [i]
+        for j, right_char in enumerate(right, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (left_char != right_char),
+            ))
+        previous = current
+    return 1.0 - previous[-1] / len(left)
+
+
+def name_similarity(left: str, right: str) -> float:
+    """Best of whole-string edit similarity and token containment ("full time mba" ~ "mba")."""
+    left_tokens, right_tokens = set(left.split()), set(right.split())
+    containment = 0.0
+    if left_tokens and right_tokens:
+        containment = len(left_tokens & right_tokens) / min(len(left_tokens), len(right_tokens))
+    return max(edit_similarity(left, right), containment)
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CatalogMatchIndex:
+    """Catalog schools keyed by their distinctive words, with a trigram index for typo lookup.
+
+    Built from the program catalog store and rebuilt whenever the store version moves. Each
+    lookup scores at most `SCHOOL_CANDIDATES` schools with edit distance, so matching cost
+    stays flat as the catalog grows.
+    """
+
+    def __init__(self, store: ProgramCatalogStore = program_catalog_store):
+        self.store = store
+        self._lock = Lock()
+        self._version: Optional[int] = None
+        # school key -> [(program id, normalized program name, normalized degree)]
+        self._schools: dict[str, list[tuple[str, str, str]]] = {}
+        self._aliases: dict[str, str] = {}
+        self._grams: dict[str, set[str]] = {}
+
+    def _rebuild(self, version: int, items: tuple[ProgramCatalogItem, ...]):
+        schools: dict[str, list[tuple[str, str, str]]] = defaultdict(list)
+        aliases: dict[str, str] = {}
+        grams: dict[str, set[str]] = defaultdict(set)
+        for item in items:
+            tokens = normalize_name(item.school_name)
+            key = school_key(tokens) or " ".join(tokens)
+            if not key:
+                continue
+            schools[key].append((
+                item.id,
+                " ".join(normalize_name(item.program_name)),
+                " ".join(normalize_name(item.degree)),
+            ))
+            if len(tokens) >= 2:
+                # "Harvard Business School" is also typed as "HBS".
+                aliases.setdefault("".join(token[0] for token in tokens), key)
+        for key in schools:
+            for gram in _trigrams(key):
+                grams[gram].add(key)
+        self._schools, self._aliases, self._grams = dict(schools), aliases, dict(grams)
+        self._version = version
+
+    def ensure_current(self, db: Session):
+        version, items = self.store.snapshot(db)
+        with self._lock:
+            if self._version != version:
+                self._rebuild(version, items)
+
+    def _candidate_schools(self, key: str) -> list[tuple[str, float]]:
+        exact = [key] if key in self._schools else []
+        alias = self._aliases.get(key.replace(" ", ""))
+        if alias:
+            exact.append(alias)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in _trigrams(key):
+            for candidate in self._grams.get(gram, ()):
+                shared[candidate] += 1
+        nearest = sorted(shared, key=lambda candidate: -shared[candidate])[:SCHOOL_CANDIDATES]
+        scored = {candidate: 1.0 for candidate in exact}
+        for candidate in nearest:
+            scored.setdefault(candidate, name_similarity(key, candidate))
+        return [(candidate, score) for candidate, score in scored.items() if score >= MIN_SCHOOL_SIMILARITY]
+
+    def match(self, school_name: Optional[str], program_name: Optional[str]) -> Optional[tuple[str, float]]:
+        """Best `(program_id, score)` for a hand-typed school/program pair, or None."""
+        tokens = normalize_name(school_name)
+        key = school_key(tokens) or " ".join(tokens)
+        if not key:
+            return None
+        program = " ".join(normalize_name(program_name))
+        best: Optional[tuple[str, float]] = None
+        with self._lock:
+            for candidate, school_score in self._candidate_schools(key):
+                programs = self._schools[candidate]
+                for program_id, catalog_program, catalog_degree in programs:
+                    if program:
+                        program_score = max(
+                            name_similarity(program, catalog_program),
+                            name_similarity(program, catalog_degree),
+                        )
+                    else:
+                        program_score = 0.5 if len(programs) == 1 else 0.0
+                    score = SCHOOL_WEIGHT * school_score + (1 - SCHOOL_WEIGHT) * program_score
+                    if score >= MIN_MATCH_SCORE and (best is None or score > best[1]):
+                        best = (program_id, score)
+        return best
+
+
+catalog_match_index = CatalogMatchIndex()
+
+_applications = ApplicationTracker.__table__
+# Both writes only land if the row is unchanged since it was read (same updated_at); a row the
+# user edited in between is skipped and, being newer than its last check, retried next pass.
+_guarded_update = _applications.update().where(
+    _applications.c.id == bindparam("b_id"),
+    _applications.c.updated_at == bindparam("b_seen"),
+)
+# updated_at is set explicitly (to the value read) so its onupdate default does not move it.
+_mark_checked = _guarded_update.values(catalog_match_checked_at=bindparam("b_now"), updated_at=bindparam("b_seen"))
+# A new link is a visible change, so it moves updated_at (and /sync picks it up).
+_relink = _guarded_update.values(
+    catalog_program_id=bindparam("b_program"),
+    catalog_match_checked_at=bindparam("b_now"),
+    updated_at=bindparam("b_now"),
+)
+
+
+def match_applications_to_catalog(db: Session, *, batch_size: int = MATCH_BATCH_SIZE) -> dict:
+    """Link applications (all users) to catalog programs, only revisiting rows that could have changed.
+
+    A row is pending when it was never checked, was edited since its last check, or is still
+    unlinked and the catalog changed since then. Links to deleted programs are dropped first.
+    """
+    catalog_match_index.ensure_current(db)
+    db.execute(
+        update(ApplicationTracker)
+        .where(
+            ApplicationTracker.catalog_program_id.is_not(None),
+            ApplicationTracker.catalog_program_id.not_in(select(ProgramCatalogEntry.id)),
+        )
+        .values(catalog_program_id=None, catalog_match_checked_at=None, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    catalog_changed_at = db.query(func.max(ProgramCatalogEntry.updated_at)).scalar()
+    pending = or_(
+        ApplicationTracker.catalog_match_checked_at.is_(None),
+        ApplicationTracker.catalog_match_checked_at < ApplicationTracker.updated_at,
+    )
+    if catalog_changed_at is not None:
+        pending = or_(pending, and_(
+            ApplicationTracker.catalog_program_id.is_(None),
+            ApplicationTracker.catalog_match_checked_at < catalog_changed_at,
+        ))
+
+    stats = {"checked": 0, "linked": 0, "unlinked": 0, "skipped": 0}
+    last_id = 0
+    while True:
+        rows = db.query(
+            ApplicationTracker.id,
+            ApplicationTracker.school_name,
+            ApplicationTracker.program_name,
+            ApplicationTracker.catalog_program_id,
+            ApplicationTracker.updated_at,
+        ).filter(pending, ApplicationTracker.id > last_id).order_by(ApplicationTracker.id.asc()).limit(batch_size).all()
+        if not rows:
+            break
+        now = datetime.utcnow()
+        unchanged = []
+        for row in rows:
+            match = catalog_match_index.match(row.school_name, row.program_name)
+            program_id = match[0] if match else None
+            if program_id == row.catalog_program_id:
+                unchanged.append({"b_id": row.id, "b_seen": row.updated_at, "b_now": now})
+                continue
+            # Link changes are rare, so they go one by one to count the ones that actually landed.
+            applied = db.execute(
+                _relink, {"b_id": row.id, "b_seen": row.updated_at, "b_now": now, "b_program": program_id}
+            ).rowcount
+            if applied:
+                stats["linked" if program_id else "unlinked"] += 1
+            else:
+                stats["skipped"] += 1
+        if unchanged:
+            db.execute(_mark_checked, unchanged)
+        db.commit()
+        stats["checked"] += len(rows)
+        last_id = rows[-1].id
+    return stats
+
+
+class CatalogMatchWorker:
+    """Daemon thread that runs `match_applications_to_catalog` every `interval_seconds`.
+
+    On Postgres each pass first takes an advisory lock, so with several API processes only one
+    of them scans at a time and the others skip that tick.
+    """
+
+    def __init__(self, session_factory, interval_seconds: int):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="catalog-match", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self, batch_size: int = MATCH_BATCH_SIZE) -> Optional[dict]:
+        """One matching pass, or None when another process holds the matching lock."""
+        db = self.session_factory()
+        lock_conn = None
+        try:
+            bind = db.get_bind()
+            if bind.dialect.name == "postgresql":
+                # Session-level lock on a dedicated connection: the pass commits once per batch.
+                lock_conn = bind.connect()
+                acquired = lock_conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": CATALOG_MATCH_LOCK_KEY}
+                ).scalar()
+                if not acquired:
+                    lock_conn.close()
+                    lock_conn = None
+                    return None
+            return match_applications_to_catalog(db, batch_size=batch_size)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            if lock_conn is not None:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": CATALOG_MATCH_LOCK_KEY})
+                lock_conn.commit()
+                lock_conn.close()
+            db.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as exc:
+                print(f"WARNING: catalog matching run failed: {exc}")
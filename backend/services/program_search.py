@@ -0,0 +1,362 @@
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from threading import Lock
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from schemas import ProgramCatalogItem
+from services.program_catalog import ProgramCatalogStore, program_catalog_store
+
+# Per-field boosts: a hit in the school or program name outranks one in the location.
+SEARCH_FIELD_WEIGHTS = {
+    "school_name": 3.0,
+    "program_name": 3.0,
+    "degree": 2.0,
+    "country": 1.0,
+    "city": 1.0,
+}
+EXACT_MATCH_FACTOR = 1.0
+PREFIX_MATCH_FACTOR = 0.7
+FUZZY_MATCH_FACTOR = 0.5
+FUZZY_MIN_SIMILARITY = 0.35
+FUZZY_MIN_TOKEN_LENGTH = 3
+PREFIX_EXPANSION_LIMIT = 64
+FACET_NAMES = ("country", "degree", "fee_range", "deadline_month")
+# (lower bound inclusive, upper bound exclusive, label); amounts are in each program's own fee currency.
+FEE_BANDS = ((0, 100, "0-99"), (100, 200, "100-199"), (200, 300, "200-299"), (300, None, "300+"))
+_FEE_BAND_ORDER = {label: position for position, (_, _, label) in enumerate(FEE_BANDS)}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fee_band(fee: float) -> str:
+    for low, high, label in FEE_BANDS:
+        if fee >= low and (high is None or fee < high):
+            return label
+    return FEE_BANDS[0][2]
+
+
+def _catalog_order(item: ProgramCatalogItem):
+    return item.school_name.lower(), item.program_name.lower(), item.id
+
+
+def _intersect(base: set[str], constraints: Iterable[set[str]]) -> set[str]:
+    result = base
+    for ids in sorted(constraints, key=len):
+        result = result & ids
+        if not result:
+            break
+    return result
+
+
+def _range_ids(entries: list[tuple], low, high) -> set[str]:
+    start = 0 if low is None else bisect_left(entries, (low,))
+    stop = len(entries) if high is None else bisect_right(entries, (high, "\U0010ffff"))
+    return {program_id for _, program_id in entries[start:stop]}
+
+
+class ProgramSearchIndex:
+    """Token inverted index over the catalog with a trigram index of the vocabulary.
+
+    Postings map token -> {program_id: field weight}. Query tokens match exactly, by prefix
+    (via a sorted vocabulary and bisect) or, failing both, by trigram similarity so small
+    typos still find the program. Facets are posting lists too (facet -> value -> ids), with
+    fees and deadlines additionally kept as sorted lists for range filters, so a filtered
+    query is a handful of set intersections. Admin writes call `upsert`/`remove` to patch the
+    index in place; any other catalog change (a store reload) triggers a full rebuild.
+    """
+
+    def __init__(self, store: ProgramCatalogStore = program_catalog_store):
+        self.store = store
+        self._lock = Lock()
+        self._version: Optional[int] = None
+        self._items: dict[str, ProgramCatalogItem] = {}
+        self._doc_tokens: dict[str, dict[str, float]] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._trigrams: dict[str, set[str]] = defaultdict(set)
+        self._vocabulary: list[str] = []
+        self._facets: dict[str, dict[str, set[str]]] = {name: {} for name in FACET_NAMES}
+        self._doc_facets: dict[str, tuple[list[tuple[str, str]], list[tuple[list, tuple]]]] = {}
+        self._fees: list[tuple[float, str]] = []
+        self._deadlines: list[tuple[str, str]] = []
+        self._all_facet_counts: Optional[dict[str, list[dict]]] = None
+        self.rebuilds = 0
+
+    # -- maintenance -------------------------------------------------------
+
+    def _add(self, item: ProgramCatalogItem):
+        weights: dict[str, float] = {}
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(item, field)):
+                weights[token] = max(weights.get(token, 0.0), weight)
+        self._items[item.id] = item
+        self._doc_tokens[item.id] = weights
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                insort(self._vocabulary, token)
+                for gram in trigrams(token):
+                    self._trigrams[gram].add(token)
+            posting[item.id] = weight
+        self._add_facets(item)
+
+    def _add_facets(self, item: ProgramCatalogItem):
+        facets = [("country", item.country.strip()), ("degree", item.degree.strip())]
+        range_entries: list[tuple[list, tuple]] = []
+        if item.application_fee is not None:
+            facets.append(("fee_range", fee_band(item.application_fee)))
+            entry = (item.application_fee, item.id)
+            insort(self._fees, entry)
+            range_entries.append((self._fees, entry))
+        for deadline in sorted({item.deadline_round_1, item.deadline_round_2} - {None}):
+            if not _ISO_DATE_RE.match(deadline):
+                continue
+            facets.append(("deadline_month", deadline[:7]))
+            entry = (deadline, item.id)
+            insort(self._deadlines, entry)
+            range_entries.append((self._deadlines, entry))
+        facets = list(dict.fromkeys(facets))
+        for facet, value in facets:
+            self._facets[facet].setdefault(value, set()).add(item.id)
+        self._doc_facets[item.id] = (facets, range_entries)
+        self._all_facet_counts = None
+
+    def _remove_facets(self, program_id: str):
+        facets, range_entries = self._doc_facets.pop(program_id, ([], []))
+        for facet, value in facets:
+            ids = self._facets[facet].get(value)
+            if ids is not None:
+                ids.discard(program_id)
+                if not ids:
+                    del self._facets[facet][value]
+        for entries, entry in range_entries:
+            index = bisect_left(entries, entry)
+            if index < len(entries) and entries[index] == entry:
+                del entries[index]
+        self._all_facet_counts = None
+
+    def _remove(self, program_id: str):
+        self._items.pop(program_id, None)
+        self._remove_facets(program_id)
+        for token in self._doc_tokens.pop(program_id, {}):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(program_id, None)
+            if posting:
+                continue
+            del self._postings[token]
+            index = bisect_left(self._vocabulary, token)
+            if index < len(self._vocabulary) and self._vocabulary[index] == token:
+                del self._vocabulary[index]
+            for gram in trigrams(token):
+                grams = self._trigrams.get(gram)
+                if grams is not None:
+                    grams.discard(token)
+                    if not grams:
+                        del self._trigrams[gram]
+
+    def _rebuild(self, version: int, items: Iterable[ProgramCatalogItem]):
+        self._items = {}
+        self._doc_tokens = {}
+        self._postings = {}
+        self._trigrams = defaultdict(set)
+        self._vocabulary = []
+        self._facets = {name: {} for name in FACET_NAMES}
+        self._doc_facets = {}
+        self._fees = []
+        self._deadlines = []
+        self._all_facet_counts = None
+        for item in items:
+            if item.id not in self._items:
+                self._add(item)
+        self._version = version
+        self.rebuilds += 1
+
+    def _ensure_current(self, db: Session):
+        version, items = self.store.snapshot(db)
+        with self._lock:
+            if self._version != version:
+                self._rebuild(version, items)
+
+    def upsert(self, db: Session, item: ProgramCatalogItem):
+        """Patch one record in after an admin write has been applied to the store."""
+        version, items = self.store.snapshot(db)
+        with self._lock:
+            if self._version is None or version - self._version > 1:
+                self._rebuild(version, items)
+                return
+            self._remove(item.id)
+            self._add(item)
+            self._version = version
+
+    def remove(self, db: Session, program_id: str):
+        version, items = self.store.snapshot(db)
+        with self._lock:
+            if self._version is None or version - self._version > 1:
+                self._rebuild(version, items)
+                return
+            self._remove(program_id)
+            self._version = version
+
+    # -- querying ----------------------------------------------------------
+
+    def _prefix_tokens(self, prefix: str) -> list[str]:
+        start = bisect_left(self._vocabulary, prefix)
+        matches = []
+        for token in self._vocabulary[start:start + PREFIX_EXPANSION_LIMIT]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def _fuzzy_tokens(self, token: str) -> list[tuple[str, float]]:
+        if len(token) < FUZZY_MIN_TOKEN_LENGTH:
+            return []
+        query_grams = trigrams(token)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self._trigrams.get(gram, ()):
+                shared[candidate] += 1
+        matches = []
+        for candidate, overlap in shared.items():
+            similarity = overlap / (len(query_grams) + len(trigrams(candidate)) - overlap)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                matches.append((candidate, similarity))
+        return matches
+
+    def _token_scores(self, token: str, allow_prefix: bool) -> dict[str, float]:
+        scores: dict[str, float] = {}
+
+        def credit(vocab_token: str, factor: float):
+            for program_id, weight in self._postings[vocab_token].items():
+                score = weight * factor
+                if score > scores.get(program_id, 0.0):
+                    scores[program_id] = score
+
+        if token in self._postings:
+            credit(token, EXACT_MATCH_FACTOR)
+        if allow_prefix:
+            for candidate in self._prefix_tokens(token):
+                if candidate != token:
+                    # Shorter completions are closer to what was typed.
+                    credit(candidate, PREFIX_MATCH_FACTOR * len(token) / len(candidate))
+        if not scores:
+            for candidate, similarity in self._fuzzy_tokens(token):
+                credit(candidate, FUZZY_MATCH_FACTOR * similarity)
+        return scores
+
+    def _ranked(self, tokens: list[str], prefix_last_only: bool) -> list[tuple[float, ProgramCatalogItem]]:
+        totals: Optional[dict[str, float]] = None
+        for position, token in enumerate(tokens):
+            allow_prefix = not prefix_last_only or position == len(tokens) - 1
+            scores = self._token_scores(token, allow_prefix)
+            if totals is None:
+                totals = scores
+            else:
+                # Every query token has to match something.
+                totals = {pid: totals[pid] + score for pid, score in scores.items() if pid in totals}
+            if not totals:
+                return []
+        ranked = [(score, self._items[pid]) for pid, score in (totals or {}).items()]
+        ranked.sort(key=lambda pair: (-pair[0], *_catalog_order(pair[1])))
+        return ranked
+
+    def _facet_counts(self, base: set[str], constraints: dict[str, set[str]]) -> dict[str, list[dict]]:
+        """Per-value counts; each facet ignores its own filter so sibling values stay selectable."""
+        counts: dict[str, list[dict]] = {}
+        for facet, postings in self._facets.items():
+            candidates = _intersect(base, [ids for name, ids in constraints.items() if name != facet])
+            rows = [
+                {"value": value, "count": len(ids & candidates)}
+                for value, ids in postings.items()
+            ]
+            rows = [row for row in rows if row["count"]]
+            if facet == "fee_range":
+                rows.sort(key=lambda row: _FEE_BAND_ORDER[row["value"]])
+            elif facet == "deadline_month":
+                rows.sort(key=lambda row: row["value"])
+            else:
+                rows.sort(key=lambda row: (-row["count"], row["value"].lower()))
+            counts[facet] = rows
+        return counts
+
+    def facet_counts(self, db: Session) -> dict[str, list[dict]]:
+        """Counts over the whole catalog, cached until the next index change."""
+        self._ensure_current(db)
+        with self._lock:
+            if self._all_facet_counts is None:
+                self._all_facet_counts = self._facet_counts(set(self._items), {})
+            return self._all_facet_counts
+
+    def find(
+        self,
+        db: Session,
+        *,
+        query: Optional[str] = None,
+        facet_values: Optional[dict[str, set[str]]] = None,
+        fee_min: Optional[float] = None,
+        fee_max: Optional[float] = None,
+        deadline_after: Optional[str] = None,
+        deadline_before: Optional[str] = None,
+    ) -> tuple[list[ProgramCatalogItem], dict[str, list[dict]]]:
+        """Records matching the text query and every filter (ranked when there is a query), plus facet counts.
+
+        Values within one facet are OR-ed; different facets and ranges are AND-ed. A program
+        matches a deadline range when either round falls inside it.
+        """
+        tokens = tokenize(query)
+        self._ensure_current(db)
+        with self._lock:
+            ranked = None
+            if query and query.strip():
+                # A query made only of punctuation ("--") matches nothing rather than everything.
+                ranked = [item for _, item in self._ranked(tokens, prefix_last_only=False)] if tokens else []
+            base = {item.id for item in ranked} if ranked is not None else set(self._items)
+
+            constraints: dict[str, set[str]] = {}
+            for facet, values in (facet_values or {}).items():
+                if not values:
+                    continue
+                wanted = {value.strip().lower() for value in values}
+                constraints[facet] = {
+                    program_id
+                    for value, ids in self._facets[facet].items() if value.lower() in wanted
+                    for program_id in ids
+                }
+            if fee_min is not None or fee_max is not None:
+                constraints["fee_range"] = _range_ids(self._fees, fee_min, fee_max)
+            if deadline_after is not None or deadline_before is not None:
+                constraints["deadline_month"] = _range_ids(self._deadlines, deadline_after, deadline_before)
+
+            matched = _intersect(base, constraints.values())
+            if ranked is not None:
+                items = [item for item in ranked if item.id in matched]
+            else:
+                items = sorted((self._items[program_id] for program_id in matched), key=_catalog_order)
+            return items, self._facet_counts(base, constraints)
+
+    def autocomplete(self, db: Session, prefix: str, limit: int) -> list[tuple[float, ProgramCatalogItem]]:
+        """Completions for text being typed: earlier tokens are whole words, the last one a prefix."""
+        tokens = tokenize(prefix)
+        if not tokens:
+            return []
+        self._ensure_current(db)
+        with self._lock:
+            return self._ranked(tokens, prefix_last_only=True)[:limit]
+
+
+program_search_index = ProgramSearchIndex()
@@ -0,0 +1,136 @@
+import hashlib
+import math
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from models import RefreshToken, RevokedSession
+
+settings = get_settings()
+
+REVOCATION_FILTER_CAPACITY = 100_000
+REVOCATION_FILTER_ERROR_RATE = 0.001
+REVOCATION_POLL_SECONDS = 1.0
+# Rebuilt from the table this often so expired revocations stop taking up bits.
+REVOCATION_REBUILD_SECONDS = 3600
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings: no false negatives, `error_rate` false positives at capacity."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SessionRevocationFilter:
+    """Per-process Bloom filter of revoked session ids, backed by `revoked_sessions`.
+
+    Access-token checks only query the table when the filter says "maybe revoked", so the
+    common case costs no DB lookup. Rows revoked by other workers are picked up by polling
+    `revoked_sessions` for new ids at most every `poll_seconds`.
+    """
+
+    def __init__(self, capacity: int = REVOCATION_FILTER_CAPACITY, poll_seconds: float = REVOCATION_POLL_SECONDS):
+        self.capacity = capacity
+        self.poll_seconds = poll_seconds
+        self._filter = BloomFilter(capacity, REVOCATION_FILTER_ERROR_RATE)
+        self._last_id: Optional[int] = None
+        self._polled_at = 0.0
+        self._built_at = 0.0
+        self._lock = Lock()
+        self.checks = 0
+        self.lookups = 0
+
+    def _rebuild(self, db: Session):
+        # Read the high-water mark first: rows committed after it are left to the next poll.
+        last_id = db.query(func.max(RevokedSession.id)).scalar() or 0
+        rows = db.query(RevokedSession.session_id).filter(
+            RevokedSession.id <= last_id,
+            RevokedSession.expires_at > datetime.utcnow(),
+        ).all()
+        bloom = BloomFilter(max(self.capacity, len(rows) * 2), REVOCATION_FILTER_ERROR_RATE)
+        for row in rows:
+            bloom.add(row.session_id)
+        with self._lock:
+            self._filter = bloom
+            self._last_id = last_id
+            self._built_at = time.time()
+
+    def poll(self, db: Session):
+        now = time.time()
+        with self._lock:
+            if now - self._polled_at < self.poll_seconds:
+                return
+            self._polled_at = now
+            needs_rebuild = (
+                self._last_id is None
+                or now - self._built_at >= REVOCATION_REBUILD_SECONDS
+                or self._filter.count >= self.capacity
+            )
+            last_id = self._last_id
+        if needs_rebuild:
+            self._rebuild(db)
+            return
+        rows = db.query(RevokedSession.id, RevokedSession.session_id).filter(
+            RevokedSession.id > last_id
+        ).order_by(RevokedSession.id.asc()).all()
+        if rows:
+            with self._lock:
+                for row in rows:
+                    self._filter.add(row.session_id)
+                self._last_id = max(self._last_id or 0, rows[-1].id)
+
+    def is_revoked(self, db: Session, session_id: str) -> bool:
+        with self._lock:
+            self.checks += 1
+            if session_id not in self._filter:
+                return False
+            self.lookups += 1
+        return db.query(RevokedSession.id).filter(RevokedSession.session_id == session_id).first() is not None
+
+    def add(self, session_id: str):
+        with self._lock:
+            self._filter.add(session_id)
+
+
+session_revocations = SessionRevocationFilter()
+
+
+def revoke_sessions(db: Session, user_id: int, session_ids: list[str]) -> int:
+    """Revoke the refresh tokens of these sessions and block their access tokens; the caller commits."""
+    if not session_ids:
+        return 0
+    now = datetime.utcnow()
+    revoked = db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.family_id.in_(session_ids),
+        RefreshToken.revoked == False,  # noqa: E712
+    ).update({"revoked": True, "revoked_at": now}, synchronize_session=False)
+    expires_at = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    for session_id in session_ids:
+        db.add(RevokedSession(session_id=session_id, user_id=user_id, expires_at=expires_at))
+        # Added before the commit: a premature "maybe" only costs a lookup that finds nothing yet.
+        session_revocations.add(session_id)
+    return revoked
@@ -0,0 +1,80 @@
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import Session
+
+from models import ApplicationTracker, Essay, SyncTombstone
+
+SYNC_TOKEN_VERSION = "v1"
+# Rows committed slightly after the cursor was taken (or stamped by a worker with a
+# lagging clock) are re-sent on the next poll instead of being skipped; clients upsert by id.
+SYNC_OVERLAP_SECONDS = 2
+
+
+def encode_sync_token(cursor_at: datetime, tombstone_id: int) -> str:
+    millis = int(cursor_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    raw = f"{SYNC_TOKEN_VERSION}:{millis}:{tombstone_id}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: str) -> tuple[datetime, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        version, millis, tombstone_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").split(":")
+        if version != SYNC_TOKEN_VERSION:
+            raise ValueError(version)
+        cursor_at = datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc).replace(tzinfo=None)
+        return cursor_at, int(tombstone_id)
+    except (ValueError, UnicodeError, binascii.Error, OverflowError, OSError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+
+
+def record_tombstones(db: Session, user_id: int, entity_type: str, entity_ids: Iterable[int]):
+    """Log deletions inside the caller's transaction so they commit (or roll back) with the delete."""
+    rows = [
+        {"user_id": user_id, "entity_type": entity_type, "entity_id": entity_id, "deleted_at": datetime.utcnow()}
+        for entity_id in entity_ids
+    ]
+    if rows:
+        db.execute(insert(SyncTombstone), rows)
+
+
+def purge_expired_tombstones(db: Session, retention_days: int) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = db.query(SyncTombstone).filter(SyncTombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def build_sync_delta(db: Session, user_id: int, since: Optional[str], *, retention_days: int) -> dict:
+    started_at = datetime.utcnow()
+    since_at, since_tombstone_id = decode_sync_token(since) if since else (None, 0)
+    # Tombstones older than the retention window may be gone, so such clients reload everything.
+    reset = since_at is None or since_at < started_at - timedelta(days=retention_days)
+
+    applications = db.query(ApplicationTracker).filter(ApplicationTracker.user_id == user_id)
+    essays = db.query(Essay).filter(Essay.user_id == user_id)
+    deleted: list[dict] = []
+    if reset:
+        essays = essays.filter(Essay.is_latest == True)  # noqa: E712
+        tombstone_id = db.query(func.max(SyncTombstone.id)).filter(SyncTombstone.user_id == user_id).scalar() or 0
+    else:
+        applications = applications.filter(ApplicationTracker.updated_at >= since_at)
+        essays = essays.filter(Essay.updated_at >= since_at)
+        tombstones = db.query(SyncTombstone.id, SyncTombstone.entity_type, SyncTombstone.entity_id).filter(
+            and_(SyncTombstone.user_id == user_id, SyncTombstone.id > since_tombstone_id)
+        ).order_by(SyncTombstone.id.asc()).all()
+        deleted = [{"entity_type": row.entity_type, "id": row.entity_id} for row in tombstones]
+        tombstone_id = tombstones[-1].id if tombstones else since_tombstone_id
+
+    return {
+        "sync_token": encode_sync_token(started_at - timedelta(seconds=SYNC_OVERLAP_SECONDS), tombstone_id),
+        "reset": reset,
+        "applications": applications.order_by(ApplicationTracker.id.asc()).all(),
+        "essays": essays.order_by(Essay.id.asc()).all(),
+        "deleted": deleted,
+    }
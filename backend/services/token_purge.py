@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from database import SessionLocal
+from models import AuthToken, RefreshToken, RevokedSession
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TOKEN_PURGE_BATCH_SIZE = 1000
+# Revoked refresh tokens are kept this long after revocation so a replayed token is still recognised
+# as one; rows revoked before revoked_at existed are kept until they expire.
+REVOKED_TOKEN_RETENTION_DAYS = 7
+
+
+def _purge_conditions(now: datetime, revoked_retention_days: int) -> dict:
+    revoked_before = now - timedelta(days=revoked_retention_days)
+    return {
+        "refresh_tokens": (RefreshToken, or_(
+            RefreshToken.expires_at < now,
+            and_(RefreshToken.revoked == True, RefreshToken.revoked_at < revoked_before),  # noqa: E712
+        )),
+        "auth_tokens": (AuthToken, or_(AuthToken.expires_at < now, AuthToken.used == True)),  # noqa: E712
+        # Once every access token of a revoked session has expired there is nothing left to block.
+        "revoked_sessions": (RevokedSession, RevokedSession.expires_at < now),
+    }
+
+
+def count_purgeable_tokens(db: Session, *, revoked_retention_days: int = REVOKED_TOKEN_RETENTION_DAYS) -> dict:
+    conditions = _purge_conditions(datetime.utcnow(), revoked_retention_days)
+    return {
+        table: db.query(func.count(model.id)).filter(condition).scalar() or 0
+        for table, (model, condition) in conditions.items()
+    }
+
+
+def purge_expired_tokens(
+    db: Session,
+    *,
+    batch_size: int = TOKEN_PURGE_BATCH_SIZE,
+    revoked_retention_days: int = REVOKED_TOKEN_RETENTION_DAYS,
+) -> dict:
+    """Delete expired/revoked refresh tokens, expired/used one-time tokens and lapsed session revocations.
+
+    Each batch is its own short transaction (`DELETE ... WHERE id IN (SELECT id ... LIMIT n)`),
+    so row locks are never held for more than `batch_size` rows at a time.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    started = time.perf_counter()
+    conditions = _purge_conditions(datetime.utcnow(), revoked_retention_days)
+    stats = {"refresh_tokens": 0, "auth_tokens": 0, "revoked_sessions": 0, "batches": 0}
+    for table, (model, condition) in conditions.items():
+        while True:
+            batch = select(model.id).where(condition).limit(batch_size)
+            deleted = db.execute(
+                delete(model).where(model.id.in_(batch)).execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            stats[table] += deleted
+            stats["batches"] += 1
+            if deleted < batch_size:
+                break
+    stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return stats
+
+
+class TokenPurgeWorker:
+    """Daemon thread that runs `purge_expired_tokens` every `interval_seconds` and keeps the last result."""
+
+    def __init__(self, session_factory, interval_seconds: int):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = Lock()
+        self.last_run_at: Optional[datetime] = None
+        self.last_result: Optional[dict] = None
+        self.runs = 0
+
+    def start(self):
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="token-purge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self) -> dict:
+        db = self.session_factory()
+        try:
+            result = purge_expired_tokens(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        with self._lock:
+            self.last_run_at = datetime.utcnow()
+            self.last_result = result
+            self.runs += 1
+        logger.info("Purged %s refresh and %s one-time tokens in %sms",
+                    result["refresh_tokens"], result["auth_tokens"], result["duration_ms"])
+        return result
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Token purge run failed")
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "interval_seconds": self.interval_seconds,
+                "runs": self.runs,
+                "last_run_at": self.last_run_at,
+                "last_result": self.last_result,
+            }
+
+
+token_purge_worker = TokenPurgeWorker(SessionLocal, settings.TOKEN_PURGE_INTERVAL_SECONDS)
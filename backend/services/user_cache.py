@@ -0,0 +1,200 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+from config import get_settings
+from database import SessionLocal
+from models import User, UserCacheInvalidation
+
+settings = get_settings()
+
+USER_CACHE_MAX_USERS = 10_000
+USER_CACHE_POLL_SECONDS = 1.0
+USER_CACHE_SIGNAL_RETENTION_HOURS = 24
+# Columns copied into snapshots; `bio` is left unloaded and fetched lazily by the few routes that read it.
+SNAPSHOT_COLUMNS = tuple(column.key for column in User.__table__.columns if column.key != "bio")
+_ALL_USERS = None
+
+
+class UserCache:
+    """Detached `User` snapshots keyed by id, for `get_current_user`.
+
+    Entries expire after `ttl_seconds` and are dropped when a session commits a change to the
+    user (see the listeners below). Other workers learn about those commits by polling
+    `user_cache_invalidations` at most every `poll_seconds`; the TTL bounds anything missed.
+    """
+
+    def __init__(self, ttl_seconds: int, max_users: int = USER_CACHE_MAX_USERS, poll_seconds: float = USER_CACHE_POLL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self.poll_seconds = poll_seconds
+        self._entries: OrderedDict[int, tuple[float, User]] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        self._epoch = 0
+        # user id -> time.time() of the last invalidation seen here; older entries fold into _all_changed_at.
+        self._changed_at: OrderedDict[int, float] = OrderedDict()
+        self._all_changed_at = time.time()
+        self._last_signal_id: Optional[int] = None
+        self._polled_at = 0.0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or now - entry[0] >= self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, user_id: int) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(user_id, 0)
+
+    def store(self, user: User, generation: tuple[int, int]):
+        """Cache a snapshot of `user` unless it was invalidated after `generation` was read."""
+        snapshot = User(**{key: getattr(user, key) for key in SNAPSHOT_COLUMNS})
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            if (self._epoch, self._generations.get(user.id, 0)) != generation:
+                return
+            self._entries[user.id] = (time.time(), snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[int]):
+        now = time.time()
+        with self._lock:
+            if user_id is _ALL_USERS:
+                self._entries.clear()
+                self._generations.clear()
+                self._changed_at.clear()
+                self._all_changed_at = now
+                self._epoch += 1
+                return
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._changed_at[user_id] = now
+            self._changed_at.move_to_end(user_id)
+            while len(self._changed_at) > self.max_users:
+                _, changed_at = self._changed_at.popitem(last=False)
+                self._all_changed_at = max(self._all_changed_at, changed_at)
+
+    def changed_since(self, user_id: int, timestamp: float) -> bool:
+        """Whether this process may have missed a change to the user made at or after `timestamp`.
+
+        Conservative: anything before the process started (or before a forgotten entry) counts
+        as changed.
+        """
+        with self._lock:
+            return max(self._all_changed_at, self._changed_at.get(user_id, 0.0)) >= timestamp
+
+    def clear(self):
+        self.invalidate(_ALL_USERS)
+
+    def poll_signals(self, db: Session):
+        """Apply invalidations committed by other workers since the last poll."""
+        now = time.time()
+        with self._lock:
+            if now - self._polled_at < self.poll_seconds:
+                return
+            self._polled_at = now
+            last_id = self._last_signal_id
+        if last_id is None:
+            latest = db.query(func.max(UserCacheInvalidation.id)).scalar() or 0
+            with self._lock:
+                self._last_signal_id = latest
+                # Signals before this point were never read; treat every user as possibly changed.
+                self._all_changed_at = time.time()
+            return
+        rows = db.query(UserCacheInvalidation.id, UserCacheInvalidation.user_id).filter(
+            UserCacheInvalidation.id > last_id
+        ).order_by(UserCacheInvalidation.id.asc()).all()
+        for row in rows:
+            self.invalidate(row.user_id)
+        if rows:
+            with self._lock:
+                self._last_signal_id = max(self._last_signal_id or 0, rows[-1].id)
+
+
+user_cache = UserCache(ttl_seconds=settings.USER_CACHE_TTL_SECONDS)
+
+
+def purge_user_cache_signals(db: Session) -> int:
+    cutoff = datetime.utcnow() - timedelta(hours=USER_CACHE_SIGNAL_RETENTION_HOURS)
+    deleted = db.query(UserCacheInvalidation).filter(UserCacheInvalidation.created_at < cutoff).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    return deleted
+
+
+def _record_user_change(session: Session, user_ids: set[Optional[int]]):
+    """Queue local invalidation for commit time and write the cross-worker signal in this transaction."""
+    session.info.setdefault("user_cache_invalidate", set()).update(user_ids)
+    session.connection().execute(
+        insert(UserCacheInvalidation),
+        [{"user_id": user_id, "created_at": datetime.utcnow()} for user_id in user_ids],
+    )
+
+
+def _statement_user_ids(statement) -> set[Optional[int]]:
+    """Ids from a `users.id = :value` criterion, or {None} (everyone) when there is none."""
+    if statement.whereclause is not None:
+        for element in visitors.iterate(statement.whereclause):
+            if (
+                isinstance(element, BinaryExpression)
+                and element.operator is operators.eq
+                and getattr(element.left, "table", None) is User.__table__
+                and getattr(element.left, "key", None) == "id"
+                and isinstance(element.right, BindParameter)
+            ):
+                return {element.right.effective_value}
+    return {_ALL_USERS}
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_flushed_users(session: Session, flush_context):
+    user_ids = {
+        obj.id for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None and (obj in session.deleted or session.is_modified(obj))
+    }
+    if user_ids:
+        _record_user_change(session, user_ids)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _collect_bulk_user_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not User:
+        return
+    _record_user_change(orm_execute_state.session, _statement_user_ids(orm_execute_state.statement))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_invalidations(session: Session):
+    for user_id in session.info.pop("user_cache_invalidate", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_invalidations(session: Session):
+    session.info.pop("user_cache_invalidate", None)
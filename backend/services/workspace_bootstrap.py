@@ -0,0 +1,102 @@
+from datetime import date
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from models import ApplicationTracker, Essay, User
+from schemas import ApplicationResponse, EssayResponse, UserResponse
+from services.essay_drafts import flush_user_drafts
+from services.migrations import backfill_essay_application_links
+from services.reminders import get_reminder_matches
+from services.workspace_summary import get_workspace_summary
+
+BOOTSTRAP_SECTIONS = ("user", "applications", "essays", "reminders", "summary")
+PROJECTABLE_SECTIONS = {
+    "applications": (ApplicationTracker, ApplicationResponse),
+    "essays": (Essay, EssayResponse),
+}
+
+
+def parse_bootstrap_include(include: Optional[str]) -> tuple[str, ...]:
+    if not include:
+        return BOOTSTRAP_SECTIONS
+    requested = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = requested.difference(BOOTSTRAP_SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown bootstrap section(s): {', '.join(sorted(unknown))}",
+        )
+    return tuple(section for section in BOOTSTRAP_SECTIONS if section in requested)
+
+
+def parse_bootstrap_fields(fields: Optional[str]) -> dict[str, tuple[str, ...]]:
+    """Parse `section.field` pairs into per-section column lists; `id` is always kept."""
+    projection: dict[str, list[str]] = {}
+    for part in (fields or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        section, _, field = part.partition(".")
+        if section not in PROJECTABLE_SECTIONS or field not in PROJECTABLE_SECTIONS[section][1].model_fields:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown bootstrap field: {part}",
+            )
+        selected = projection.setdefault(section, ["id"])
+        if field not in selected:
+            selected.append(field)
+    return {section: tuple(columns) for section, columns in projection.items()}
+
+
+def _select_rows(db: Session, model, columns: Iterable[str], *criteria, order_by=()) -> list[dict]:
+    """Select only the projected columns so unrequested text blobs never leave the database."""
+    columns = tuple(columns)
+    query = db.query(*(getattr(model, column) for column in columns)).filter(*criteria).order_by(*order_by)
+    return [dict(zip(columns, row)) for row in query]
+
+
+def build_workspace_bootstrap(
+    db: Session,
+    current_user: User,
+    *,
+    sections: tuple[str, ...],
+    projection: dict[str, tuple[str, ...]],
+    today: date,
+) -> dict:
+    payload: dict = {}
+    if "user" in sections:
+        payload["user"] = UserResponse.model_validate(current_user).model_dump()
+    if "applications" in sections:
+        columns = projection.get("applications") or tuple(ApplicationResponse.model_fields)
+        payload["applications"] = _select_rows(
+            db,
+            ApplicationTracker,
+            columns,
+            ApplicationTracker.user_id == current_user.id,
+            order_by=(ApplicationTracker.deadline.asc(), ApplicationTracker.id.asc()),
+        )
+    if "essays" in sections:
+        backfill_essay_application_links(current_user.id, db)
+        flush_user_drafts(db, current_user.id)
+        columns = projection.get("essays") or tuple(EssayResponse.model_fields)
+        payload["essays"] = _select_rows(
+            db,
+            Essay,
+            columns,
+            Essay.user_id == current_user.id,
+            Essay.is_latest == True,  # noqa: E712
+            order_by=(Essay.id.asc(),),
+        )
+    if "reminders" in sections:
+        items = get_reminder_matches(current_user, db)
+        payload["reminders"] = {
+            "notification_email": current_user.notification_email or current_user.email,
+            "reminders_enabled": bool(current_user.email_reminders_enabled),
+            "total_matches": len(items),
+            "items": [item.model_dump() for item in items],
+        }
+    if "summary" in sections:
+        payload["summary"] = get_workspace_summary(db, current_user.id, today, current_user.preferred_currency)
+    return payload
@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+
+class WorkspaceCache:
+    """Per-user memo of derived workspace payloads, dropped whenever that user's data changes.
+
+    Entries also expire after `ttl_seconds`, which bounds staleness when another
+    worker process handled the write. Each user keeps at most `max_keys_per_user`
+    variants (oldest dropped first), since keys include query parameters.
+    """
+
+    def __init__(self, max_users: int = 2048, ttl_seconds: int = 120, max_keys_per_user: int = 16):
+        self.max_users = max_users
+        self.max_keys_per_user = max_keys_per_user
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, dict[Hashable, tuple[float, Any]]] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        self._epoch = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, key: Hashable) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id, {}).get(key)
+            if entry is None or now - entry[0] >= self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, user_id: int) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(user_id, 0)
+
+    def set(self, user_id: int, key: Hashable, value: Any, *, generation: int):
+        """Store `value` unless the user was invalidated after `generation` was read."""
+        with self._lock:
+            if (self._epoch, self._generations.get(user_id, 0)) != generation:
+                return
+            entries = self._entries.setdefault(user_id, {})
+            entries.pop(key, None)
+            entries[key] = (time.time(), value)
+            while len(entries) > self.max_keys_per_user:
+                entries.pop(next(iter(entries)))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, user_id: int, key: Hashable, builder: Callable[[], Any]) -> Any:
+        cached = self.get(user_id, key)
+        if cached is not None:
+            return cached
+        generation = self.generation(user_id)
+        value = builder()
+        self.set(user_id, key, value, generation=generation)
+        return value
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def invalidate_all(self):
+        """Drop every entry and bump the global epoch, for writes that change all users' payloads."""
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+workspace_cache = WorkspaceCache()
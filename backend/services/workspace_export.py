@@ -0,0 +1,151 @@
+import io
+import json
+import zipfile
+from datetime import datetime
+from typing import Iterator, Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_
+
+from database import SessionLocal
+from models import ApplicationTracker, Essay
+from schemas import ApplicationResponse, EssayResponse, ReviewResponse
+
+EXPORT_SECTIONS = ("applications", "essays", "reviews")
+EXPORT_RECORD_TYPES = {"applications": "application", "essays": "essay", "reviews": "review"}
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def parse_export_cursor(cursor: Optional[str]) -> tuple[int, int]:
+    """Returns (section_index, last_exported_id) for a `<section>:<id>` continuation cursor."""
+    if not cursor:
+        return 0, 0
+    section, _, last_id = cursor.strip().partition(":")
+    if section not in EXPORT_SECTIONS or not last_id.isdigit():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid export cursor")
+    return EXPORT_SECTIONS.index(section), int(last_id)
+
+
+def _iter_section(db, user_id: int, section: str, after_id: int) -> Iterator[tuple[int, dict]]:
+    if section == "applications":
+        query = db.query(ApplicationTracker).filter(
+            and_(ApplicationTracker.user_id == user_id, ApplicationTracker.id > after_id)
+        ).order_by(ApplicationTracker.id.asc())
+        for row in query.yield_per(EXPORT_BATCH_SIZE):
+            yield row.id, ApplicationResponse.model_validate(row).model_dump(mode="json")
+    elif section == "essays":
+        query = db.query(Essay).filter(
+            and_(Essay.user_id == user_id, Essay.id > after_id)
+        ).order_by(Essay.id.asc())
+        for row in query.yield_per(EXPORT_BATCH_SIZE):
+            yield row.id, EssayResponse.model_validate(row).model_dump(mode="json")
+    else:
+        query = db.query(Essay.id, Essay.ai_review, Essay.review_score).filter(
+            and_(Essay.user_id == user_id, Essay.id > after_id, Essay.ai_review.isnot(None))
+        ).order_by(Essay.id.asc())
+        for row in query.yield_per(EXPORT_BATCH_SIZE):
+            review = ReviewResponse(essay_id=row.id, review_content=row.ai_review, score=row.review_score)
+            yield row.id, review.model_dump(mode="json")
+
+
+def iter_export_records(user_id: int, cursor: tuple[int, int], limit: Optional[int]) -> Iterator[dict]:
+    """Yield export records in (section, id) order, ending with an `end` or `continuation` record."""
+    db = SessionLocal()
+    try:
+        start_section, after_id = cursor
+        emitted = 0
+        last_cursor = None
+        for section_index in range(start_section, len(EXPORT_SECTIONS)):
+            section = EXPORT_SECTIONS[section_index]
+            section_after_id = after_id if section_index == start_section else 0
+            for row_id, data in _iter_section(db, user_id, section, section_after_id):
+                if limit is not None and emitted >= limit:
+                    yield {"type": "continuation", "cursor": last_cursor, "records": emitted}
+                    return
+                last_cursor = f"{section}:{row_id}"
+                yield {"type": EXPORT_RECORD_TYPES[section], "cursor": last_cursor, "data": data}
+                emitted += 1
+        yield {"type": "end", "cursor": None, "records": emitted}
+    finally:
+        db.close()
+
+
+def stream_ndjson(records: Iterator[dict]) -> Iterator[bytes]:
+    buffer = bytearray()
+    for record in records:
+        buffer += json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        if len(buffer) >= EXPORT_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+class _ZipChunkSink(io.RawIOBase):
+    """Unseekable sink so zipfile writes data descriptors and we can drain bytes as they are produced."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self.buffered_bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.buffered_bytes += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.buffered_bytes = 0
+        return data
+
+
+def stream_zip(records: Iterator[dict]) -> Iterator[bytes]:
+    sink = _ZipChunkSink()
+    manifest = {"format": "masters-platform-workspace-export", "exported_at": datetime.utcnow().isoformat()}
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        entry = None
+        entry_type = None
+        for record in records:
+            if record["type"] in ("end", "continuation"):
+                manifest.update(record)
+                break
+            if record["type"] != entry_type:
+                if entry is not None:
+                    entry.close()
+                entry_type = record["type"]
+                entry = archive.open(f"{entry_type}s.ndjson", mode="w", force_zip64=True)
+            entry.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            if sink.buffered_bytes >= EXPORT_CHUNK_BYTES:
+                yield sink.drain()
+        if entry is not None:
+            entry.close()
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+    yield sink.drain()
+
+
+def build_workspace_export_response(
+    user_id: int,
+    *,
+    export_format: str,
+    cursor: Optional[str],
+    limit: Optional[int],
+) -> StreamingResponse:
+    records = iter_export_records(user_id, parse_export_cursor(cursor), limit)
+    stamp = datetime.utcnow().strftime("%Y%m%d")
+    if export_format == "zip":
+        return StreamingResponse(
+            stream_zip(records),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="workspace-{user_id}-{stamp}.zip"'},
+        )
+    return StreamingResponse(
+        stream_ndjson(records),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="workspace-{user_id}-{stamp}.ndjson"'},
+    )
@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session
+
+from models import ApplicationTracker, Essay
+from services.fx_rates import fx_rate_join
+from services.workspace_cache import workspace_cache
+
+DUE_SOON_DAYS = 21
+CRITICAL_DAYS = 14
+
+
+def _count_when(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def build_workspace_summary(db: Session, user_id: int, preferred_currency: str = "USD") -> dict:
+    """Dashboard aggregates mirroring `frontend/src/app/derived.js`, computed in three grouped queries.
+
+    Nothing here depends on the caller's date, so it can be cached regardless of `today`;
+    `with_deadline_fields` adds the date-dependent counts per request.
+    """
+    totals = db.query(
+        func.count(ApplicationTracker.id).label("total_applications"),
+        func.coalesce(func.sum(ApplicationTracker.essays_required), 0).label("total_essays_required"),
+        func.coalesce(func.sum(ApplicationTracker.lors_required), 0).label("total_lors_required"),
+        func.coalesce(func.sum(ApplicationTracker.lors_submitted), 0).label("total_lors_submitted"),
+        _count_when(ApplicationTracker.interview_required == True).label("interviews_required"),  # noqa: E712
+        _count_when(ApplicationTracker.interview_completed == True).label("interviews_completed"),  # noqa: E712
+    ).filter(ApplicationTracker.user_id == user_id).one()
+
+    currency = func.upper(func.coalesce(ApplicationTracker.fee_currency, "USD"))
+    source_fx, fx_onclause, target_rate = fx_rate_join(currency, preferred_currency)
+    fee_rows = (
+        db.query(
+            currency.label("currency"),
+            func.sum(ApplicationTracker.application_fee).label("application_fees"),
+            func.sum(ApplicationTracker.program_total_fee).label("program_fees"),
+            func.sum(ApplicationTracker.application_fee / source_fx.units_per_usd * target_rate).label("application_fees_converted"),
+            func.sum(ApplicationTracker.program_total_fee / source_fx.units_per_usd * target_rate).label("program_fees_converted"),
+        )
+        .outerjoin(source_fx, fx_onclause)
+        .filter(ApplicationTracker.user_id == user_id)
+        .group_by(currency)
+        .all()
+    )
+
+    # Same matching rule as getEssayCountForApplication: explicit link, or legacy school/program match.
+    essay_match = and_(
+        Essay.user_id == ApplicationTracker.user_id,
+        Essay.is_latest == True,  # noqa: E712
+        or_(
+            Essay.application_id == ApplicationTracker.id,
+            and_(
+                func.lower(func.trim(Essay.school_name)) == func.lower(func.trim(ApplicationTracker.school_name)),
+                func.lower(func.trim(Essay.program_type)) == func.lower(func.trim(ApplicationTracker.program_name)),
+            ),
+        ),
+    )
+    readiness_rows = (
+        db.query(
+            ApplicationTracker.id,
+            ApplicationTracker.school_name,
+            ApplicationTracker.program_name,
+            ApplicationTracker.deadline,
+            ApplicationTracker.essays_required,
+            ApplicationTracker.lors_required,
+            ApplicationTracker.lors_submitted,
+            ApplicationTracker.interview_required,
+            ApplicationTracker.interview_completed,
+            func.count(func.distinct(Essay.id)).label("essays_drafted"),
+        )
+        .outerjoin(Essay, essay_match)
+        .filter(ApplicationTracker.user_id == user_id)
+        .group_by(ApplicationTracker.id)
+        .order_by(ApplicationTracker.deadline.asc(), ApplicationTracker.school_name.asc())
+        .all()
+    )
+
+    return {
+        "total_applications": int(totals.total_applications or 0),
+        "application_fees_by_currency": {
+            row.currency: float(row.application_fees) for row in fee_rows if row.application_fees
+        },
+        "program_fees_by_currency": {
+            row.currency: float(row.program_fees) for row in fee_rows if row.program_fees
+        },
+        "preferred_currency": preferred_currency,
+        "application_fees_total": round(sum(row.application_fees_converted or 0 for row in fee_rows), 2),
+        "program_fees_total": round(sum(row.program_fees_converted or 0 for row in fee_rows), 2),
+        "unconverted_currencies": sorted(
+            row.currency for row in fee_rows
+            if (row.application_fees and row.application_fees_converted is None)
+            or (row.program_fees and row.program_fees_converted is None)
+        ),
+        "requirements": {
+            "total_essays_required": int(totals.total_essays_required),
+            "total_lors_required": int(totals.total_lors_required),
+            "total_lors_submitted": int(totals.total_lors_submitted),
+            "interviews_required": int(totals.interviews_required),
+            "interviews_completed": int(totals.interviews_completed),
+            "total_applications": int(totals.total_applications or 0),
+        },
+        "readiness": [
+            {
+                "application_id": row.id,
+                "school_name": row.school_name,
+                "program_name": row.program_name,
+                "deadline": row.deadline,
+                "essays_required": int(row.essays_required or 0),
+                "essays_drafted": int(row.essays_drafted or 0),
+                "lors_required": int(row.lors_required or 0),
+                "lors_submitted": int(row.lors_submitted or 0),
+                "interview_required": bool(row.interview_required),
+                "interview_completed": bool(row.interview_completed),
+            }
+            for row in readiness_rows
+        ],
+    }
+
+
+def with_deadline_fields(summary: dict, today: date) -> dict:
+    """Copy of a cached summary with the counts that depend on the caller's date filled in.
+
+    `readiness` lists every application with its deadline, so this is a pass over rows
+    already in memory; keeping `today` out of the cache key means a client cannot grow
+    the cache by varying it.
+    """
+    due_soon_until = today + timedelta(days=DUE_SOON_DAYS)
+    critical_until = today + timedelta(days=CRITICAL_DAYS)
+    deadlines = [row["deadline"] for row in summary["readiness"] if row["deadline"] is not None]
+    return {
+        **summary,
+        "generated_for": today,
+        "upcoming": sum(1 for deadline in deadlines if deadline >= today),
+        "due_soon": sum(1 for deadline in deadlines if today <= deadline <= due_soon_until),
+        "deadline_buckets": {
+            "overdue": sum(1 for deadline in deadlines if deadline < today),
+            "critical": sum(1 for deadline in deadlines if today <= deadline <= critical_until),
+            "upcoming": sum(1 for deadline in deadlines if deadline > critical_until),
+        },
+        "readiness": [
+            {**row, "days_until_deadline": (row["deadline"] - today).days if row["deadline"] else None}
+            for row in summary["readiness"]
+        ],
+    }
+
+
+def get_workspace_summary(db: Session, user_id: int, today: date, preferred_currency: str = "USD") -> dict:
+    preferred_currency = (preferred_currency or "USD").upper()
+    summary = workspace_cache.get_or_build(
+        user_id,
+        ("summary", preferred_currency),
+        lambda: build_workspace_summary(db, user_id, preferred_currency),
+    )
+    return with_deadline_fields(summary, today)
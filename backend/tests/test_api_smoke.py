@@ -1,19 +1,118 @@
+import io
+import json
 import sys
+import shutil
+import tempfile
+import threading
 import unittest
+import zipfile
 import uuid
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from unittest import mock
 
 import httpx
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt as google_crypt, jwt as google_jwt
+from jose import jwt
+from sqlalchemy import text
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from database import SessionLocal  # noqa: E402
+from config import get_settings  # noqa: E402
+from database import SessionLocal, engine  # noqa: E402
 from main import app  # noqa: E402
-from models import AdminEvent, User  # noqa: E402
+from models import (  # noqa: E402
+    AdminEvent,
+    ApplicationTracker,
+    AuthToken,
+    Essay,
+    FxRate,
+    ProgramCatalogEntry,
+    RefreshToken,
+    User,
+)
+from schemas import ProgramCatalogItem  # noqa: E402
+from services.calendar_feed import calendar_feed_cache  # noqa: E402
+from services.fx_rates import fx_rate_cache  # noqa: E402
+from services.google_identity import google_id_verifier  # noqa: E402
+from services.jwt_keys import JwtKeyRing  # noqa: E402
+from services.password_hashing import password_hasher  # noqa: E402
+from services.program_catalog import (  # noqa: E402
+    find_program_catalog_item,
+    program_catalog_store,
+    update_program_catalog_entry,
+)
+from services.program_import import (  # noqa: E402
+    apply_program_catalog_diff,
+    detect_import_format,
+    diff_program_catalog,
+    iter_import_rows,
+    load_catalog_records,
+    validate_import_rows,
+)
+from services.program_matching import catalog_match_index, match_applications_to_catalog  # noqa: E402
+from services.program_search import program_search_index  # noqa: E402
 from services.rate_limit import rate_limiter  # noqa: E402
+from services.token_purge import purge_expired_tokens  # noqa: E402
+from services.user_cache import user_cache  # noqa: E402
+from services.workspace_cache import workspace_cache  # noqa: E402
+
+
+class GoogleCertStandIn:
+    """Local stand-in for Google's cert endpoint plus a signer for ID tokens it will accept."""
+
+    key_id = "stand-in-key"
+
+    def __init__(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "accounts.google.test")])
+        now = datetime.utcnow()
+        cert = (
+            x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+            .serial_number(x509.random_serial_number()).not_valid_before(now - timedelta(days=1))
+            .not_valid_after(now + timedelta(days=1)).sign(key, hashes.SHA256())
+        )
+        body = json.dumps({self.key_id: cert.public_bytes(serialization.Encoding.PEM).decode()}).encode()
+        self.signer = google_crypt.RSASigner.from_string(
+            key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                              serialization.NoEncryption()),
+            key_id=self.key_id,
+        )
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", "public, max-age=3600")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/oauth2/v1/certs"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def id_token(self, audience: str, email: str) -> str:
+        now = int(datetime.utcnow().timestamp())
+        claims = {"iss": "https://accounts.google.com", "aud": audience, "sub": email, "email": email,
+                  "name": "Google Person", "iat": now, "exp": now + 600}
+        return google_jwt.encode(self.signer, claims).decode()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
 
 
 class ApiSmokeTest(unittest.IsolatedAsyncioTestCase):
@@ -380,6 +479,1215 @@ class ApiSmokeTest(unittest.IsolatedAsyncioTestCase):
         self.assertIn("detail", cross_user_payload)
         self.assertIn("request_id", cross_user_payload)
 
+    async def test_essay_draft_autosave_coalesces_writes(self):
+        _, headers = await self._signup_and_get_headers("Drafts")
+        essay = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Draft University",
+                "program_type": "MBA",
+                "essay_prompt": "Why this program?",
+                "essay_content": "Initial content for the autosave smoke test essay.",
+            },
+            headers=headers,
+        )
+        self.assertEqual(essay.status_code, 200, essay.text)
+        essay_id = essay.json()["id"]
+
+        first = await self.client.patch(
+            f"/essays/{essay_id}/draft", json={"essay_content": "First autosave burst."}, headers=headers
+        )
+        self.assertEqual(first.status_code, 200, first.text)
+        self.assertTrue(first.json()["flushed"])
+
+        second = await self.client.patch(
+            f"/essays/{essay_id}/draft", json={"essay_content": "Second autosave burst."}, headers=headers
+        )
+        self.assertEqual(second.status_code, 200, second.text)
+        self.assertFalse(second.json()["flushed"])
+        self.assertTrue(second.json()["pending"])
+        self.assertEqual(second.json()["buffered_fields"], ["essay_content"])
+
+        third = await self.client.patch(
+            f"/essays/{essay_id}/draft", json={"essay_content": "Third autosave burst wins."}, headers=headers
+        )
+        self.assertFalse(third.json()["flushed"])
+
+        fetched = await self.client.get(f"/essays/{essay_id}", headers=headers)
+        self.assertEqual(fetched.status_code, 200, fetched.text)
+        self.assertEqual(fetched.json()["essay_content"], "Third autosave burst wins.")
+        self.assertEqual(fetched.json()["version"], 1)
+
+        await self.client.patch(f"/essays/{essay_id}/draft", json={"essay_prompt": "Updated prompt?"}, headers=headers)
+        committed = await self.client.patch(f"/essays/{essay_id}/draft", json={"commit": True}, headers=headers)
+        self.assertEqual(committed.status_code, 200, committed.text)
+        self.assertTrue(committed.json()["flushed"])
+        self.assertFalse(committed.json()["pending"])
+
+        blank_prompt = await self.client.patch(f"/essays/{essay_id}/draft", json={"essay_prompt": "    "}, headers=headers)
+        self.assertEqual(blank_prompt.status_code, 422, blank_prompt.text)
+
+        # A draft still buffered when a new version is created lands in the outgoing version first.
+        buffered = await self.client.patch(
+            f"/essays/{essay_id}/draft", json={"essay_content": "Typed just before versioning."}, headers=headers
+        )
+        self.assertTrue(buffered.json()["pending"])
+        next_version = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Draft University",
+                "program_type": "MBA",
+                "essay_prompt": "Why this program?",
+                "essay_content": "Second version content for the autosave smoke test.",
+                "parent_essay_id": essay_id,
+            },
+            headers=headers,
+        )
+        self.assertEqual(next_version.status_code, 200, next_version.text)
+        versions = (await self.client.get(f"/essays/{essay_id}/versions", headers=headers)).json()["versions"]
+        self.assertEqual(versions[0]["essay_content"], "Typed just before versioning.")
+        superseded = await self.client.patch(
+            f"/essays/{essay_id}/draft", json={"essay_content": "Too late for this version."}, headers=headers
+        )
+        self.assertEqual(superseded.status_code, 409, superseded.text)
+
+        _, other_headers = await self._signup_and_get_headers("Draft Intruder")
+        foreign = await self.client.patch(
+            f"/essays/{essay_id}/draft", json={"essay_content": "Not mine."}, headers=other_headers
+        )
+        self.assertEqual(foreign.status_code, 404, foreign.text)
+
+    async def test_similar_essays_detects_reused_content(self):
+        _, headers = await self._signup_and_get_headers("Similarity")
+        base_story = (
+            "Leading a cross-functional launch taught me how to align engineers, designers and sales "
+            "around one measurable goal. When our pilot customer threatened to churn, I rebuilt the "
+            "rollout plan overnight, negotiated a phased scope, and shipped the first milestone in "
+            "three weeks. That experience showed me why I need structured leadership training now."
+        )
+        essays = {}
+        for school, content in (
+            ("INSEAD", base_story),
+            ("LBS", base_story + " London Business School is where I want to build that skill set."),
+            ("Wharton", "Growing up in a family restaurant, I learned negotiation at the dinner table and "
+                        "budgeting from supplier invoices long before any classroom taught me finance."),
+        ):
+            created = await self.client.post(
+                "/essays/",
+                json={
+                    "school_name": school,
+                    "program_type": "MBA",
+                    "essay_prompt": "Why an MBA now?",
+                    "essay_content": content,
+                },
+                headers=headers,
+            )
+            self.assertEqual(created.status_code, 200, created.text)
+            essays[school] = created.json()["id"]
+
+        similar = await self.client.get(f"/essays/{essays['INSEAD']}/similar", headers=headers)
+        self.assertEqual(similar.status_code, 200, similar.text)
+        matched_ids = [item["essay_id"] for item in similar.json()["items"]]
+        self.assertIn(essays["LBS"], matched_ids)
+        self.assertNotIn(essays["Wharton"], matched_ids)
+        self.assertNotIn(essays["INSEAD"], matched_ids)
+        self.assertGreaterEqual(similar.json()["items"][0]["similarity"], 0.6)
+
+        revised = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Wharton",
+                "program_type": "MBA",
+                "essay_prompt": "Why an MBA now?",
+                "essay_content": base_story,
+                "parent_essay_id": essays["Wharton"],
+            },
+            headers=headers,
+        )
+        self.assertEqual(revised.status_code, 200, revised.text)
+        similar_after_revision = await self.client.get(f"/essays/{essays['INSEAD']}/similar", headers=headers)
+        matched_after_revision = [item["essay_id"] for item in similar_after_revision.json()["items"]]
+        self.assertIn(revised.json()["id"], matched_after_revision)
+        self.assertNotIn(essays["Wharton"], matched_after_revision)
+
+    async def test_workspace_export_streams_and_resumes(self):
+        _, headers = await self._signup_and_get_headers("Exporter")
+        application = await self.client.post(
+            "/applications/",
+            json={
+                "school_name": "Export University",
+                "program_name": "MBA",
+                "deadline": str(date.today() + timedelta(days=60)),
+                "fee_currency": "EUR",
+            },
+            headers=headers,
+        )
+        self.assertEqual(application.status_code, 201, application.text)
+        essay = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Export University",
+                "program_type": "MBA",
+                "essay_prompt": "Why this program?",
+                "essay_content": "Exported essays should keep every version and the review.",
+                "application_id": application.json()["id"],
+            },
+            headers=headers,
+        )
+        essay_id = essay.json()["id"]
+        await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Export University",
+                "program_type": "MBA",
+                "essay_prompt": "Why this program?",
+                "essay_content": "Second version of the exported essay with more detail.",
+                "parent_essay_id": essay_id,
+            },
+            headers=headers,
+        )
+        await self.client.post(f"/essays/{essay_id}/review", json={"focus_areas": []}, headers=headers)
+
+        export = await self.client.get("/export/workspace", headers=headers)
+        self.assertEqual(export.status_code, 200, export.text)
+        self.assertEqual(export.headers["content-type"], "application/x-ndjson")
+        records = [json.loads(line) for line in export.text.splitlines()]
+        self.assertEqual([record["type"] for record in records], ["application", "essay", "essay", "review", "end"])
+        self.assertEqual(records[3]["data"]["essay_id"], essay_id)
+
+        first_page = await self.client.get("/export/workspace", params={"limit": 2}, headers=headers)
+        first_records = [json.loads(line) for line in first_page.text.splitlines()]
+        self.assertEqual(first_records[-1]["type"], "continuation")
+        resumed = await self.client.get(
+            "/export/workspace", params={"cursor": first_records[-1]["cursor"]}, headers=headers
+        )
+        resumed_records = [json.loads(line) for line in resumed.text.splitlines()]
+        self.assertEqual(
+            [record["cursor"] for record in first_records[:-1] + resumed_records[:-1]],
+            [record["cursor"] for record in records[:-1]],
+        )
+
+        invalid_cursor = await self.client.get("/export/workspace", params={"cursor": "bogus"}, headers=headers)
+        self.assertEqual(invalid_cursor.status_code, 400, invalid_cursor.text)
+
+        archive_response = await self.client.get("/export/workspace", params={"format": "zip"}, headers=headers)
+        self.assertEqual(archive_response.status_code, 200)
+        with zipfile.ZipFile(io.BytesIO(archive_response.content)) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                ["applications.ndjson", "essays.ndjson", "manifest.json", "reviews.ndjson"],
+            )
+            self.assertEqual(len(archive.read("essays.ndjson").splitlines()), 2)
+            self.assertEqual(json.loads(archive.read("manifest.json"))["type"], "end")
+
+    async def test_cascading_deletes_remove_version_chains(self):
+        _, headers = await self._signup_and_get_headers("Cascade")
+
+        async def create_application(school_name):
+            response = await self.client.post(
+                "/applications/",
+                json={
+                    "school_name": school_name,
+                    "program_name": "MBA",
+                    "deadline": str(date.today() + timedelta(days=40)),
+                },
+                headers=headers,
+            )
+            self.assertEqual(response.status_code, 201, response.text)
+            return response.json()["id"]
+
+        async def create_essay(application_id, parent_essay_id=None):
+            response = await self.client.post(
+                "/essays/",
+                json={
+                    "school_name": "Cascade School",
+                    "program_type": "MBA",
+                    "essay_prompt": "Why this program?",
+                    "essay_content": "A version of the cascade essay with enough characters.",
+                    "application_id": application_id,
+                    "parent_essay_id": parent_essay_id,
+                },
+                headers=headers,
+            )
+            self.assertEqual(response.status_code, 200, response.text)
+            return response.json()["id"]
+
+        kept_application = await create_application("Kept School")
+        root_id = await create_essay(kept_application)
+        middle_id = await create_essay(None, root_id)
+        latest_id = await create_essay(None, root_id)
+
+        delete_middle = await self.client.delete(f"/essays/{middle_id}", headers=headers)
+        self.assertEqual(delete_middle.status_code, 200, delete_middle.text)
+        self.assertEqual(delete_middle.json()["deleted_versions"], 3)
+        for essay_id in (root_id, middle_id, latest_id):
+            gone = await self.client.get(f"/essays/{essay_id}", headers=headers)
+            self.assertEqual(gone.status_code, 404, gone.text)
+
+        cascade_application = await create_application("Cascade School")
+        cascade_root = await create_essay(cascade_application)
+        await create_essay(None, cascade_root)
+        detach_application = await create_application("Detach School")
+        detached_essay = await create_essay(detach_application)
+
+        deleted = await self.client.delete(f"/applications/{cascade_application}", headers=headers)
+        self.assertEqual(deleted.status_code, 200, deleted.text)
+        self.assertEqual(deleted.json()["deleted_essays"], 2)
+
+        detached = await self.client.delete(
+            f"/applications/{detach_application}", params={"delete_essays": "false"}, headers=headers
+        )
+        self.assertEqual(detached.status_code, 200, detached.text)
+        self.assertEqual(detached.json()["detached_essays"], 1)
+        remaining = await self.client.get("/essays/", params={"latest_only": "false"}, headers=headers)
+        self.assertEqual([(item["id"], item["application_id"]) for item in remaining.json()], [(detached_essay, None)])
+
+        missing = await self.client.delete(f"/applications/{detach_application}", headers=headers)
+        self.assertEqual(missing.status_code, 404, missing.text)
+
+    async def test_application_batch_create_and_update(self):
+        _, headers = await self._signup_and_get_headers("Batch")
+        deadline = str(date.today() + timedelta(days=90))
+        created = await self.client.post(
+            "/applications/batch",
+            json={
+                "items": [
+                    {"school_name": "Batch One", "program_name": "MBA", "deadline": deadline, "lors_required": 2},
+                    {"school_name": "Batch Two", "program_name": "MiM", "deadline": deadline, "fee_currency": "gbp"},
+                    {"school_name": "Broken", "program_name": "MBA", "deadline": deadline,
+                     "lors_required": 1, "lors_submitted": 3},
+                ]
+            },
+            headers=headers,
+        )
+        self.assertEqual(created.status_code, 200, created.text)
+        payload = created.json()
+        self.assertTrue(payload["applied"])
+        self.assertEqual((payload["succeeded"], payload["failed"]), (2, 1))
+        self.assertEqual([item["status"] for item in payload["items"]], ["created", "created", "error"])
+        self.assertEqual(payload["items"][1]["application"]["fee_currency"], "GBP")
+        first_id, second_id = payload["items"][0]["id"], payload["items"][1]["id"]
+
+        atomic = await self.client.post(
+            "/applications/batch",
+            json={"atomic": True, "items": [
+                {"school_name": "Atomic", "program_name": "MBA", "deadline": deadline},
+                {"school_name": "Atomic", "program_name": "MBA"},
+            ]},
+            headers=headers,
+        )
+        self.assertFalse(atomic.json()["applied"])
+        self.assertEqual([item["status"] for item in atomic.json()["items"]], ["skipped", "error"])
+
+        updated = await self.client.patch(
+            "/applications/batch",
+            json={
+                "items": [
+                    {"id": first_id, "lors_submitted": 2, "status": "In Progress"},
+                    {"id": second_id, "lors_submitted": 1},
+                    {"id": first_id, "status": "Submitted"},
+                    {"id": 99999999, "status": "Submitted"},
+                ]
+            },
+            headers=headers,
+        )
+        self.assertEqual(updated.status_code, 200, updated.text)
+        items = updated.json()["items"]
+        self.assertEqual([item["status"] for item in items], ["updated", "error", "error", "error"])
+        self.assertEqual(items[0]["application"]["lors_submitted"], 2)
+        self.assertEqual(items[0]["application"]["status"], "In Progress")
+        self.assertIn("lors_submitted", items[1]["error"])
+
+        listed = await self.client.get("/applications/", headers=headers)
+        self.assertEqual(sorted(item["school_name"] for item in listed.json()), ["Batch One", "Batch Two"])
+
+    async def test_workspace_summary_aggregates_and_invalidates(self):
+        _, headers = await self._signup_and_get_headers("Summary")
+        today = date.today()
+        created = await self.client.post(
+            "/applications/batch",
+            json={"items": [
+                {"school_name": "Summary One", "program_name": "MBA", "deadline": str(today + timedelta(days=5)),
+                 "application_fee": 200, "fee_currency": "usd", "essays_required": 2,
+                 "lors_required": 2, "lors_submitted": 1, "interview_required": True},
+                {"school_name": "Summary Two", "program_name": "MiM", "deadline": str(today + timedelta(days=60)),
+                 "application_fee": 100, "program_total_fee": 50000, "fee_currency": "EUR"},
+            ]},
+            headers=headers,
+        )
+        first_id = created.json()["items"][0]["id"]
+
+        summary = await self.client.get("/workspace/summary", params={"today": str(today)}, headers=headers)
+        self.assertEqual(summary.status_code, 200, summary.text)
+        payload = summary.json()
+        self.assertEqual((payload["upcoming"], payload["due_soon"]), (2, 1))
+        self.assertEqual(payload["application_fees_by_currency"], {"USD": 200.0, "EUR": 100.0})
+        self.assertEqual(payload["program_fees_by_currency"], {"EUR": 50000.0})
+        self.assertEqual(payload["deadline_buckets"], {"overdue": 0, "critical": 1, "upcoming": 1})
+        self.assertEqual(payload["requirements"]["total_lors_required"], 2)
+        self.assertEqual(payload["requirements"]["interviews_required"], 1)
+        self.assertEqual(payload["readiness"][0]["essays_drafted"], 0)
+        # Other dates reuse the cached aggregates; only the deadline fields are recomputed.
+        hits = workspace_cache.hits
+        for days_ahead in (100, 200):
+            shifted = (await self.client.get(
+                "/workspace/summary", params={"today": str(today + timedelta(days=days_ahead))}, headers=headers
+            )).json()
+            self.assertEqual(shifted["deadline_buckets"], {"overdue": 2, "critical": 0, "upcoming": 0})
+        self.assertEqual(workspace_cache.hits - hits, 2)
+
+        essay = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Summary One",
+                "program_type": "MBA",
+                "essay_prompt": "Why now?",
+                "essay_content": "A summary essay draft with enough characters to validate.",
+                "application_id": first_id,
+            },
+            headers=headers,
+        )
+        self.assertEqual(essay.status_code, 200, essay.text)
+        later = (await self.client.get(
+            "/workspace/summary", params={"today": str(today + timedelta(days=10))}, headers=headers
+        )).json()
+        self.assertEqual(later["readiness"][0]["essays_drafted"], 1)
+        self.assertEqual(later["readiness"][0]["days_until_deadline"], -5)
+        self.assertEqual(later["deadline_buckets"], {"overdue": 1, "critical": 0, "upcoming": 1})
+
+        await self.client.delete(f"/applications/{first_id}", headers=headers)
+        refreshed = (await self.client.get("/workspace/summary", params={"today": str(today)}, headers=headers)).json()
+        self.assertEqual(refreshed["total_applications"], 1)
+        self.assertEqual(refreshed["application_fees_by_currency"], {"EUR": 100.0})
+
+    async def test_workspace_bootstrap_projects_sections(self):
+        _, headers = await self._signup_and_get_headers("Bootstrap")
+        application = await self.client.post(
+            "/applications/",
+            json={"school_name": "Boot School", "program_name": "MBA", "deadline": str(date.today() + timedelta(days=7))},
+            headers=headers,
+        )
+        self.assertEqual(application.status_code, 201, application.text)
+        essay = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Boot School",
+                "program_type": "MBA",
+                "essay_prompt": "Goals?",
+                "essay_content": "Bootstrap essay content long enough to pass validation.",
+            },
+            headers=headers,
+        )
+        self.assertEqual(essay.status_code, 200, essay.text)
+
+        full = await self.client.get("/workspace/bootstrap", headers=headers)
+        self.assertEqual(full.status_code, 200, full.text)
+        payload = full.json()
+        self.assertEqual(set(payload), {"user", "applications", "essays", "reminders", "summary"})
+        self.assertEqual(payload["applications"][0]["school_name"], "Boot School")
+        self.assertEqual(payload["essays"][0]["application_id"], application.json()["id"])
+        self.assertEqual(payload["summary"]["total_applications"], 1)
+
+        compact = await self.client.get(
+            "/workspace/bootstrap",
+            params={"include": "essays,applications", "fields": "essays.version,applications.deadline"},
+            headers=headers,
+        )
+        self.assertEqual(compact.status_code, 200, compact.text)
+        self.assertEqual(compact.json()["essays"], [{"id": essay.json()["id"], "version": 1}])
+        self.assertEqual(set(compact.json()["applications"][0]), {"id", "deadline"})
+
+        invalid = await self.client.get("/workspace/bootstrap", params={"fields": "essays.password"}, headers=headers)
+        self.assertEqual(invalid.status_code, 400, invalid.text)
+
+    async def test_calendar_feed_serves_cached_ics_with_validators(self):
+        _, headers = await self._signup_and_get_headers("Calendar")
+        application = await self.client.post(
+            "/applications/",
+            json={"school_name": "Feed, School", "program_name": "MBA", "deadline": "2031-01-15"},
+            headers=headers,
+        )
+        self.assertEqual(application.status_code, 201, application.text)
+
+        self.assertFalse((await self.client.get("/calendar/feed", headers=headers)).json()["enabled"])
+        created = await self.client.post("/calendar/feed", headers=headers)
+        self.assertEqual(created.status_code, 200, created.text)
+        feed_path = httpx.URL(created.json()["feed_url"]).path
+        self.assertTrue(feed_path.startswith("/calendar/") and feed_path.endswith(".ics"))
+
+        feed = await self.client.get(feed_path)
+        self.assertEqual(feed.status_code, 200, feed.text)
+        self.assertTrue(feed.headers["content-type"].startswith("text/calendar"))
+        self.assertIn("DTSTART;VALUE=DATE:20310115", feed.text)
+        self.assertIn("SUMMARY:Feed\\, School MBA Deadline", feed.text)
+        etag = feed.headers["etag"]
+
+        not_modified = await self.client.get(feed_path, headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        since = await self.client.get(feed_path, headers={"If-Modified-Since": feed.headers["last-modified"]})
+        self.assertEqual(since.status_code, 304)
+
+        await self.client.put(
+            f"/applications/{application.json()['id']}", json={"deadline": "2031-02-01"}, headers=headers
+        )
+        changed = await self.client.get(feed_path, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertIn("DTSTART;VALUE=DATE:20310201", changed.text)
+
+        # Deleting the newest application on a cold worker must not move Last-Modified backwards.
+        newest = await self.client.post(
+            "/applications/",
+            json={"school_name": "Later School", "program_name": "MBA", "deadline": "2031-03-01"},
+            headers=headers,
+        )
+        db = SessionLocal()
+        try:
+            # Backdated so the deletion lands in a later second than the feed it invalidates.
+            db.query(ApplicationTracker).filter(
+                ApplicationTracker.id.in_([application.json()["id"], newest.json()["id"]])
+            ).update({"updated_at": datetime.utcnow() - timedelta(hours=1)}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        calendar_feed_cache.clear()
+        before_delete = await self.client.get(feed_path)
+        self.assertIn("Later School", before_delete.text)
+        await self.client.delete(f"/applications/{newest.json()['id']}", headers=headers)
+        calendar_feed_cache.clear()
+        after_delete = await self.client.get(
+            feed_path, headers={"If-Modified-Since": before_delete.headers["last-modified"]}
+        )
+        self.assertEqual(after_delete.status_code, 200)
+        self.assertNotIn("Later School", after_delete.text)
+
+        rotated = await self.client.post("/calendar/feed", headers=headers)
+        self.assertNotEqual(rotated.json()["feed_url"], created.json()["feed_url"])
+        self.assertEqual((await self.client.get(feed_path)).status_code, 404)
+
+    async def test_sync_returns_deltas_and_tombstones(self):
+        _, headers = await self._signup_and_get_headers("Sync")
+        deadline = str(date.today() + timedelta(days=30))
+        first = await self.client.post(
+            "/applications/", json={"school_name": "Sync A", "program_name": "MBA", "deadline": deadline}, headers=headers
+        )
+        second = await self.client.post(
+            "/applications/", json={"school_name": "Sync B", "program_name": "MBA", "deadline": deadline}, headers=headers
+        )
+        essay = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Sync A",
+                "program_type": "MBA",
+                "essay_prompt": "Why this school?",
+                "essay_content": "Sync essay content that is long enough for validation.",
+                "application_id": first.json()["id"],
+            },
+            headers=headers,
+        )
+        self.assertEqual(essay.status_code, 200, essay.text)
+
+        with mock.patch("services.sync.SYNC_OVERLAP_SECONDS", 0):
+            full = await self.client.get("/sync", headers=headers)
+            self.assertEqual(full.status_code, 200, full.text)
+            self.assertTrue(full.json()["reset"])
+            self.assertEqual(len(full.json()["applications"]), 2)
+            self.assertEqual(len(full.json()["essays"]), 1)
+
+            await self.client.put(f"/applications/{second.json()['id']}", json={"status": "Submitted"}, headers=headers)
+            await self.client.delete(f"/essays/{essay.json()['id']}", headers=headers)
+            delta = await self.client.get("/sync", params={"since": full.json()["sync_token"]}, headers=headers)
+            self.assertEqual(delta.status_code, 200, delta.text)
+            payload = delta.json()
+            self.assertFalse(payload["reset"])
+            self.assertEqual([item["id"] for item in payload["applications"]], [second.json()["id"]])
+            self.assertEqual(payload["essays"], [])
+            self.assertEqual(payload["deleted"], [{"entity_type": "essay", "id": essay.json()["id"]}])
+
+            idle = await self.client.get("/sync", params={"since": payload["sync_token"]}, headers=headers)
+            self.assertEqual((idle.json()["applications"], idle.json()["deleted"]), ([], []))
+
+        invalid = await self.client.get("/sync", params={"since": "not-a-token"}, headers=headers)
+        self.assertEqual(invalid.status_code, 400, invalid.text)
+
+    async def test_row_version_conflicts_return_current_state(self):
+        _, headers = await self._signup_and_get_headers("Versioned")
+        created = await self.client.post(
+            "/applications/",
+            json={"school_name": "Version School", "program_name": "MBA", "deadline": str(date.today() + timedelta(days=20))},
+            headers=headers,
+        )
+        application = created.json()
+        self.assertEqual(application["row_version"], 1)
+        path = f"/applications/{application['id']}"
+
+        first = await self.client.put(path, json={"status": "In Progress", "row_version": 1}, headers=headers)
+        self.assertEqual(first.status_code, 200, first.text)
+        self.assertEqual(first.json()["row_version"], 2)
+        stale = await self.client.put(path, json={"status": "Submitted", "row_version": 1}, headers=headers)
+        self.assertEqual(stale.status_code, 409, stale.text)
+        self.assertEqual(stale.json()["detail"]["current"]["status"], "In Progress")
+        self.assertEqual(stale.json()["detail"]["current"]["row_version"], 2)
+
+        batch = await self.client.patch(
+            "/applications/batch", json={"items": [{"id": application["id"], "lors_required": 1, "row_version": 1}]},
+            headers=headers,
+        )
+        self.assertEqual(batch.json()["items"][0]["status"], "error")
+        self.assertEqual(batch.json()["items"][0]["application"]["row_version"], 2)
+
+        profile = await self.client.put("/auth/profile", json={"bio": "First tab", "row_version": 1}, headers=headers)
+        self.assertEqual(profile.status_code, 200, profile.text)
+        profile_stale = await self.client.put("/auth/profile", json={"bio": "Second tab", "row_version": 1}, headers=headers)
+        self.assertEqual(profile_stale.status_code, 409, profile_stale.text)
+        self.assertEqual(profile_stale.json()["detail"]["current"]["bio"], "First tab")
+
+        essay = await self.client.post(
+            "/essays/",
+            json={
+                "school_name": "Version School",
+                "program_type": "MBA",
+                "essay_prompt": "Describe a setback.",
+                "essay_content": "An essay that two devices will try to save at once.",
+            },
+            headers=headers,
+        )
+        draft_path = f"/essays/{essay.json()['id']}/draft"
+        saved = await self.client.patch(
+            draft_path, json={"essay_content": "Device A text that is long enough.", "commit": True, "row_version": 1},
+            headers=headers,
+        )
+        self.assertEqual(saved.json()["row_version"], 2)
+        conflict = await self.client.patch(
+            draft_path, json={"essay_content": "Device B text that is long enough.", "commit": True, "row_version": 1},
+            headers=headers,
+        )
+        self.assertEqual(conflict.status_code, 409, conflict.text)
+        self.assertEqual(conflict.json()["detail"]["current"]["essay_content"], "Device A text that is long enough.")
+        self.assertEqual(conflict.json()["detail"]["draft"]["essay_content"], "Device B text that is long enough.")
+
+        # Autosaves are versioned per writer too: a tab still on an older version cannot overwrite buffered text.
+        tab_a = await self.client.patch(
+            draft_path, json={"essay_content": "Tab A autosave, still buffered.", "row_version": 2}, headers=headers
+        )
+        self.assertEqual((tab_a.status_code, tab_a.json()["pending"], tab_a.json()["row_version"]), (200, True, 3))
+        tab_b = await self.client.patch(
+            draft_path, json={"essay_content": "Tab B autosave on a stale version.", "row_version": 2}, headers=headers
+        )
+        self.assertEqual(tab_b.status_code, 409, tab_b.text)
+        self.assertEqual(tab_b.json()["detail"]["current"]["essay_content"], "Tab A autosave, still buffered.")
+        self.assertEqual(tab_b.json()["detail"]["current"]["row_version"], 3)
+        self.assertEqual(tab_b.json()["detail"]["draft"]["essay_content"], "Tab B autosave on a stale version.")
+
+        # A write elsewhere moves the row under the buffer; the buffered text comes back instead of vanishing.
+        db = SessionLocal()
+        try:
+            db.query(Essay).filter(Essay.id == essay.json()["id"]).update({"row_version": Essay.row_version + 1})
+            db.commit()
+        finally:
+            db.close()
+        moved = await self.client.patch(
+            draft_path, json={"essay_content": "Tab A keeps typing.", "row_version": 3}, headers=headers
+        )
+        self.assertEqual(moved.status_code, 409, moved.text)
+        self.assertEqual(moved.json()["detail"]["draft"]["essay_content"], "Tab A autosave, still buffered.")
+        self.assertEqual(moved.json()["detail"]["current"]["row_version"], 3)
+
+    async def test_summary_totals_convert_to_preferred_currency(self):
+        def drop_test_rate():
+            db = SessionLocal()
+            try:
+                db.query(FxRate).filter(FxRate.currency == "ZZZ").delete(synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+            fx_rate_cache.invalidate()
+
+        # ZZZ must start out unknown; the uploaded rate is shared DB state, so it is removed again.
+        drop_test_rate()
+        self.addCleanup(drop_test_rate)
+        email, headers = await self._signup_and_get_headers("Currency")
+        await self.client.put("/auth/profile", json={"preferred_currency": "eur"}, headers=headers)
+        deadline = str(date.today() + timedelta(days=45))
+        await self.client.post(
+            "/applications/batch",
+            json={"items": [
+                {"school_name": "Fx One", "program_name": "MBA", "deadline": deadline,
+                 "application_fee": 100, "fee_currency": "USD"},
+                {"school_name": "Fx Two", "program_name": "MBA", "deadline": deadline,
+                 "application_fee": 79, "fee_currency": "GBP"},
+                {"school_name": "Fx Three", "program_name": "MBA", "deadline": deadline,
+                 "application_fee": 50, "fee_currency": "ZZZ"},
+            ]},
+            headers=headers,
+        )
+
+        summary = (await self.client.get("/workspace/summary", headers=headers)).json()
+        self.assertEqual(summary["preferred_currency"], "EUR")
+        self.assertAlmostEqual(summary["application_fees_total"], 184.0, places=2)
+        self.assertEqual(summary["unconverted_currencies"], ["ZZZ"])
+
+        rates = await self.client.get("/fx/rates", headers=headers)
+        self.assertEqual(rates.status_code, 200, rates.text)
+        self.assertEqual(rates.json()["base"], "EUR")
+        self.assertAlmostEqual(rates.json()["rates"]["GBP"], 0.92 / 0.79, places=6)
+
+        forbidden = await self.client.put("/admin/fx-rates", json={"rates": {"ZZZ": 2}}, headers=headers)
+        self.assertEqual(forbidden.status_code, 403, forbidden.text)
+        db = SessionLocal()
+        try:
+            db.query(User).filter(User.email == email).update({"role": "admin"})
+            db.commit()
+        finally:
+            db.close()
+        invalid = await self.client.put("/admin/fx-rates", json={"rates": {"ZZZ": -1}}, headers=headers)
+        self.assertEqual(invalid.status_code, 422, invalid.text)
+        user_id = (await self.client.get("/auth/me", headers=headers)).json()["id"]
+        in_flight = workspace_cache.generation(user_id)
+        uploaded = await self.client.put("/admin/fx-rates", json={"rates": {"zzz": 2}}, headers=headers)
+        self.assertEqual(uploaded.status_code, 200, uploaded.text)
+        self.assertEqual(uploaded.json()["rates"]["ZZZ"], 2.0)
+        # A summary built with the old rates while the upload ran must not be cached.
+        workspace_cache.set(user_id, ("summary", "stale"), {"stale": True}, generation=in_flight)
+        self.assertIsNone(workspace_cache.get(user_id, ("summary", "stale")))
+
+        converted = (await self.client.get("/workspace/summary", headers=headers)).json()
+        self.assertAlmostEqual(converted["application_fees_total"], 207.0, places=2)
+        self.assertEqual(converted["unconverted_currencies"], [])
+
+    async def test_program_catalog_table_caches_pages_and_exports(self):
+        email, headers = await self._signup_and_get_headers("CatalogStore")
+        db = SessionLocal()
+        try:
+            db.query(User).filter(User.email == email).update({"role": "admin"})
+            db.commit()
+        finally:
+            db.close()
+        suffix = uuid.uuid4().hex[:8]
+        for program_name in ("MBA", "MiM"):
+            created = await self.client.post(
+                "/admin/programs",
+                json={"school_name": f"Store {suffix} School", "program_name": program_name, "degree": "MS",
+                      "country": "USA", "application_fee": 120},
+                headers=headers,
+            )
+            self.assertEqual(created.status_code, 201, created.text)
+        duplicate = await self.client.post(
+            "/admin/programs",
+            json={"school_name": f"Store {suffix} School", "program_name": "MBA", "degree": "MS", "country": "USA"},
+            headers=headers,
+        )
+        self.assertEqual(duplicate.status_code, 409, duplicate.text)
+
+        await self.client.get("/programs", params={"query": f"store {suffix}"})
+        before = (await self.client.get("/admin/programs/stats", headers=headers)).json()
+        for _ in range(3):
+            listed = (await self.client.get("/programs", params={"query": f"store {suffix}", "limit": 1})).json()
+            self.assertEqual(listed["total"], 2)
+        after = (await self.client.get("/admin/programs/stats", headers=headers)).json()
+        self.assertEqual(after["reloads"], before["reloads"])
+        self.assertGreaterEqual(after["hits"], before["hits"] + 3)
+
+        second_page = (await self.client.get("/programs", params={"query": f"store {suffix}", "limit": 1, "offset": 1})).json()
+        self.assertEqual(len(second_page["items"]), 1)
+        self.assertNotEqual(second_page["items"][0]["id"], listed["items"][0]["id"])
+        page = (await self.client.get("/programs", params={"limit": 2, "offset": 1})).json()
+        self.assertEqual(page["offset"], 1)
+        self.assertLessEqual(len(page["items"]), 2)
+
+        exported = await self.client.get("/admin/programs/export", headers=headers)
+        self.assertEqual(exported.status_code, 200, exported.text)
+        exported_ids = [item["id"] for item in exported.json()]
+        self.assertEqual(exported_ids, sorted(exported_ids))
+        mba = next(item for item in exported.json() if item["id"] == f"store-{suffix}-school-mba-ms")
+        self.assertEqual(mba["application_fee"], 120)
+        self.assertIsInstance(mba["application_fee"], int)
+
+    async def test_program_search_ranks_and_tolerates_typos(self):
+        suffix = uuid.uuid4().hex[:6]
+        catalog = [
+            {"id": f"search-a-{suffix}", "school_name": "Northfield Business School", "program_name": "Master in Finance",
+             "degree": "MS", "country": "UK", "city": "London"},
+            {"id": f"search-b-{suffix}", "school_name": "Westbrook University", "program_name": "MBA",
+             "degree": "MBA", "country": "USA", "city": "Northfield"},
+            {"id": f"search-c-{suffix}", "school_name": "Eastgate College", "program_name": "Master in Management",
+             "degree": "MS", "country": "France", "city": "Paris"},
+        ]
+        db = SessionLocal()
+        try:
+            db.add_all([ProgramCatalogEntry(**entry) for entry in catalog])
+            db.commit()
+            program_catalog_store.invalidate()
+            ranked = (await self.client.get("/programs", params={"query": "northfield"})).json()
+            self.assertEqual([item["id"] for item in ranked["items"]], [catalog[0]["id"], catalog[1]["id"]])
+
+            typo = (await self.client.get("/programs", params={"query": "managment paris"})).json()
+            self.assertEqual([item["id"] for item in typo["items"]], [catalog[2]["id"]])
+            punctuation = await self.client.get("/programs", params={"query": "--"})
+            self.assertEqual(punctuation.status_code, 200, punctuation.text)
+            self.assertEqual(punctuation.json()["items"], [])
+
+            suggestions = await self.client.get("/programs/autocomplete", params={"prefix": "northfield business fin"})
+            self.assertEqual(suggestions.status_code, 200, suggestions.text)
+            self.assertEqual([item["id"] for item in suggestions.json()["items"]], [catalog[0]["id"]])
+
+            renamed = ProgramCatalogItem(**{**catalog[1], "program_name": "Executive MBA"})
+            self.assertTrue(update_program_catalog_entry(db, renamed))
+            program_search_index.upsert(db, renamed)
+            rebuilds = program_search_index.rebuilds
+            executive = (await self.client.get("/programs/autocomplete", params={"prefix": "westbrook exec"})).json()
+            self.assertEqual([item["id"] for item in executive["items"]], [catalog[1]["id"]])
+            self.assertEqual(program_search_index.rebuilds, rebuilds)
+        finally:
+            db.query(ProgramCatalogEntry).filter(
+                ProgramCatalogEntry.id.in_([entry["id"] for entry in catalog])
+            ).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+            program_catalog_store.invalidate()
+
+    async def test_program_facets_filter_and_count(self):
+        suffix = uuid.uuid4().hex[:6]
+        north, south = f"Northland{suffix}", f"Southland{suffix}"
+        catalog = [
+            {"id": f"facet-a-{suffix}", "school_name": "Facet A", "program_name": "MBA", "degree": "MBA",
+             "country": north, "application_fee": 80, "deadline_round_1": "2026-10-01"},
+            {"id": f"facet-b-{suffix}", "school_name": "Facet B", "program_name": "MBA", "degree": "MBA",
+             "country": south, "application_fee": 250, "deadline_round_1": "2026-11-15"},
+            {"id": f"facet-c-{suffix}", "school_name": "Facet C", "program_name": "MiM", "degree": "MS",
+             "country": north, "application_fee": 150, "deadline_round_1": "2026-10-20", "deadline_round_2": "2027-01-05"},
+        ]
+        db = SessionLocal()
+        try:
+            db.add_all([ProgramCatalogEntry(**entry) for entry in catalog])
+            db.commit()
+            program_catalog_store.invalidate()
+
+            countries = f"{north},{south.lower()}"
+            both = (await self.client.get("/programs", params={"country": countries})).json()
+            self.assertEqual([item["id"] for item in both["items"]], [entry["id"] for entry in catalog])
+            degree_counts = {row["value"]: row["count"] for row in both["facets"]["degree"]}
+            self.assertEqual(degree_counts, {"MBA": 2, "MS": 1})
+
+            narrowed = (await self.client.get(
+                "/programs",
+                params={"country": countries, "degree": "MBA", "fee_max": 200},
+            )).json()
+            self.assertEqual([item["id"] for item in narrowed["items"]], [catalog[0]["id"]])
+            # Each facet's counts ignore that facet's own filter.
+            self.assertEqual({row["value"]: row["count"] for row in narrowed["facets"]["degree"]}, {"MBA": 1, "MS": 1})
+            country_counts = {row["value"]: row["count"] for row in narrowed["facets"]["country"]}
+            self.assertEqual(country_counts, {north: 1})
+            self.assertEqual([row["value"] for row in narrowed["facets"]["fee_range"]], ["0-99", "200-299"])
+
+            by_deadline = (await self.client.get(
+                "/programs",
+                params={"country": countries, "deadline_after": "2027-01-01", "deadline_before": "2027-01-31"},
+            )).json()
+            self.assertEqual([item["id"] for item in by_deadline["items"]], [catalog[2]["id"]])
+            months = {row["value"] for row in by_deadline["facets"]["deadline_month"]}
+            self.assertTrue({"2026-10", "2026-11", "2027-01"}.issubset(months))
+        finally:
+            db.query(ProgramCatalogEntry).filter(
+                ProgramCatalogEntry.id.in_([entry["id"] for entry in catalog])
+            ).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+            program_catalog_store.invalidate()
+
+    async def test_program_import_validates_diffs_and_bulk_applies(self):
+        suffix = uuid.uuid4().hex[:6]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dump = Path(tmp_dir) / "vendor.csv"
+            dump.write_text(
+                "school_name,program_name,degree,country,application_fee,fee_currency\n"
+                f"Import {suffix} School,MBA,MBA,USA,100,usd\n"
+                f"Import {suffix} School,MiM,MS,USA,,EUR\n"
+                f"Import {suffix} School,Bad Fee,MS,USA,-5,USD\n",
+                encoding="utf-8",
+            )
+            rows = list(validate_import_rows(iter_import_rows(dump, detect_import_format(dump)), workers=2, chunk_size=1))
+        self.assertEqual([row[0] for row in rows], [2, 3, 4])
+        self.assertIn("application_fee", rows[2][2])
+        incoming = {item["id"]: item for _, item, error in rows if not error}
+        self.assertEqual(incoming[f"import-{suffix}-school-mba-mba"]["fee_currency"], "USD")
+
+        db = SessionLocal()
+        try:
+            existing = {f"import-{suffix}-school-mba-mba": {**incoming[f"import-{suffix}-school-mba-mba"], "city": "Old"}}
+            diff = diff_program_catalog(existing, incoming, prune=False)
+            self.assertEqual((len(diff["added"]), len(diff["changed"]), diff["unchanged"]), (1, 1, 0))
+
+            diff = diff_program_catalog(load_catalog_records(db), incoming, prune=False)
+            self.assertEqual(len(diff["added"]), 2)
+            self.assertEqual(diff["removed"], [])
+            apply_program_catalog_diff(db, diff)
+            again = diff_program_catalog(load_catalog_records(db), incoming, prune=False)
+            self.assertEqual((again["added"], again["changed"], again["unchanged"]), ([], [], 2))
+            self.assertIsNotNone(find_program_catalog_item(db, f"import-{suffix}-school-mim-ms"))
+        finally:
+            db.query(ProgramCatalogEntry).filter(ProgramCatalogEntry.id.in_(list(incoming))).delete(
+                synchronize_session=False
+            )
+            db.commit()
+            db.close()
+            program_catalog_store.invalidate()
+
+    async def test_catalog_matching_links_misspelled_applications(self):
+        _, headers = await self._signup_and_get_headers("CatalogMatch")
+        deadline = str(date.today() + timedelta(days=60))
+        typed = [
+            ("Harvrd Business School", "Full-time MBA", "hbs-mba"),
+            ("HBS", "MBA", "hbs-mba"),
+            ("Stanford GSB", "MBA", "gsb-mba"),
+            ("wharton", "MBA", "wharton-mba"),
+            ("Unknown Business School", "MBA", None),
+        ]
+        created = await self.client.post(
+            "/applications/batch",
+            json={"items": [{"school_name": school, "program_name": program, "deadline": deadline}
+                            for school, program, _ in typed]},
+            headers=headers,
+        )
+        self.assertEqual(created.status_code, 200, created.text)
+
+        db = SessionLocal()
+        try:
+            stats = match_applications_to_catalog(db, batch_size=2)
+            self.assertGreaterEqual(stats["checked"], len(typed))
+            self.assertEqual(match_applications_to_catalog(db)["checked"], 0)
+            self.assertEqual(catalog_match_index.match("The Wharton School", None)[0], "wharton-mba")
+            self.assertIsNone(catalog_match_index.match("Harvard Business School", "PhD in Physics"))
+        finally:
+            db.close()
+
+        applications = (await self.client.get("/applications/", headers=headers)).json()
+        links = {application["school_name"]: application["catalog_program_id"] for application in applications}
+        self.assertEqual(links, {school: program_id for school, _, program_id in typed})
+
+        edited = next(application for application in applications if application["school_name"] == "Unknown Business School")
+        await self.client.put(
+            f"/applications/{edited['id']}",
+            json={"school_name": "Columbia Business School", "row_version": edited["row_version"]},
+            headers=headers,
+        )
+        db = SessionLocal()
+        try:
+            self.assertEqual(
+                match_applications_to_catalog(db), {"checked": 1, "linked": 1, "unlinked": 0, "skipped": 0}
+            )
+        finally:
+            db.close()
+        relinked = (await self.client.get(f"/applications/{edited['id']}", headers=headers)).json()
+        self.assertEqual(relinked["catalog_program_id"], "columbia-mba")
+
+        # An edit committed between the pass's read and its write wins; the row is retried next pass.
+        await self.client.put(
+            f"/applications/{edited['id']}",
+            json={"school_name": "Wharton", "row_version": relinked["row_version"]},
+            headers=headers,
+        )
+        real_match = catalog_match_index.match
+
+        def match_then_edit(school_name, program_name):
+            other = SessionLocal()
+            try:
+                other.query(ApplicationTracker).filter(ApplicationTracker.id == edited["id"]).update(
+                    {"school_name": "Stanford GSB", "updated_at": datetime.utcnow() + timedelta(seconds=1)}
+                )
+                other.commit()
+            finally:
+                other.close()
+            return real_match(school_name, program_name)
+
+        db = SessionLocal()
+        try:
+            with mock.patch.object(catalog_match_index, "match", side_effect=match_then_edit):
+                self.assertEqual(match_applications_to_catalog(db)["skipped"], 1)
+            current = db.get(ApplicationTracker, edited["id"])
+            self.assertEqual((current.school_name, current.catalog_program_id), ("Stanford GSB", "columbia-mba"))
+            self.assertGreater(current.updated_at, current.catalog_match_checked_at or datetime.min)
+            self.assertEqual(match_applications_to_catalog(db)["linked"], 1)
+            db.refresh(current)
+            self.assertEqual(current.catalog_program_id, "gsb-mba")
+        finally:
+            db.close()
+
+    async def test_current_user_cache_invalidates_on_writes(self):
+        email, headers = await self._signup_and_get_headers("Cached")
+        await self.client.put("/auth/profile", json={"bio": "Cached bio"}, headers=headers)
+        first = await self.client.get("/auth/me", headers=headers)
+        hits = user_cache.hits
+        second = await self.client.get("/auth/me", headers=headers)
+        self.assertEqual(second.status_code, 200, second.text)
+        self.assertEqual(user_cache.hits, hits + 1)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.json()["bio"], "Cached bio")
+
+        renamed = await self.client.put("/auth/profile", json={"name": "Renamed Locally"}, headers=headers)
+        self.assertEqual(renamed.status_code, 200, renamed.text)
+        self.assertEqual((await self.client.get("/auth/me", headers=headers)).json()["name"], "Renamed Locally")
+
+        # Another worker's write: the row changes behind this process's back, plus its signal row.
+        user_id = first.json()["id"]
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE users SET name = 'Renamed Elsewhere' WHERE id = :id"), {"id": user_id})
+            conn.execute(
+                text("INSERT INTO user_cache_invalidations (user_id, created_at) VALUES (:id, :now)"),
+                {"id": user_id, "now": datetime.utcnow()},
+            )
+        user_cache._polled_at = 0.0
+        self.assertEqual((await self.client.get("/auth/me", headers=headers)).json()["name"], "Renamed Elsewhere")
+
+        db = SessionLocal()
+        try:
+            db.query(User).filter(User.email == email).update({"is_active": False})
+            db.commit()
+        finally:
+            db.close()
+        disabled = await self.client.get("/auth/me", headers=headers)
+        self.assertEqual(disabled.status_code, 401, disabled.text)
+        self.assertEqual(disabled.json()["detail"], "Account is disabled")
+        login = await self.client.post("/auth/login", json={"email": email, "password": "strong-password-123"})
+        self.assertEqual(login.status_code, 401, login.text)
+
+    async def test_password_hashing_backpressure_and_rehash_on_login(self):
+        email, _ = await self._signup_and_get_headers("Hashing")
+        credentials = {"email": email, "password": "strong-password-123"}
+
+        with mock.patch.object(password_hasher, "max_pending", 0):
+            busy = await self.client.post("/auth/login", json=credentials)
+        self.assertEqual(busy.status_code, 429, busy.text)
+        self.assertEqual(busy.headers.get("retry-after"), "1")
+
+        with mock.patch.object(password_hasher, "rounds", 4):
+            upgraded = await self.client.post("/auth/login", json=credentials)
+            self.assertEqual(upgraded.status_code, 200, upgraded.text)
+            db = SessionLocal()
+            try:
+                user = db.query(User).filter(User.email == email).first()
+                self.assertTrue(user.hashed_password.startswith("$2b$04$"))
+                self.assertFalse(password_hasher.needs_rehash(user.hashed_password))
+                user.hashed_password = None  # as for accounts created through Google sign-in
+                db.commit()
+            finally:
+                db.close()
+
+        federated = await self.client.post("/auth/login", json=credentials)
+        self.assertEqual(federated.status_code, 401, federated.text)
+
+    async def test_access_token_claims_authorize_without_user_lookup(self):
+        email, headers = await self._signup_and_get_headers("Claims")
+        self.assertEqual((await self.client.get("/applications/", headers=headers)).status_code, 200)
+        login = await self.client.post("/auth/login", json={"email": email, "password": "strong-password-123"})
+        self.assertEqual(login.status_code, 200, login.text)
+        claims = jwt.get_unverified_claims(login.json()["access_token"])
+        self.assertEqual((claims["role"], claims["active"], claims["ver"]), ("user", True, 0))
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        with mock.patch("auth.load_user", side_effect=AssertionError("user row loaded")):
+            listed = await self.client.get("/applications/", headers=headers)
+            forbidden = await self.client.get("/admin/programs/stats", headers=headers)
+        self.assertEqual(listed.status_code, 200, listed.text)
+        self.assertEqual(forbidden.status_code, 403, forbidden.text)
+
+        # A role change after issuance sends the token back to the user row.
+        db = SessionLocal()
+        try:
+            db.query(User).filter(User.email == email).update({"role": "admin"})
+            db.commit()
+        finally:
+            db.close()
+        promoted = await self.client.get("/admin/programs/stats", headers=headers)
+        self.assertEqual(promoted.status_code, 200, promoted.text)
+
+        # Another worker's bump this process has not heard about yet (no session events fire).
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE users SET token_version = 3 WHERE email = :email"), {"email": email})
+        logout = await self.client.post("/auth/logout", json={"all_sessions": True}, headers=headers)
+        self.assertEqual(logout.status_code, 200, logout.text)
+        db = SessionLocal()
+        try:
+            self.assertEqual(db.query(User.token_version).filter(User.email == email).scalar(), 4)
+        finally:
+            db.close()
+        revoked = await self.client.get("/applications/", headers=headers)
+        self.assertEqual(revoked.status_code, 401, revoked.text)
+        self.assertEqual(revoked.json()["detail"], "Token has been revoked")
+
+    async def test_token_purge_deletes_expired_and_revoked_rows_in_batches(self):
+        email, headers = await self._signup_and_get_headers("Purge")
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.email == email).first()
+            db.query(User).filter(User.id == user.id).update({"role": "admin"})
+            for _ in range(3):
+                db.add(RefreshToken(user_id=user.id, token_hash=f"expired-{uuid.uuid4().hex}", expires_at=now - timedelta(days=1)))
+            db.add(RefreshToken(
+                user_id=user.id, token_hash=f"revoked-{uuid.uuid4().hex}", expires_at=now + timedelta(days=20),
+                revoked=True, revoked_at=now - timedelta(days=8), created_at=now - timedelta(days=10),
+            ))
+            # Old but only just rotated: must survive so a replay is still recognised.
+            recently_revoked = f"rotated-{uuid.uuid4().hex}"
+            db.add(RefreshToken(
+                user_id=user.id, token_hash=recently_revoked, expires_at=now + timedelta(days=20),
+                revoked=True, revoked_at=now - timedelta(hours=1), created_at=now - timedelta(days=10),
+            ))
+            db.add(AuthToken(user_id=user.id, token_hash=f"used-{uuid.uuid4().hex}", purpose="password_reset",
+                             expires_at=now + timedelta(hours=1), used=True))
+            db.commit()
+            stats = purge_expired_tokens(db, batch_size=2)
+            self.assertGreaterEqual(stats["refresh_tokens"], 4)
+            self.assertGreaterEqual(stats["auth_tokens"], 1)
+            self.assertGreaterEqual(stats["batches"], 4)
+            remaining = db.query(RefreshToken).filter(RefreshToken.user_id == user.id).all()
+            self.assertEqual(
+                sorted((row.revoked, row.expires_at > now) for row in remaining), [(False, True), (True, True)]
+            )
+            self.assertEqual(next(row for row in remaining if row.revoked).token_hash, recently_revoked)
+            with self.assertRaises(ValueError):
+                purge_expired_tokens(db, batch_size=0)
+        finally:
+            db.close()
+
+        run = await self.client.post("/admin/maintenance/token-purge", headers=headers)
+        self.assertEqual(run.status_code, 200, run.text)
+        self.assertEqual(run.json()["refresh_tokens"], 0)
+        status_response = await self.client.get("/admin/maintenance/token-purge", headers=headers)
+        self.assertEqual(status_response.status_code, 200, status_response.text)
+        self.assertGreaterEqual(status_response.json()["runs"], 1)
+        self.assertIn("duration_ms", status_response.json()["last_result"])
+
+    async def test_refresh_rotation_detects_reuse_and_revokes_family(self):
+        email, _ = await self._signup_and_get_headers("Rotation")
+        credentials = {"email": email, "password": "strong-password-123"}
+        first = (await self.client.post("/auth/login", json=credentials)).json()["refresh_token"]
+        other_session = (await self.client.post("/auth/login", json=credentials)).json()["refresh_token"]
+
+        rotated = await self.client.post("/auth/refresh", json={"refresh_token": first})
+        self.assertEqual(rotated.status_code, 200, rotated.text)
+        second = rotated.json()["refresh_token"]
+        self.assertEqual(rotated.json()["user"]["email"], email)
+
+        replay = await self.client.post("/auth/refresh", json={"refresh_token": first})
+        self.assertEqual(replay.status_code, 401, replay.text)
+        self.assertEqual(replay.json()["detail"], "Refresh token reuse detected")
+        family_member = await self.client.post("/auth/refresh", json={"refresh_token": second})
+        self.assertEqual(family_member.status_code, 401, family_member.text)
+
+        unrelated = await self.client.post("/auth/refresh", json={"refresh_token": other_session})
+        self.assertEqual(unrelated.status_code, 200, unrelated.text)
+        unknown = await self.client.post("/auth/refresh", json={"refresh_token": "not-a-real-refresh-token"})
+        self.assertEqual(unknown.json()["detail"], "Invalid refresh token")
+
+    async def test_google_login_verifies_against_cached_certs(self):
+        stand_in = GoogleCertStandIn()
+        self.addCleanup(stand_in.close)
+        self.addCleanup(google_id_verifier.reset, google_id_verifier.certs_url)
+        google_id_verifier.reset(stand_in.url)
+        client_id = "stand-in-client.apps.googleusercontent.com"
+        email = f"google-{uuid.uuid4().hex[:10]}@example.com"
+
+        with mock.patch.object(get_settings(), "GOOGLE_CLIENT_ID", client_id):
+            first = await self.client.post("/auth/google", json={"id_token": stand_in.id_token(client_id, email)})
+            second = await self.client.post("/auth/google", json={"id_token": stand_in.id_token(client_id, email)})
+            wrong_audience = await self.client.post(
+                "/auth/google", json={"id_token": stand_in.id_token("someone-else", email)}
+            )
+        self.assertEqual(first.status_code, 200, first.text)
+        self.assertEqual(second.status_code, 200, second.text)
+        self.assertEqual(second.json()["user"]["id"], first.json()["user"]["id"])
+        self.assertEqual(wrong_audience.status_code, 401, wrong_audience.text)
+        self.assertEqual(stand_in.requests, 1)
+
+        db = SessionLocal()
+        try:
+            self.assertIsNone(db.query(User).filter(User.email == email).first().hashed_password)
+        finally:
+            db.close()
+
+    async def test_rs256_key_ring_rotation_and_jwks(self):
+        _, legacy_headers = await self._signup_and_get_headers("Legacy Token")
+        keys_dir = Path(tempfile.mkdtemp())
+        (keys_dir / "next").mkdir()
+        # The staged key sorts last but must not become the default signer.
+        for kid in ("20260101-old", "20260601-new", "next/20270101-staged"):
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            (keys_dir / f"{kid}.pem").write_bytes(key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            ))
+        secret = get_settings().SECRET_KEY
+        old_ring = JwtKeyRing(keys_dir, "20260101-old", secret, accept_legacy=True)
+        ring = JwtKeyRing(keys_dir, None, secret, accept_legacy=True)
+        self.assertEqual(ring.active_kid, "20260601-new")
+        self.assertEqual(ring.decode(JwtKeyRing(keys_dir, "20270101-staged", secret, True).encode({"sub": "1"})),
+                         {"sub": "1"})
+        # A first key that is only staged verifies, but HS256 keeps signing until it is activated.
+        staged_only = Path(tempfile.mkdtemp())
+        (staged_only / "next").mkdir()
+        shutil.copy(keys_dir / "next" / "20270101-staged.pem", staged_only / "next")
+        first_ring = JwtKeyRing(staged_only, None, secret, accept_legacy=True)
+        self.assertIsNone(first_ring.active_kid)
+        self.assertEqual(jwt.get_unverified_header(first_ring.encode({"sub": "1"}))["alg"], "HS256")
+        self.assertEqual(first_ring.decode(JwtKeyRing(staged_only, "20270101-staged", secret, True).encode({"sub": "1"})),
+                         {"sub": "1"})
+
+        with mock.patch("auth.jwt_key_ring", old_ring):
+            _, old_key_headers = await self._signup_and_get_headers("Old Key")
+        with mock.patch("auth.jwt_key_ring", ring), mock.patch("routers.system_routes.jwt_key_ring", ring):
+            _, headers = await self._signup_and_get_headers("New Key")
+            token = headers["Authorization"].split()[1]
+            self.assertEqual(jwt.get_unverified_header(token), {"alg": "RS256", "kid": "20260601-new", "typ": "JWT"})
+            for auth_headers in (headers, old_key_headers, legacy_headers):
+                me = await self.client.get("/auth/me", headers=auth_headers)
+                self.assertEqual(me.status_code, 200, me.text)
+
+            published = await self.client.get("/.well-known/jwks.json")
+            self.assertEqual(published.status_code, 200, published.text)
+            self.assertEqual(
+                sorted(key["kid"] for key in published.json()["keys"]),
+                ["20260101-old", "20260601-new", "20270101-staged"],
+            )
+            self.assertNotIn("d", published.json()["keys"][0])
+            # A sidecar holding only the JWKS can verify the token.
+            self.assertEqual(jwt.decode(token, published.json(), algorithms=["RS256"])["role"], "user")
+
+            ring.accept_legacy = False
+            rejected = await self.client.get("/auth/me", headers=legacy_headers)
+            self.assertEqual(rejected.status_code, 401, rejected.text)
+
+    async def test_sessions_list_and_revoke_blocks_access_token(self):
+        email, _ = await self._signup_and_get_headers("Sessions")
+        credentials = {"email": email, "password": "strong-password-123"}
+        laptop = (await self.client.post(
+            "/auth/login", json=credentials, headers={"User-Agent": "Laptop Browser"}
+        )).json()
+        phone = (await self.client.post(
+            "/auth/login", json=credentials, headers={"User-Agent": "Phone App"}
+        )).json()
+        laptop_headers = {"Authorization": f"Bearer {laptop['access_token']}"}
+        phone_headers = {"Authorization": f"Bearer {phone['access_token']}"}
+
+        listed = await self.client.get("/auth/sessions", headers=laptop_headers)
+        self.assertEqual(listed.status_code, 200, listed.text)
+        by_device = {row["device"]: row for row in listed.json()}
+        self.assertTrue(by_device["Laptop Browser"]["current"])
+        self.assertFalse(by_device["Phone App"]["current"])
+
+        revoked = await self.client.delete(f"/auth/sessions/{by_device['Phone App']['id']}", headers=laptop_headers)
+        self.assertEqual(revoked.status_code, 200, revoked.text)
+        blocked = await self.client.get("/auth/me", headers=phone_headers)
+        self.assertEqual(blocked.status_code, 401, blocked.text)
+        self.assertEqual(blocked.json()["detail"], "Session has been revoked")
+        phone_refresh = await self.client.post("/auth/refresh", json={"refresh_token": phone["refresh_token"]})
+        self.assertEqual(phone_refresh.status_code, 401, phone_refresh.text)
+
+        self.assertEqual((await self.client.get("/auth/me", headers=laptop_headers)).status_code, 200)
+        remaining = (await self.client.get("/auth/sessions", headers=laptop_headers)).json()
+        self.assertNotIn("Phone App", [row["device"] for row in remaining])
+        missing = await self.client.delete("/auth/sessions/not-a-session", headers=laptop_headers)
+        self.assertEqual(missing.status_code, 404, missing.text)
+
     async def test_signup_rate_limit_returns_retry_after(self):
         email = f"limit-{uuid.uuid4().hex[:12]}@example.com"
         payload = {
@@ -64,3 +64,8 @@ export async function updateAdminAiRuntimeConfigApi(payload) {
   const { data } = await apiClient.put('/admin/ai/runtime', payload);
   return data;
 }
+
+export async function uploadAdminFxRatesApi(rates) {
+  const { data } = await apiClient.put('/admin/fx-rates', { rates });
+  return data;
+}
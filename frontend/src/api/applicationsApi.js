@@ -10,6 +10,16 @@ export async function createApplicationApi(payload) {
   return data;
 }
 
+export async function createApplicationsBatchApi(items, atomic = false) {
+  const { data } = await apiClient.post('/applications/batch', { items, atomic });
+  return data;
+}
+
+export async function updateApplicationsBatchApi(items, atomic = false) {
+  const { data } = await apiClient.patch('/applications/batch', { items, atomic });
+  return data;
+}
+
 export async function updateApplicationApi(applicationId, payload) {
   const { data } = await apiClient.put(`/applications/${applicationId}`, payload);
   return data;
@@ -20,15 +30,29 @@ export async function deleteApplicationApi(applicationId) {
   return data;
 }
 
-export async function listProgramCatalogApi(query, limit = 25) {
+export async function listProgramCatalogApi(query, limit = 25, filters = {}) {
   const params = { limit };
   if (query && query.trim()) {
     params.query = query.trim();
   }
+  Object.entries(filters).forEach(([key, value]) => {
+    if (Array.isArray(value)) {
+      if (value.length) {
+        params[key] = value.join(',');
+      }
+    } else if (value !== undefined && value !== null && value !== '') {
+      params[key] = value;
+    }
+  });
   const { data } = await apiClient.get('/programs', { params });
   return data;
 }
 
+export async function autocompleteProgramCatalogApi(prefix, limit = 8) {
+  const { data } = await apiClient.get('/programs/autocomplete', { params: { prefix, limit } });
+  return data;
+}
+
 export async function getProgramCatalogItemApi(programId) {
   const { data } = await apiClient.get(`/programs/${programId}`);
   return data;
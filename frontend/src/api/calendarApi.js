@@ -0,0 +1,16 @@
+import { apiClient } from './client';
+
+export async function getCalendarFeedApi() {
+  const { data } = await apiClient.get('/calendar/feed');
+  return data;
+}
+
+export async function rotateCalendarFeedApi() {
+  const { data } = await apiClient.post('/calendar/feed');
+  return data;
+}
+
+export async function disableCalendarFeedApi() {
+  const { data } = await apiClient.delete('/calendar/feed');
+  return data;
+}
@@ -10,11 +10,23 @@ export async function listEssayVersionsApi(essayId) {
   return data;
 }
 
+export async function listSimilarEssaysApi(essayId, minSimilarity = 0.6) {
+  const { data } = await apiClient.get(`/essays/${essayId}/similar`, {
+    params: { min_similarity: minSimilarity }
+  });
+  return data;
+}
+
 export async function createEssayApi(payload) {
   const { data } = await apiClient.post('/essays/', payload);
   return data;
 }
 
+export async function saveEssayDraftApi(essayId, payload) {
+  const { data } = await apiClient.patch(`/essays/${essayId}/draft`, payload);
+  return data;
+}
+
 export async function reviewEssayApi(essayId, payload) {
   const { data } = await apiClient.post(`/essays/${essayId}/review`, payload);
   return data;
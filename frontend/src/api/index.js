@@ -3,6 +3,8 @@ export * from './authApi';
 export * from './essaysApi';
 export * from './applicationsApi';
 export * from './remindersApi';
+export * from './calendarApi';
 export * from './feedbackApi';
 export * from './telemetryApi';
+export * from './workspaceApi';
 export * from './adminApi';
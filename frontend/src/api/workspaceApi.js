@@ -0,0 +1,30 @@
+import { apiClient } from './client';
+
+const localDateKey = (value = new Date()) => {
+  const mm = String(value.getMonth() + 1).padStart(2, '0');
+  const dd = String(value.getDate()).padStart(2, '0');
+  return `${value.getFullYear()}-${mm}-${dd}`;
+};
+
+export async function getWorkspaceSummaryApi() {
+  const { data } = await apiClient.get('/workspace/summary', { params: { today: localDateKey() } });
+  return data;
+}
+
+export async function getWorkspaceBootstrapApi({ include, fields } = {}) {
+  const params = { today: localDateKey() };
+  if (include?.length) params.include = include.join(',');
+  if (fields?.length) params.fields = fields.join(',');
+  const { data } = await apiClient.get('/workspace/bootstrap', { params });
+  return data;
+}
+
+export async function syncWorkspaceApi(since) {
+  const { data } = await apiClient.get('/sync', { params: since ? { since } : {} });
+  return data;
+}
+
+export async function getFxRatesApi(base) {
+  const { data } = await apiClient.get('/fx/rates', { params: base ? { base } : {} });
+  return data;
+}
@@ -194,7 +194,7 @@ export function createEssayApplicationActions({
   };
 
   const handleDelete = async (essayId) => {
-    if (!confirmDelete || window.confirm('Are you sure you want to delete this essay?')) {
+    if (!confirmDelete || window.confirm('Are you sure you want to delete this essay and all of its versions?')) {
       try {
         await deleteEssayApi(essayId);
         fetchEssays();
@@ -284,7 +284,11 @@ export function createEssayApplicationActions({
 
     try {
       if (editingApplicationId) {
-        await updateApplicationApi(editingApplicationId, payload);
+        const editingApplication = applications.find((application) => application.id === editingApplicationId);
+        await updateApplicationApi(editingApplicationId, {
+          ...payload,
+          row_version: editingApplication?.row_version
+        });
       } else {
         await createApplicationApi(payload);
       }
@@ -295,7 +299,12 @@ export function createEssayApplicationActions({
       localStorage.removeItem(APPLICATION_DRAFT_KEY);
     } catch (error) {
       console.error('Error saving application tracker entry:', error);
-      alert('Could not save application tracker details');
+      if (error?.response?.status === 409) {
+        await fetchApplications();
+        alert('This application was changed on another device. Review the latest values and save again.');
+      } else {
+        alert('Could not save application tracker details');
+      }
     }
 
     setApplicationLoading(false);
@@ -303,12 +312,13 @@ export function createEssayApplicationActions({
 
   const handleDeleteApplication = async (applicationId) => {
     const confirmed =
-      !confirmDelete || window.confirm('Are you sure you want to delete this tracked application?');
+      !confirmDelete ||
+      window.confirm('Are you sure you want to delete this tracked application and its linked essays?');
     if (!confirmed) return;
 
     try {
       await deleteApplicationApi(applicationId);
-      await fetchApplications();
+      await Promise.all([fetchApplications(), fetchEssays()]);
       if (editingApplicationId === applicationId) {
         setShowApplicationForm(false);
         resetApplicationForm();
@@ -32,11 +32,17 @@ export function createProfileActions({
       await updateProfile({
         ...profileFormData,
         preferred_currency: (profileFormData.preferred_currency || 'USD').toUpperCase(),
-        notification_email: profileFormData.notification_email || user.email
+        notification_email: profileFormData.notification_email || user.email,
+        row_version: user.row_version
       });
       setProfileMessage('Profile saved.');
     } catch (error) {
-      setProfileMessage(error.response?.data?.detail || 'Could not save profile.');
+      const detail = error.response?.data?.detail;
+      setProfileMessage(
+        error.response?.status === 409
+          ? 'Your profile was updated elsewhere. Reload the page to see the latest values, then save again.'
+          : detail || 'Could not save profile.'
+      );
     } finally {
       setProfileSaving(false);
     }
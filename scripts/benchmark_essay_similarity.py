@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from services.essay_similarity import (  # noqa: E402
+    EssaySimilarityIndex,
+    estimate_similarity,
+    minhash_signature,
+)
+
+
+def build_vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def make_essay(vocabulary: list[str], words: int, rng: random.Random) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def mutate(text: str, ratio: float, vocabulary: list[str], rng: random.Random) -> str:
+    tokens = text.split()
+    for index in rng.sample(range(len(tokens)), int(len(tokens) * ratio)):
+        tokens[index] = rng.choice(vocabulary)
+    return " ".join(tokens)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the MinHash/LSH essay similarity index.")
+    parser.add_argument("--essays", type=int, default=100_000, help="Total essays to index")
+    parser.add_argument("--users", type=int, default=1, help="Spread essays across this many users")
+    parser.add_argument("--words", type=int, default=120, help="Words per synthetic essay")
+    parser.add_argument("--queries", type=int, default=500, help="Similarity lookups to time")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05, help="Share of essays that are reworded copies")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(20_000, rng)
+    index = EssaySimilarityIndex()
+
+    print(f"Generating {args.essays} essays for {args.users} user(s)...")
+    contents: dict[int, str] = {}
+    owners: dict[int, int] = {}
+    planted: list[tuple[int, int]] = []
+    for essay_id in range(1, args.essays + 1):
+        user_id = 1 + (essay_id % args.users)
+        if essay_id > 1 and rng.random() < args.duplicate_ratio:
+            source_id = rng.randrange(max(1, essay_id - 500), essay_id)
+            if owners[source_id] == user_id:
+                contents[essay_id] = mutate(contents[source_id], 0.05, vocabulary, rng)
+                planted.append((essay_id, source_id))
+        if essay_id not in contents:
+            contents[essay_id] = make_essay(vocabulary, args.words, rng)
+        owners[essay_id] = user_id
+
+    started = time.perf_counter()
+    by_user: dict[int, list[tuple[int, int, str]]] = {}
+    for essay_id, content in contents.items():
+        by_user.setdefault(owners[essay_id], []).append((essay_id, essay_id, content))
+    for user_id, rows in by_user.items():
+        index.load_user(user_id, rows)
+    build_seconds = time.perf_counter() - started
+    print(f"Index build: {build_seconds:.2f}s ({args.essays / build_seconds:,.0f} essays/s) {index.stats()}")
+
+    started = time.perf_counter()
+    for essay_id in range(1, min(args.essays, 1000) + 1):
+        index.update_content(essay_id, contents[essay_id])
+    incremental_ms = (time.perf_counter() - started) * 1000 / min(args.essays, 1000)
+    print(f"Incremental update: {incremental_ms:.3f}ms per essay")
+
+    query_ids = rng.sample(range(1, args.essays + 1), min(args.queries, args.essays))
+    latencies, checked = [], []
+    for essay_id in query_ids:
+        started = time.perf_counter()
+        candidates, _ = index.find_similar(
+            owners[essay_id], essay_id, essay_id, contents[essay_id], min_similarity=0.6, limit=5
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        checked.append(candidates)
+    print(
+        f"LSH lookup: p50={percentile(latencies, 0.5):.3f}ms p95={percentile(latencies, 0.95):.3f}ms "
+        f"candidates mean={statistics.mean(checked):.1f}"
+    )
+
+    sample = query_ids[:20]
+    signatures = {essay_id: minhash_signature(content) for essay_id, content in contents.items()}
+    started = time.perf_counter()
+    for essay_id in sample:
+        signature = signatures[essay_id]
+        [
+            other_id for other_id, other in signatures.items()
+            if owners[other_id] == owners[essay_id] and other_id != essay_id
+            and estimate_similarity(signature, other) >= 0.6
+        ]
+    brute_ms = (time.perf_counter() - started) * 1000 / len(sample)
+    print(f"Brute-force scan (signatures precomputed): {brute_ms:.3f}ms per lookup")
+
+    found = 0
+    for essay_id, source_id in planted:
+        _, matches = index.find_similar(
+            owners[essay_id], essay_id, essay_id, contents[essay_id], min_similarity=0.6, limit=20
+        )
+        found += any(match_id == source_id for match_id, _ in matches)
+    if planted:
+        print(f"Planted near-duplicate recall: {found}/{len(planted)} ({found / len(planted):.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,12 +7,17 @@ BACKEND_DIR = ROOT_DIR / "backend"
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from database import Base, engine  # noqa: E402
+from database import Base, SessionLocal, engine  # noqa: E402
+from services.fx_rates import seed_fx_rates  # noqa: E402
 from services.migrations import run_schema_migrations  # noqa: E402
+from services.program_catalog import seed_program_catalog  # noqa: E402
 
 
 if __name__ == "__main__":
     # Create base schema first so additive ALTER migrations can run on a fresh DB.
     Base.metadata.create_all(bind=engine)
     run_schema_migrations(engine)
+    with SessionLocal() as db:
+        seed_fx_rates(db)
+        seed_program_catalog(db)
     print("Database migrations complete")
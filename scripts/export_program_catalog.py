@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from database import SessionLocal  # noqa: E402
+from services.program_catalog import (  # noqa: E402
+    PROGRAM_CATALOG_PATH,
+    export_program_catalog,
+    write_program_catalog_file,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export the program_catalog table to JSON for version control.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=PROGRAM_CATALOG_PATH,
+        help=f"Destination file (default: {PROGRAM_CATALOG_PATH.relative_to(ROOT_DIR)})",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        items = export_program_catalog(db)
+    finally:
+        db.close()
+    write_program_catalog_file(items, args.output)
+    print(f"Exported {len(items)} programs -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from database import SessionLocal  # noqa: E402
+from services.program_import import (  # noqa: E402
+    IMPORT_CHUNK_SIZE,
+    apply_program_catalog_diff,
+    detect_import_format,
+    diff_program_catalog,
+    iter_import_rows,
+    load_catalog_records,
+    validate_import_rows,
+)
+
+MAX_REPORTED_ERRORS = 20
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk import programs from a CSV or NDJSON dump into program_catalog.")
+    parser.add_argument("path", type=Path, help="CSV (header row) or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Override format detection by file extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Validation processes")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per validation task")
+    parser.add_argument("--prune", action="store_true", help="Delete catalog programs missing from the input")
+    parser.add_argument("--skip-invalid", action="store_true", help="Import valid rows even if some rows fail")
+    parser.add_argument("--dry-run", action="store_true", help="Report the diff without writing")
+    args = parser.parse_args()
+
+    try:
+        import_format = args.format or detect_import_format(args.path)
+    except ValueError as exc:
+        print(exc)
+        return 2
+
+    started = time.perf_counter()
+    incoming: dict[str, dict] = {}
+    errors: list[tuple[int, str]] = []
+    rows = duplicates = 0
+    for line_number, item, error in validate_import_rows(
+        iter_import_rows(args.path, import_format),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    ):
+        rows += 1
+        if error:
+            errors.append((line_number, error))
+            continue
+        if item["id"] in incoming:
+            duplicates += 1
+        incoming[item["id"]] = item
+    validated_at = time.perf_counter()
+
+    for line_number, error in errors[:MAX_REPORTED_ERRORS]:
+        print(f"line {line_number}: {error}")
+    if len(errors) > MAX_REPORTED_ERRORS:
+        print(f"... {len(errors) - MAX_REPORTED_ERRORS} more invalid rows")
+    if errors and not args.skip_invalid:
+        print(f"Aborting: {len(errors)} invalid rows (use --skip-invalid to import the rest)")
+        return 1
+    if errors and args.prune:
+        print("Aborting: --prune would delete programs whose rows failed validation")
+        return 1
+
+    db = SessionLocal()
+    try:
+        diff = diff_program_catalog(load_catalog_records(db), incoming, prune=args.prune)
+        if not args.dry_run:
+            apply_program_catalog_diff(db, diff)
+    finally:
+        db.close()
+    finished = time.perf_counter()
+
+    elapsed = finished - started
+    print(
+        f"Read {rows} rows ({len(incoming)} programs, {duplicates} duplicate ids, {len(errors)} invalid) "
+        f"in {validated_at - started:.2f}s with {args.workers} worker(s)"
+    )
+    print(
+        f"added={len(diff['added'])} changed={len(diff['changed'])} removed={len(diff['removed'])} "
+        f"unchanged={diff['unchanged']} missing_from_input={len(diff['missing'])}"
+        + (" (dry run, nothing written)" if args.dry_run else "")
+    )
+    print(f"Total {elapsed:.2f}s, {rows / elapsed if elapsed else 0:.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from database import SessionLocal  # noqa: E402
+from services.program_matching import MATCH_BATCH_SIZE, CatalogMatchWorker  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Link applications to program catalog entries (all users).")
+    parser.add_argument("--batch-size", type=int, default=MATCH_BATCH_SIZE, help="Applications per transaction")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # Same lock as the API's matching loop, so the script never scans alongside it.
+    stats = CatalogMatchWorker(SessionLocal, 0).run_once(batch_size=args.batch_size)
+    if stats is None:
+        print("Another process is matching applications right now; nothing done.")
+        return 1
+    elapsed = time.perf_counter() - started
+    print(
+        f"checked={stats['checked']} linked={stats['linked']} unlinked={stats['unlinked']} "
+        f"skipped={stats['skipped']} in {elapsed:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
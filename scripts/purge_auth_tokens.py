@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from database import SessionLocal  # noqa: E402
+from services.token_purge import (  # noqa: E402
+    REVOKED_TOKEN_RETENTION_DAYS,
+    TOKEN_PURGE_BATCH_SIZE,
+    count_purgeable_tokens,
+    purge_expired_tokens,
+)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Delete expired/revoked refresh tokens, expired/used verification and reset tokens, "
+            "and lapsed session revocations."
+        )
+    )
+    parser.add_argument("--batch-size", type=positive_int, default=TOKEN_PURGE_BATCH_SIZE, help="Rows deleted per transaction")
+    parser.add_argument(
+        "--revoked-retention-days",
+        type=int,
+        default=REVOKED_TOKEN_RETENTION_DAYS,
+        help="Keep revoked refresh tokens this long after revocation (replay detection)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be deleted")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            counts = count_purgeable_tokens(db, revoked_retention_days=args.revoked_retention_days)
+            print(
+                f"refresh_tokens={counts['refresh_tokens']} auth_tokens={counts['auth_tokens']} "
+                f"revoked_sessions={counts['revoked_sessions']} (dry run, nothing deleted)"
+            )
+            return 0
+        stats = purge_expired_tokens(
+            db,
+            batch_size=args.batch_size,
+            revoked_retention_days=args.revoked_retention_days,
+        )
+    finally:
+        db.close()
+    print(
+        f"refresh_tokens={stats['refresh_tokens']} auth_tokens={stats['auth_tokens']} "
+        f"revoked_sessions={stats['revoked_sessions']} in {stats['batches']} batches, {stats['duration_ms']:.0f}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import secrets
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+
+from config import get_settings  # noqa: E402
+from services.jwt_keys import STAGED_KEYS_SUBDIR  # noqa: E402
+
+
+def write_key(path: Path):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    os.chmod(path, 0o600)
+
+
+def main() -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Stage a new RS256 key in the JWT key directory, or promote a staged one to signer."
+    )
+    parser.add_argument("--dir", type=Path, default=settings.JWT_KEYS_DIR, help="Key directory (default JWT_KEYS_DIR)")
+    parser.add_argument("--list", action="store_true", help="List key ids instead of adding one")
+    parser.add_argument("--activate", metavar="KID", help="Promote a staged key so it signs after the next restart")
+    args = parser.parse_args()
+    if not args.dir:
+        print("Set JWT_KEYS_DIR or pass --dir")
+        return 2
+    keys_dir = Path(args.dir)
+    staged_dir = keys_dir / STAGED_KEYS_SUBDIR
+    promoted = sorted(path.stem for path in keys_dir.glob("*.pem"))
+
+    if args.list:
+        active = settings.JWT_ACTIVE_KID or (promoted[-1] if promoted else None)
+        if active is None:
+            print("HS256 (SECRET_KEY)  (active)")
+        for kid in promoted:
+            print(f"{kid}{'  (active)' if kid == active else ''}")
+        for path in sorted(staged_dir.glob("*.pem")):
+            print(f"{path.stem}  (staged{', active' if path.stem == active else ''})")
+        return 0
+
+    if args.activate:
+        staged = staged_dir / f"{args.activate}.pem"
+        if not staged.exists():
+            print(f"No staged key {args.activate!r} in {staged_dir}")
+            return 2
+        if promoted and promoted[-1] > args.activate:
+            print(f"{promoted[-1]} sorts after {args.activate!r} and would keep signing; pin JWT_ACTIVE_KID instead.")
+            return 2
+        staged.rename(keys_dir / staged.name)
+        print(f"Promoted {args.activate}; it signs new tokens as API processes restart.")
+        print("Delete the previous key file after ACCESS_TOKEN_EXPIRE_MINUTES so its tokens can still verify until then.")
+        return 0
+
+    kid = f"{datetime.utcnow():%Y%m%d%H%M%S}-{secrets.token_hex(3)}"
+    # Staged even when it is the first key: until every instance can verify RS256, HS256 keeps signing.
+    path = staged_dir / f"{kid}.pem"
+    write_key(path)
+    signer = "the current key" if promoted else "HS256"
+    print(f"Staged {path}: it verifies and is published in the JWKS, but {signer} keeps signing.")
+    print(f"Once every instance has restarted with it, run: {Path(__file__).name} --activate {kid}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
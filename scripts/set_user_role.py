@@ -10,6 +10,7 @@ if str(BACKEND_DIR) not in sys.path:
 
 from database import SessionLocal  # noqa: E402
 from models import User  # noqa: E402
+import services.user_cache  # noqa: E402,F401  (signals running API processes to drop the cached user)
 
 
 def main() -> int: